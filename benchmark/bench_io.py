@@ -0,0 +1,50 @@
+"""Compare loading a binary file saved by ``bioseq.io.save()`` against ``bioseq.utils.loadFasta()``
+
+Usage: python -m benchmark.bench_io [records] [length]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bioseq import DNA, io
+from bioseq.utils import loadFasta
+
+
+def timeit(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(records: int = 10000, length: int = 1000):
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        fasta, binary = os.path.join(tmp, "bench.fasta"), os.path.join(tmp, "bench.bsq")
+        with open(fasta, "w") as f:
+            for i in range(records):
+                seq = "".join(random.choices("ACGT", k=length))
+                f.write(f">seq{i} synthetic\n")
+                f.writelines(seq[j: j + 70] + "\n" for j in range(0, length, 70))
+        io.save((DNA(seq.seq, seq.info) for seq in loadFasta(fasta, iterator=True)), binary)
+
+        def loadBinary():
+            with io.load(binary) as f:
+                list(f)
+
+        def randomAccess():
+            with io.load(binary) as f:
+                for i in random.sample(range(records), min(records, 1000)):
+                    f[i]
+
+        print(f"{records} records x {length} bp, fasta {os.path.getsize(fasta) / 1e6:.1f} MB, "
+              f"binary {os.path.getsize(binary) / 1e6:.1f} MB")
+        print(f"loadFasta:              {timeit(lambda: loadFasta(fasta)):.3f}s")
+        print(f"loadFasta(iterator):    {timeit(lambda: list(loadFasta(fasta, iterator=True))):.3f}s")
+        print(f"io.load all records:    {timeit(loadBinary):.3f}s")
+        print(f"io.load 1000 random:    {timeit(randomAccess):.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
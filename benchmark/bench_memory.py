@@ -0,0 +1,34 @@
+"""Memory used by many small ``Sequence`` instances, compared with ``SequenceBatch``
+
+Usage: python -m benchmark.bench_memory [instances] [length]
+"""
+import random
+import sys
+import tracemalloc
+
+from bioseq import DNA, Peptide, SequenceBatch
+
+
+def traced(func) -> int:
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(instances: int = 1000000, length: int = 20):
+    random.seed(0)
+    peptides = ["".join(random.choices("ACDEFGHIKLMNPQRSTVWY", k=length)) for _ in range(instances)]
+    dnas = ["".join(random.choices("ACGT", k=length)) for _ in range(instances)]
+
+    for name, seq_type, seqs in (("Peptide", Peptide, peptides), ("DNA", DNA, dnas)):
+        objects = traced(lambda: [seq_type(seq, str(i)) for i, seq in enumerate(seqs)])
+        batch = traced(lambda: SequenceBatch((seq_type(seq, str(i)) for i, seq in enumerate(seqs)), seq_type))
+        print(f"{instances} {name} x {length}: {objects / instances:.1f} bytes/instance, "
+              f"SequenceBatch {batch / instances:.1f} bytes/sequence")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
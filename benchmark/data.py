@@ -0,0 +1,144 @@
+"""Synthetic data of the benchmark suite, all data are generated by a fixed seed so results are reproducible
+"""
+import os
+import random
+
+from functools import cached_property
+from typing import Dict, Iterable, List, Tuple
+
+NUCLEOTIDES = "ACGT"
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+STOP_CODONS = ("TAA", "TAG", "TGA")
+
+#: Size of each kind of data at each scale
+SCALES: Dict[str, Dict[str, Tuple[int, int]]] = {
+    # name: (number of records, length of each record)
+    "small": {
+        "reads": (10000, 100), "genes": (100, 3000), "chromosome": (1, 1000000),
+        "proteome": (2000, 400), "alignment": (2, 1000),
+    },
+    "medium": {
+        "reads": (100000, 150), "genes": (500, 10000), "chromosome": (1, 10000000),
+        "proteome": (20000, 400), "alignment": (2, 3000),
+    },
+    "large": {
+        "reads": (1000000, 150), "genes": (2000, 30000), "chromosome": (1, 100000000),
+        "proteome": (100000, 400), "alignment": (2, 10000),
+    },
+}
+
+
+def randomSequence(rng: random.Random, alphabet: str, length: int) -> str:
+    """
+    Random sequence with uniform composition, generated by blocks to bound the temporary list
+    """
+    block = 1 << 20
+    return "".join(["".join(rng.choices(alphabet, k=min(block, length - start)))
+                    for start in range(0, length, block)])
+
+
+def randomGene(rng: random.Random, length: int) -> str:
+    """
+    Random DNA with an open reading frame in the middle, which has no stop codon inside
+    """
+    flank = length // 4
+    body = randomSequence(rng, NUCLEOTIDES, ((length - 2 * flank) // 3 - 2) * 3)
+    # replace stop codons in frame by leucine
+    codons = [body[i: i + 3] for i in range(0, len(body), 3)]
+    codons = ["CTG" if codon in STOP_CODONS else codon for codon in codons]
+    orf = "ATG" + "".join(codons) + rng.choice(STOP_CODONS)
+    return randomSequence(rng, NUCLEOTIDES, flank) + orf + \
+        randomSequence(rng, NUCLEOTIDES, length - flank - len(orf))
+
+
+def writeFasta(filename: str, records: Iterable[Tuple[str, str]], line_width: int = 60) -> int:
+    """Write (info, sequence) records to a fasta file
+
+    Returns:
+        int: Size of the file in bytes
+    """
+    with open(filename, "w") as f:
+        for info, seq in records:
+            f.write(f">{info}\n")
+            f.writelines(seq[i: i + line_width] + "\n" for i in range(0, len(seq), line_width))
+    return os.path.getsize(filename)
+
+
+class Dataset:
+    """Data of one scale, each kind of data is generated on first access, fasta files are written to directory
+    """
+
+    def __init__(self, scale: str, directory: str, seed: int = 0):
+        self.scale = scale
+        self.sizes = SCALES[scale]
+        self.directory = directory
+        self.seed = seed
+
+    def _rng(self, name: str) -> random.Random:
+        return random.Random(f"{self.seed}-{name}")
+
+    @cached_property
+    def reads(self) -> List[str]:
+        """
+        Short DNA reads
+        """
+        rng = self._rng("reads")
+        number, length = self.sizes["reads"]
+        return [randomSequence(rng, NUCLEOTIDES, length) for _ in range(number)]
+
+    @cached_property
+    def genes(self) -> List[str]:
+        """
+        DNA with an open reading frame
+        """
+        rng = self._rng("genes")
+        number, length = self.sizes["genes"]
+        return [randomGene(rng, length) for _ in range(number)]
+
+    @cached_property
+    def chromosome(self) -> str:
+        """
+        One long DNA
+        """
+        return randomSequence(self._rng("chromosome"), NUCLEOTIDES, self.sizes["chromosome"][1])
+
+    @cached_property
+    def proteome(self) -> List[str]:
+        """
+        Peptides with random length around the scale's length
+        """
+        rng = self._rng("proteome")
+        number, length = self.sizes["proteome"]
+        return [randomSequence(rng, AMINO_ACIDS, rng.randint(length // 2, length * 3 // 2))
+                for _ in range(number)]
+
+    @cached_property
+    def alignment(self) -> Tuple[str, str]:
+        """
+        Two related DNA, the second one has about 10% substitutions and indels of the first one
+        """
+        rng = self._rng("alignment")
+        length = self.sizes["alignment"][1]
+        query = list(randomSequence(rng, NUCLEOTIDES, length))
+        subject = []
+        for base in query:
+            dice = rng.random()
+            if dice < 0.06:
+                subject.append(rng.choice(NUCLEOTIDES))
+            elif dice < 0.08:
+                subject.append(base + rng.choice(NUCLEOTIDES))
+            elif dice >= 0.1:
+                subject.append(base)
+        return "".join(query), "".join(subject)
+
+    def fasta(self, name: str) -> str:
+        """
+        Fasta file of the data, written on first call
+        """
+        filename = os.path.join(self.directory, f"{name}.fasta")
+        if not os.path.exists(filename):
+            data = getattr(self, name)
+            if isinstance(data, str):
+                data = [data]
+            writeFasta(filename, ((f"{name}{i} synthetic", seq) for i, seq in enumerate(data)))
+        return filename
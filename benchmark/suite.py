@@ -0,0 +1,459 @@
+"""Benchmark suite of the hot paths. Each case is timed several times on synthetic data,
+alignments are reported in GCUPS (giga cell updates per second) and others in MB/s of sequence processed,
+unless the work isn't proportional to the sequence length, see ``UNITS``.
+Results are saved as JSON named by the commit, so a regression can be found by comparing two results.
+
+Usage:
+    python -m benchmark.suite [--scale small|medium|large] [--filter PATTERN] [--repeat N] [--output FILE]
+    python -m benchmark.suite --compare BASE.json NEW.json [--threshold 0.1]
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from benchmark.data import SCALES, Dataset
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+#: unit of throughput: work per unit, such as cells for GCUPS and bytes for MB/s
+UNITS: Dict[str, float] = {
+    "GCUPS": 1e9,
+    "MB/s": 1e6,
+    # whole pipelines not linear to the sequence length, such as multiple alignment
+    "seqs/s": 1,
+    # million hashes compared per second
+    "Mhash/s": 1e6,
+    # thousand index lookups per second
+    "klookup/s": 1e3,
+}
+
+
+class Case(NamedTuple):
+    #: function to be timed, receive the result of setup
+    run: Callable[[Any], Any]
+    #: amount of work of one run, cells for alignment or bytes for others
+    work: float
+    #: unit in ``UNITS``
+    unit: str
+    #: prepare the input of each run out of timing, such as new instances without cached properties
+    setup: Callable[[], Any] = lambda: None
+
+
+#: name: function receive the dataset and return the case
+CASES: Dict[str, Callable[[Dataset], Case]] = {}
+
+
+def case(name: str):
+    """
+    Register a benchmark case
+    """
+    def register(func: Callable[[Dataset], Case]) -> Callable[[Dataset], Case]:
+        CASES[name] = func
+        return func
+    return register
+
+
+def _total(seqs: List[str]) -> int:
+    return sum(map(len, seqs))
+
+
+@case("align.global")
+def alignGlobal(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    query, subject = DNA(data.alignment[0]), data.alignment[1]
+    return Case(lambda _: query.align(subject, mode=1), len(query) * len(subject), "GCUPS")
+
+
+@case("align.local")
+def alignLocal(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    query, subject = DNA(data.alignment[0]), data.alignment[1]
+    return Case(lambda _: query.align(subject, mode=2), len(query) * len(subject), "GCUPS")
+
+
+@case("align.compact")
+def alignCompact(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    query, subject = DNA(data.alignment[0]), data.alignment[1]
+    return Case(lambda _: query.align(subject, mode=1, compact=True), len(query) * len(subject), "GCUPS")
+
+
+@case("align.msa")
+def alignMsa(data: Dataset) -> Case:
+    from bioseq import msa
+
+    seqs = [seq[:200] for seq in data.proteome[:50]]
+    return Case(lambda _: msa(seqs, distance="kmer"), len(seqs), "seqs/s")
+
+
+@case("fasta.parse")
+def fastaParse(data: Dataset) -> Case:
+    from bioseq.utils import parseFasta
+
+    with open(data.fasta("reads")) as f:
+        text = f.read()
+    return Case(lambda _: parseFasta(text), len(text), "MB/s")
+
+
+@case("fasta.load")
+def fastaLoad(data: Dataset) -> Case:
+    from bioseq.utils import loadFasta
+
+    filename = data.fasta("proteome")
+    return Case(lambda _: loadFasta(filename), os.path.getsize(filename), "MB/s")
+
+
+@case("fasta.load_iter")
+def fastaLoadIter(data: Dataset) -> Case:
+    from bioseq.utils import loadFasta
+
+    filename = data.fasta("proteome")
+    return Case(lambda _: list(loadFasta(filename, iterator=True)), os.path.getsize(filename), "MB/s")
+
+
+@case("fasta.reverse_complement")
+def fastaReverseComplement(data: Dataset) -> Case:
+    from bioseq.utils import indexFasta, reverseComplementFasta
+
+    filename = data.fasta("chromosome")
+    indexFasta(filename)
+    output = os.path.join(data.directory, "rc.fasta")
+    return Case(lambda _: reverseComplementFasta(filename, output), len(data.chromosome), "MB/s")
+
+
+@case("fasta.dedup")
+def fastaDedup(data: Dataset) -> Case:
+    from bioseq.utils import dedupFasta
+
+    filename = data.fasta("reads")
+    output = os.path.join(data.directory, "dedup.fasta")
+    return Case(lambda _: dedupFasta(filename, output, reverse_complement=True), os.path.getsize(filename), "MB/s")
+
+
+@case("dna.composition")
+def dnaComposition(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    return Case(lambda dna: dna.composition, len(data.chromosome), "MB/s",
+                lambda: DNA(data.chromosome))
+
+
+@case("dna.complement")
+def dnaComplement(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    dna = DNA(data.chromosome)
+    return Case(lambda _: dna.complement, len(dna), "MB/s")
+
+
+@case("dna.gc_profile")
+def dnaGcProfile(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    dna = DNA(data.chromosome)
+    return Case(lambda _: dna.gcProfile(1000, 100), len(dna), "MB/s")
+
+
+@case("dna.get_orf")
+def dnaGetOrf(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    return Case(lambda dnas: [dna.getOrf(topn=3) for dna in dnas], _total(data.genes), "MB/s",
+                lambda: [DNA(gene) for gene in data.genes])
+
+
+@case("dna.transcript")
+def dnaTranscript(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    return Case(lambda dnas: [dna.transcript() for dna in dnas], _total(data.genes), "MB/s",
+                lambda: [DNA(gene) for gene in data.genes])
+
+
+@case("peptide.pI")
+def peptidePI(data: Dataset) -> Case:
+    from bioseq import Peptide
+
+    return Case(lambda peptides: [peptide.pI for peptide in peptides], _total(data.proteome), "MB/s",
+                lambda: [Peptide(seq) for seq in data.proteome])
+
+
+@case("peptide.hydropathy")
+def peptideHydropathy(data: Dataset) -> Case:
+    from bioseq import Peptide
+
+    return Case(lambda peptides: [peptide.getHphob() for peptide in peptides], _total(data.proteome), "MB/s",
+                lambda: [Peptide(seq) for seq in data.proteome])
+
+
+@case("batch.peptide_pI")
+def batchPeptidePI(data: Dataset) -> Case:
+    from bioseq import peptide_pI
+
+    return Case(lambda _: peptide_pI(data.proteome), _total(data.proteome), "MB/s")
+
+
+@case("batch.composition")
+def batchComposition(data: Dataset) -> Case:
+    from bioseq import DNA, SequenceBatch
+
+    batch = SequenceBatch(data.reads, DNA)
+    return Case(lambda _: batch.composition, _total(data.reads), "MB/s")
+
+
+@case("index.build")
+def indexBuild(data: Dataset) -> Case:
+    from bioseq import SequenceIndex
+
+    return Case(lambda _: SequenceIndex(data.genes), _total(data.genes), "MB/s")
+
+
+@case("index.locate")
+def indexLocate(data: Dataset) -> Case:
+    from bioseq import SequenceIndex
+
+    index = SequenceIndex(data.genes)
+    patterns = [read[:20] for read in data.reads[:1000]]
+    return Case(lambda _: [index.locate(pattern) for pattern in patterns], _total(patterns), "MB/s")
+
+
+@case("sketch.build")
+def sketchBuild(data: Dataset) -> Case:
+    from bioseq import DNA
+
+    dna = DNA(data.chromosome)
+    return Case(lambda _: dna.sketch(), len(dna), "MB/s")
+
+
+@case("sketch.compare")
+def sketchCompare(data: Dataset) -> Case:
+    from bioseq import DNA, SketchSet
+
+    sketches = SketchSet(DNA(gene).sketch(k=15, size=200) for gene in data.genes)
+    return Case(lambda _: sketches.jaccard(), len(sketches) ** 2 * sketches.size, "Mhash/s")
+
+
+@case("codon.usage")
+def codonUsage(data: Dataset) -> Case:
+    from bioseq.codon import CodonUsage
+
+    return Case(lambda _: [CodonUsage.fromString(gene) for gene in data.genes], _total(data.genes), "MB/s")
+
+
+@case("codon.fasta")
+def codonFasta(data: Dataset) -> Case:
+    from bioseq.utils import codonUsageFasta
+
+    filename = data.fasta("genes")
+    return Case(lambda _: codonUsageFasta(filename, workers=1), os.path.getsize(filename), "MB/s")
+
+
+@case("mask.dust")
+def maskDust(data: Dataset) -> Case:
+    from bioseq.mask import dust
+
+    return Case(lambda _: dust(data.chromosome), len(data.chromosome), "MB/s")
+
+
+@case("mask.seg")
+def maskSeg(data: Dataset) -> Case:
+    from bioseq.mask import seg
+
+    return Case(lambda _: [seg(protein) for protein in data.proteome], _total(data.proteome), "MB/s")
+
+
+@case("search.seed")
+def searchSeed(data: Dataset) -> Case:
+    from bioseq import SeedIndex
+
+    index = SeedIndex(data.genes)
+    queries = [gene[1000: 1300] for gene in data.genes[:20]]
+    return Case(lambda _: [index.search(query) for query in queries], _total(queries), "MB/s")
+
+
+@case("digest.index")
+def digestIndex(data: Dataset) -> Case:
+    from bioseq.digestion import PeptideMassIndex
+
+    return Case(lambda _: PeptideMassIndex(data.proteome), _total(data.proteome), "MB/s")
+
+
+@case("digest.lookup")
+def digestLookup(data: Dataset) -> Case:
+    from bioseq.digestion import PeptideMassIndex
+
+    index = PeptideMassIndex(data.proteome)
+    masses = list(index.masses[::max(1, len(index) // 10000)])
+    return Case(lambda _: [index.lookup(mass, ppm=10) for mass in masses], len(masses), "klookup/s")
+
+
+@case("io.save")
+def ioSave(data: Dataset) -> Case:
+    from bioseq import DNA, io
+
+    seqs = [DNA(read) for read in data.reads]
+    filename = os.path.join(data.directory, "reads.bsq")
+    return Case(lambda _: io.save(seqs, filename), _total(data.reads), "MB/s")
+
+
+@case("io.load")
+def ioLoad(data: Dataset) -> Case:
+    from bioseq import DNA, io
+
+    filename = os.path.join(data.directory, "reads.bsq")
+    io.save((DNA(read) for read in data.reads), filename)
+
+    def load(_):
+        with io.load(filename) as f:
+            return [seq.seq for seq in f]
+
+    return Case(load, _total(data.reads), "MB/s")
+
+
+def measure(bench: Case, repeat: int) -> Dict[str, Any]:
+    """Time a case repeat times after one warm up run
+
+    Returns:
+        Dict[str, Any]: Times of each run and the throughput of the best one
+    """
+    bench.run(bench.setup())
+    times = []
+    for _ in range(repeat):
+        arg = bench.setup()
+        start = time.perf_counter()
+        bench.run(arg)
+        times.append(time.perf_counter() - start)
+    scale = UNITS[bench.unit]
+    return {
+        "unit": bench.unit,
+        "work": bench.work,
+        "times": times,
+        "best": min(times),
+        "median": statistics.median(times),
+        "throughput": bench.work / scale / min(times),
+    }
+
+
+def gitCommit() -> str:
+    """
+    Commit of the working tree, with "-dirty" suffix if there are uncommitted changes
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short=10", "HEAD"], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + "-dirty" if dirty else commit
+
+
+def run(scale: str = "small",
+        pattern: str = "*",
+        repeat: int = 5,
+        output: Optional[str] = None) -> Dict[str, Any]:
+    """Run the cases matched pattern and save results to output
+
+    Returns:
+        Dict[str, Any]: The saved results
+    """
+    commit = gitCommit()
+    report: Dict[str, Any] = {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        data = Dataset(scale, directory)
+        for name, factory in CASES.items():
+            if not fnmatch.fnmatch(name, pattern):
+                continue
+            result = report["results"][name] = measure(factory(data), repeat)
+            print(f"{name:<28}{result['throughput']:>10.3f} {result['unit']:<10}"
+                  f"best {result['best']:.4f}s  median {result['median']:.4f}s", flush=True)
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{commit}-{scale}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {output}")
+    return report
+
+
+def compare(base: str, new: str, threshold: float = 0.1) -> List[str]:
+    """Compare the throughput of two results, print the ratio of each case
+
+    Args:
+        base(str): Result file of the base commit
+        new(str): Result file of the new commit
+        threshold(float): A case is regressed if its throughput drops more than this ratio
+    Returns:
+        List[str]: Names of regressed cases
+    """
+    with open(base) as f:
+        base_report = json.load(f)
+    with open(new) as f:
+        new_report = json.load(f)
+    if base_report["scale"] != new_report["scale"]:
+        print(f"WARNING: compare results of different scales "
+              f"{base_report['scale']} and {new_report['scale']}")
+
+    print(f"{'case':<28}{base_report['commit']:>14}{new_report['commit']:>14}   ratio")
+    regressed = []
+    for name, result in new_report["results"].items():
+        if name not in base_report["results"]:
+            continue
+        if base_report["results"][name]["unit"] != result["unit"]:
+            print(f"{name:<28}unit changed from {base_report['results'][name]['unit']} to {result['unit']}")
+            continue
+        old, current = base_report["results"][name]["throughput"], result["throughput"]
+        ratio = current / old
+        flag = ""
+        if ratio < 1 - threshold:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(f"{name:<28}{old:>14.3f}{current:>14.3f}{ratio:>8.2f}{flag}")
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmark.suite", description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--filter", default="*", help="glob pattern of case names, such as 'align.*'")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="result file, default is benchmark/results/<commit>-<scale>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--list", action="store_true", help="list names of all cases")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+    elif args.compare:
+        return 1 if compare(*args.compare, threshold=args.threshold) else 0
+    else:
+        run(args.scale, args.filter, args.repeat, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,33 @@
-from bioseq._sequence import DNA, RNA, Peptide, Sequence
-__version__ = "1.1.5"
+from importlib import import_module
+
+from bioseq.alignment import Alignment
+from bioseq._sequence import DNA, RNA, Peptide, Sequence, SequenceEditor
+__version__ = "1.2.0"
+
+# other public names are imported on first access, so ``import bioseq`` doesn't load
+# sqlite3, multiprocessing and the modules not used by the caller
+_LAZY = {
+    "SequenceBatch": "batch", "peptide_hydropathy": "batch", "peptide_pI": "batch",
+    "AlignmentCache": "cache",
+    "CodonUsage": "codon",
+    "PeptideMassIndex": "digestion",
+    "FrozenDNA": "frozen", "FrozenPeptide": "frozen", "FrozenRNA": "frozen",
+    "FrozenSequence": "frozen", "InternPool": "frozen",
+    "SequenceIndex": "index",
+    "MultipleAlignment": "multiple", "msa": "multiple",
+    "SeedIndex": "search",
+    "SharedSequenceSet": "shared",
+    "Sketch": "sketch", "SketchSet": "sketch",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{_LAZY[name]}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -1,17 +1,92 @@
+import hashlib
+import logging
 import re
 
-from collections import Counter
-from typing import Dict, List, Optional, Tuple, TypeVar, Union
+from array import array
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import accumulate
+from math import gcd
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence as SequenceType, Tuple, TypeVar, Union
 
-from bioseq import config, algorithm
+from bioseq import config, algorithm, metrics
+from bioseq.alignment import Alignment
 from bioseq.config import AlignmentConfig
 
+logger = logging.getLogger(__name__)
+
+S = TypeVar("S", bound="Sequence")
+
+
+def _repeatCounter(seq: str, times: int) -> Counter:
+    """
+    Composition of seq repeated times
+    """
+    return Counter({key: value * times for key, value in Counter(seq).items()})
+
+
+def _joinVariants(seq: str, variants: Iterable[Tuple[int, str, str]]) \
+        -> Tuple[str, Counter, Counter, Optional[List[Tuple[int, int]]]]:
+    """
+    Apply variants in coordinates of seq by joining slices once, and count the residues removed and added.
+    Return the new sequence, removed residues, added residues and changed regions if the length is kept.
+    """
+    pieces, prev_end = [], 0
+    removed, added = Counter(), Counter()
+    changed: Optional[List[Tuple[int, int]]] = []
+    for pos, ref, alt in sorted(variants, key=lambda v: (v[0], len(v[1]))):
+        ref, alt = ref.upper(), alt.upper()
+        if pos < prev_end:
+            raise ValueError(f"Variant at {pos} overlapped previous variant ended at {prev_end}")
+        if pos < 0 or not seq.startswith(ref, pos):
+            raise ValueError(
+                f"Ref of variant at {pos} is {ref}, but sequence is {seq[pos: pos + len(ref)]}")
+        pieces.append(seq[prev_end: pos])
+        pieces.append(alt)
+        prev_end = pos + len(ref)
+        removed.update(ref)
+        added.update(alt)
+        if changed is not None and len(ref) == len(alt):
+            changed.append((pos, prev_end))
+        else:
+            changed = None
+    pieces.append(seq[prev_end:])
+    return "".join(pieces), removed, added, changed
+
+
+def _weightTable(seq_type: type) -> Dict[str, float]:
+    """
+    Molecular weight table in ``config.MW`` of seq_type or its nearest base type
+    """
+    for cls in seq_type.__mro__:
+        if cls.__name__ in config.MW:
+            return config.MW[cls.__name__]
+    raise KeyError(f"No molecular weight table for {seq_type.__name__}")
+
+
+@lru_cache(maxsize=None)
+def _complementTable(seq_type: type) -> bytes:
+    """
+    ``bytes.translate`` table of ``config.NC_INFO`` complement of seq_type or its nearest base type,
+    lower case is complemented to lower case and other chars are kept
+    """
+    for cls in seq_type.__mro__:
+        pairs = config.NC_INFO.get(cls.__name__ + "_COMPLEMENT")
+        if pairs is not None:
+            source, target = "".join(pairs), "".join(pairs.values())
+            return bytes.maketrans((source + source.lower()).encode("ascii"),
+                                   (target + target.lower()).encode("ascii"))
+    raise KeyError(f"No complement table for {seq_type.__name__}")
+
 
 class Sequence:
+    __slots__ = ("info", "_seq", "_composition", "_weight", "_digest")
     info: str
     _seq: str
-    _composition: Dict[str, Union[int, float]]
-    _weight: float
+    # cached properties are None until computed, so a computed zero won't be recomputed
+    _composition: Optional[Dict[str, Union[int, float]]]
+    _weight: Optional[float]
+    _digest: Optional[bytes]
 
     def __init__(self, seq: str, info: str = ""):
         """Base class of all sequence type
@@ -28,8 +103,32 @@ class Sequence:
         """
         Reset cached property related with sequence, called when sequence changed
         """
-        self._composition = {}
-        self._weight = 0.
+        self._composition = None
+        self._weight = None
+        self._digest = None
+
+    def _updateCache(self,
+                     removed: Counter,
+                     added: Counter,
+                     changed: Optional[List[Tuple[int, int]]] = None):
+        """
+        Update cached properties after some residues are replaced, instead of resetting all.
+        ``composition`` is adjusted by the delta, properties derived from composition
+        (weight, GC, pI) are recomputed from it without scanning the sequence.
+        Subclass should keep the caches which can be updated locally.
+
+        Args:
+            removed(Counter): Residues removed from sequence
+            added(Counter): Residues added to sequence
+            changed(List[Tuple[int, int]]): Changed regions if the length of sequence is not changed
+        """
+        composition = self._composition
+        self.reset_cache()
+        if composition is not None:
+            counter = Counter(composition)
+            counter.update(added)
+            counter.subtract(removed)
+            self._composition = {key: counter[key] for key in sorted(counter) if counter[key] > 0}
 
     @property
     def composition(self) -> Dict[str, Union[int, float]]:
@@ -38,11 +137,20 @@ class Sequence:
         Returns:
             Dict: Each element's appearance times or percentage in sequence
         """
-        if not self._composition:
+        if self._composition is None:
             counter = dict(Counter(self._seq))
             self._composition = {key: counter[key] for key in sorted(counter)}
         return self._composition
 
+    @property
+    def digest(self) -> bytes:
+        """
+        16 bytes BLAKE2b digest of sequence, stable across processes unlike ``hash()``
+        """
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self._seq.encode("utf8"), digest_size=16).digest()
+        return self._digest
+
     @property
     def length(self) -> int:
         """
@@ -67,24 +175,29 @@ class Sequence:
         Returns:
             weight(float): Molar mass with unit of Dalton
         """
-        if not self._weight:
-            weight_table = config.MW[self.__class__.__name__]
+        if self._weight is None:
+            weight_table = _weightTable(type(self))
             self._weight = sum(
-                [weight_table[e] for e in self._seq]) - 18 * (self.length - 1)
+                [weight_table[e] * n for e, n in self.composition.items()]) - 18 * (self.length - 1)
 
         return self._weight
 
     def align(self,
               subject: Union[str, "Sequence"],
-              mode: int = 1) \
-            -> Tuple[str, str, float]:
+              mode: int = 1,
+              compact: bool = False) \
+            -> Union[Tuple[str, str, float], Alignment]:
         """Align two sequence. Use ``bioseq.config.AlignmentConfig`` to set the alignment score,
-        including match(2), mismatch(-3), gap_open(-3), gap_extend(-3). number in brackets is default value
+        including match(2), mismatch(-3), gap_open(-3), gap_extend(-3). number in brackets is default value.
+        Results are memoized if ``AlignmentConfig.CACHE`` is set, see ``bioseq.cache``.
+        ``AlignmentConfig.MASK`` never matches, so hard masked regions are not aligned, see ``bioseq.mask``
 
         Args:
             subject(str|Sequence): Sequence to align
             mode(int): 1: Use Needleman-Wunsch to global alignment\n
                   2: Use Smith-Waterman to partial alignment
+            compact(bool): Return an ``Alignment`` with coordinates, CIGAR and statistics
+                instead of gapped strings
         Returns:
             tuple:
             query(str): Self sequence after alignment\n
@@ -92,25 +205,55 @@ class Sequence:
             score（int): align score if choose return_score
         """
         if isinstance(subject, self.__class__):
-            subject = subject._seq
-        elif not isinstance(subject, str):
+            subject_digest, subject = subject.digest, subject._seq
+        elif isinstance(subject, str):
+            subject_digest = None
+        else:
             raise TypeError(
                 f"Only str or {self.__class__.__name__} can be aligned to {self.__class__.__name__}")
 
         args = (self._seq, subject,
                 AlignmentConfig.MATCH, AlignmentConfig.MISMATCH,
-                AlignmentConfig.GAP_OPEN,  AlignmentConfig.GAP_EXTEND)
+                AlignmentConfig.GAP_OPEN,  AlignmentConfig.GAP_EXTEND,
+                AlignmentConfig.MASK or "\0")
 
         if mode == 1:
-            return algorithm.NeedlemanWunsch(*args)
+            aligner, mode_name = algorithm.NeedlemanWunsch, "global"
         elif mode == 2:
-            return algorithm.SmithWaterman(*args)
+            aligner, mode_name = algorithm.SmithWaterman, "local"
         else:
             raise TypeError("\
                 Please choose alignment mode:\n\
                 1-Global alignment by Needleman-Wunsch\n\
                 2-Local alignment by Smith-Waterman")
 
+        if compact:
+            query, local = self._seq, mode == 2
+
+            def aligner(*args) -> Alignment:
+                *args, mask = args
+                return Alignment(query, subject, *algorithm.AlignStats(*args, local, mask))
+
+        cache = AlignmentConfig.CACHE
+        if cache is not None:
+            if subject_digest is None:
+                subject_digest = hashlib.blake2b(subject.encode("utf8"), digest_size=16).digest()
+            key = cache.key(self.digest, subject_digest, mode, compact, *args[2:])
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+        if not metrics.ENABLED:
+            result = aligner(*args)
+        else:
+            with metrics.timer("bioseq_align_seconds", mode=mode_name):
+                result = aligner(*args)
+            metrics.inc("bioseq_align_calls_total", mode=mode_name)
+            metrics.inc("bioseq_align_cells_total", len(self._seq) * len(subject), mode=mode_name)
+        if cache is not None:
+            cache.put(key, result)
+        return result
+
     def find(self, target: Union[str, "Sequence"]) -> List[int]:
         """Find the target sequence in this sequence and return the positions
 
@@ -125,6 +268,53 @@ class Sequence:
 
         return [i.start() for i in re.finditer(target, self._seq)]
 
+    def build_index(self, step: int = 64) -> "SequenceIndex":
+        """Build an FM-index of this sequence for repeated ``count()``/``locate()`` queries,
+        the index can be saved to disk by ``SequenceIndex.save()``.
+        Index won't be updated after ``mutation()``
+
+        Args:
+            step(int): Interval of occurrence checkpoints, smaller is faster but larger
+        Returns:
+            SequenceIndex: Index of this sequence
+        """
+        from bioseq.index import SequenceIndex
+
+        return SequenceIndex([self], step=step)
+
+    def sketch(self, k: int = 21, size: int = 1000, canonical: bool = True) -> "Sketch":
+        """MinHash sketch of k-mers to estimate the similarity to other sequences without alignment,
+        see ``bioseq.sketch``
+
+        Args:
+            k(int): Length of k-mer, no more than 32 for DNA and RNA
+            size(int): Max number of hashes kept
+            canonical(bool): For DNA and RNA, k-mer and its reverse complement have the same hash
+        Returns:
+            Sketch: Sketch named by ``info``
+        """
+        from bioseq.sketch import Sketch, ANY, NUCLEOTIDE, CANONICAL
+
+        if isinstance(self, RNA):
+            mode = CANONICAL if canonical else NUCLEOTIDE
+        else:
+            mode = ANY
+        return Sketch.fromString(self._seq, k, size, mode, self.info)
+
+    def mask(self, regions: Iterable[Tuple[int, int]], soft: bool = False) -> str:
+        """Mask regions such as low complexity regions found by ``RNA.dust()`` or ``Peptide.seg()``,
+        see ``bioseq.mask``
+
+        Args:
+            regions(Iterable[Tuple[int, int]]): Sorted and disjoint (start, end) of regions
+            soft(bool): Convert regions to lower case instead of replacing them by ``config.MASK_CHAR``
+        Returns:
+            str: Masked sequence, hard masked one can be used to create a new sequence
+        """
+        from bioseq.mask import _maskChar, applyMask
+
+        return applyMask(self._seq, regions, soft, _maskChar(type(self)))
+
     def mutation(self,
                  position: Union[str, int, List[int]],
                  target: Union[str, "Sequence"]) -> str:
@@ -143,12 +333,21 @@ class Sequence:
             raise TypeError("Target should be str or Sequence")
 
         if isinstance(position, str):
+            count = self._seq.count(position)
             self._seq = self._seq.replace(position, target)
-            # Reset cached property related with sequence(weight, composition...)
-            self.reset_cache()
+            # Update cached property related with sequence(weight, composition...)
+            self._updateCache(_repeatCounter(position, count), _repeatCounter(target, count))
             return self._seq
 
         elif isinstance(position, int):
+            if position >= 0:
+                # slicing is much faster than list for single mutation, such as mutagenesis scanning
+                end = position + len(target)
+                replaced = self._seq[position: end]
+                self._seq = self._seq[:position] + target + self._seq[end:]
+                self._updateCache(Counter(replaced), Counter(target),
+                                  [(position, end)] if len(replaced) == len(target) else None)
+                return self._seq
             position = [position]
 
         elif not isinstance(position, List):
@@ -156,24 +355,66 @@ class Sequence:
 
         seq_list, length = list(self._seq), len(target)
         prev_end = 0    # previous end of mutation
+        removed, added = Counter(), Counter()
+        changed: Optional[List[Tuple[int, int]]] = []
 
-        while position:
-            pos = position.pop(0)
+        for pos in position:
             if not isinstance(pos, int):
                 raise TypeError("Position must be int")
 
             if pos < prev_end:
-                print(
-                    f"WARNING: mutation <{pos}~{pos + length}> overlapped previous mutation <{prev_end - length}~{prev_end}>")
+                logger.warning("mutation <%d~%d> overlapped previous mutation <%d~%d>",
+                               pos, pos + length, prev_end - length, prev_end)
 
             prev_end = pos + length
+            replaced = seq_list[pos: prev_end]
+            removed.update(replaced)
+            added.update(target)
+            if changed is not None and pos >= 0 and len(replaced) == length:
+                changed.append((pos, prev_end))
+            else:
+                changed = None
             seq_list[pos: prev_end] = target
         self._seq = "".join(seq_list)
 
-        # Reset cached property related with sequence(weight, composition...)
-        self.reset_cache()
+        # Update cached property related with sequence(weight, composition...)
+        self._updateCache(removed, added, changed)
         return self._seq
 
+    def edit(self) -> "SequenceEditor":
+        """Start an edit session, edits are applied in one pass and cached properties
+        are updated once when the session is committed
+
+        >>> with seq.edit() as editor:
+        ...     editor.mutation(10, "A")
+        ...     editor.variant(20, "KR", "K")
+
+        Returns:
+            SequenceEditor: Editor of this sequence
+        """
+        return SequenceEditor(self)
+
+    def apply_variants(self: S, variants: Iterable[Tuple[int, str, str]]) -> S:
+        """Apply variants to a copy of this sequence in one linear pass, this sequence is not changed.
+        All positions are 0-based coordinates of this sequence, so the shift caused by indels
+        is handled automatically, such as ``[(2, "A", "AGG"), (10, "TC", "T")]``
+
+        Args:
+            variants(Iterable[Tuple[int, str, str]]): (position, ref, alt) of each variant,
+                ref should be same as the sequence at position, can be "" for insertion
+        Returns:
+            Sequence: New sequence of same type with all variants
+        """
+        return self.__class__(_joinVariants(self._seq, variants)[0], self.info)
+
+    def freeze(self) -> "FrozenSequence":
+        """
+        Convert to an immutable and hashable instance of same type, such as ``FrozenDNA`` for ``DNA``
+        """
+        from bioseq.frozen import freeze
+
+        return freeze(self)
+
     def toDNA(self) -> "DNA":
         """
         Convert to a DNA instance
@@ -200,6 +441,10 @@ class Sequence:
             return f"{self._seq[:10]}...{self._seq[-10:]}"
         return self._seq
 
+    def __reduce__(self):
+        # only pickle the sequence and info, cached properties are computed again when needed
+        return self.__class__, (self._seq, self.info)
+
     def __add__(self, s: Union[str, "Sequence"]) -> "Sequence":
         if isinstance(s, str):
             return self.__class__(self._seq + s)
@@ -223,9 +468,7 @@ class Sequence:
             return self._seq == o
         elif isinstance(o, self.__class__):
             return self._seq == o._seq
-        else:
-            raise TypeError(
-                f"Expect str or {self.__class__.__name__} compare to {self.__class__.__name__}, not {o.__class__.__name__}")
+        return NotImplemented
 
     def __getitem__(self, index: int) -> str:
         return self._seq[index]
@@ -240,35 +483,188 @@ class Sequence:
         return self._print()
 
 
+class SequenceEditor:
+    """Edit session of a sequence, created by ``Sequence.edit()``.
+    Positions of all edits are coordinates of the sequence before editing, edits must not overlap.
+    Edits are applied on ``commit()`` or when leaving the ``with`` block without error.
+    """
+    sequence: Sequence
+
+    def __init__(self, sequence: Sequence):
+        self.sequence = sequence
+        self._variants: List[Tuple[int, str, str]] = []
+
+    def mutation(self, position: Union[int, List[int]], target: Union[str, Sequence]) -> "SequenceEditor":
+        """Replace the residues at each position with target, like ``Sequence.mutation()``
+
+        Args:
+            position(int|List[int]): index(s) to be mutation
+            target(str|Sequence): the target char of mutation
+        Returns:
+            SequenceEditor: self
+        """
+        if isinstance(target, Sequence):
+            target = target.seq
+        for pos in [position] if isinstance(position, int) else position:
+            self._variants.append((pos, self.sequence.seq[pos: pos + len(target)], target))
+        return self
+
+    def variant(self, position: int, ref: str, alt: str) -> "SequenceEditor":
+        """Add a variant, like ``Sequence.apply_variants()``
+
+        Args:
+            position(int): Position of variant
+            ref(str): Original residues at position
+            alt(str): Residues replace ref
+        Returns:
+            SequenceEditor: self
+        """
+        self._variants.append((position, ref, alt))
+        return self
+
+    def commit(self) -> str:
+        """Apply all edits and update cached properties
+
+        Returns:
+            str: Sequence after modified
+        """
+        seq, removed, added, changed = _joinVariants(self.sequence.seq, self._variants)
+        self.sequence._seq = seq
+        self.sequence._updateCache(removed, added, changed)
+        self._variants = []
+        return seq
+
+    def discard(self):
+        """
+        Drop all edits not committed
+        """
+        self._variants = []
+
+    def __enter__(self) -> "SequenceEditor":
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+def _hydropathyScale(scale: Union[str, Dict[str, float]]) -> Dict[str, float]:
+    """
+    Get the hydropathy table by name in ``config.HYDROPATHY_SCALES`` or use a custom table
+    """
+    if isinstance(scale, dict):
+        return scale
+    try:
+        return config.HYDROPATHY_SCALES[scale]
+    except KeyError:
+        raise ValueError(
+            f"Unknown hydropathy scale {scale}, choose from {list(config.HYDROPATHY_SCALES)}") from None
+
+
+def _windowAverage(prefix: SequenceType[float], start: int, length: int, window_size: int) -> List[float]:
+    """
+    Average of each window in ``values[start: start + length]`` by the prefix sum of values,
+    the windows are centered at position in [window_size // 2, length - window_size // 2)
+    """
+    half_part = window_size // 2
+    return [round((prefix[i + window_size] - prefix[i]) / window_size, 3)
+            for i in range(start, start + length - 2 * half_part)]
+
+
+def _chargedResidues() -> List[str]:
+    """
+    Charged amino acids in ``config.PK``, positive first, the order of counts used by ``_chargeFunction()``
+    """
+    return [*config.PK["pos_pK"], *config.PK["neg_pK"]]
+
+
+def _chargeFunction(counts: SequenceType[int]) -> Callable[[float], float]:
+    """
+    Create the charge function of pH for a peptide with counts of ``_chargedResidues()``,
+    pK of all charged groups are converted to :math:`10^{-pK_a}` or :math:`10^{pK_a}` once,
+    so each evaluation only need one power
+    """
+    pos_pK = [config.PK["Nterm"], *config.PK["pos_pK"].values()]
+    neg_pK = [config.PK["Cterm"], *config.PK["neg_pK"].values()]
+    pos_counts = (1, *counts[:len(pos_pK) - 1])
+    neg_counts = (1, *counts[len(pos_pK) - 1:])
+
+    pos = [(c, 10 ** -pK) for c, pK in zip(pos_counts, pos_pK) if c]
+    neg = [(c, 10 ** pK) for c, pK in zip(neg_counts, neg_pK) if c]
+
+    def charge(pH: float) -> float:
+        h = 10 ** pH
+        return sum([c / (h * k + 1.0) for c, k in pos]) - \
+            sum([c / (k / h + 1.0) for c, k in neg])
+
+    return charge
+
+
+def _isoelectricPoint(counts: SequenceType[int]) -> float:
+    """
+    Bisect the pH where charge of peptide with counts of ``_chargedResidues()`` equal zero
+    """
+    charge = _chargeFunction(counts)
+    min, max = 0., 14.
+    pH = (min + max) / 2
+    value = charge(pH)
+    # stop when the interval can't be split by float
+    while abs(value) > 1e-8 and min < pH < max:
+        if value > 0:
+            min = pH
+        else:
+            max = pH
+        pH = (min + max) / 2
+        value = charge(pH)
+    return round(pH, 3)
+
+
 class Peptide(Sequence):
-    _pI: float
-    _Hphob_list: List[float]
+    __slots__ = ("_pI", "_Hphob")
+    _pI: Optional[float]
+    _Hphob: Optional[Dict[Tuple[int, str], List[float]]]
 
     def reset_cache(self):
         super().reset_cache()
-        self._pI = 0.
-        self._Hphob_list = []
+        self._pI = None
+        self._Hphob = None
+
+    def _updateCache(self,
+                     removed: Counter,
+                     added: Counter,
+                     changed: Optional[List[Tuple[int, int]]] = None):
+        hphob = self._Hphob
+        super()._updateCache(removed, added, changed)
+        if not hphob or changed is None:
+            return
+
+        # only recompute the windows overlapped with changed regions
+        for (window_size, scale), hphob_list in hphob.items():
+            table = _hydropathyScale(scale)
+            hphob_list = hphob[window_size, scale] = list(hphob_list)
+            for start, end in changed:
+                for i in range(max(0, start - window_size + 1), min(len(hphob_list), end)):
+                    hphob_list[i] = round(
+                        sum([table[aa] for aa in self._seq[i: i + window_size]]) / window_size, 3)
+        self._Hphob = hphob
 
     @property
     def pI(self) -> float:
         """
         Calculate the peptide's pI which is a pH make peptide's charge equal zero
         """
-        if not self._pI:
-            min = 0.
-            max = 14.
-            pH = (min + max) / 2
-            charge = self.chargeInpH(pH)
-            while abs(charge) > 1e-8:
-                if charge > 0:
-                    min = pH
-                else:
-                    max = pH
-                pH = (min + max) / 2
-                charge = self.chargeInpH(pH)
-            self._pI = round(pH, 3)
+        if self._pI is None:
+            self._pI = _isoelectricPoint(self._chargeCounts())
         return self._pI
 
+    def _chargeCounts(self) -> Tuple[int, ...]:
+        """
+        Counts of charged amino acids, ordered by ``config.PK``
+        """
+        return tuple(self.composition.get(aa, 0) for aa in _chargedResidues())
+
     def chargeInpH(self, pH: float) -> float:
         """
         Calculate the charge amount of peptide at pH
@@ -289,61 +685,102 @@ class Peptide(Sequence):
         Returns:
             float: charge in specific pH
         """
-        pos_charge = 1.0 / (10 ** (pH - config.PK["Nterm"]) + 1.0)
-        for pos_aa, aa_pK in config.PK["pos_pK"].items():
-            pos_charge += self.composition.get(pos_aa, 0) / \
-                (10 ** (pH - aa_pK) + 1.0)
+        return _chargeFunction(self._chargeCounts())(pH)
 
-        neg_charge = 1.0 / (10 ** (config.PK["Cterm"] - pH) + 1.0)
-        for neg_aa, aa_pK in config.PK["neg_pK"].items():
-            neg_charge += self.composition.get(neg_aa, 0) / \
-                (10 ** (aa_pK - pH) + 1.0)
+    def chargeCurve(self, pH_values: Iterable[float]) -> List[float]:
+        """Calculate the charge amount of peptide at many pH, same as ``chargeInpH()`` for each pH
 
-        return pos_charge - neg_charge
+        Args:
+            pH_values(Iterable[float]): pH values
+        Returns:
+            List[float]: charge at each pH
+        """
+        charge = _chargeFunction(self._chargeCounts())
+        return [charge(pH) for pH in pH_values]
 
     def getHphob(self,
                  window_size: int = 9,
-                 show_img: bool = False) -> List[float]:
+                 show_img: bool = False,
+                 scale: Union[str, Dict[str, float]] = "KD") -> List[float]:
         """
         Calculate the Hydropathy Score.The lager the score, the higher the hydrophobicity.
         Each aa's score is the average score of all aa in window_size.
-        So part of Amino Acid at begin and end don't have score
+        So part of Amino Acid at begin and end don't have score.
+        Scores are calculated by prefix sum in O(n) and cached by (window_size, scale)
 
         Args:
             window_size(int): the number for calculate average hydropathy value
             show_img(book): whether to draw the result, require ``matplotlib``
+            scale(str|Dict[str, float]): name of scale in ``config.HYDROPATHY_SCALES`` or a custom table
         Returns:
             List[float]: the result of peptide's Hydropathy Score
         """
-        if not self._Hphob_list:
-            _Hphob = [config.HYDROPATHY[aa] for aa in self._seq]
-            half_part = window_size // 2
+        key = (window_size, scale) if isinstance(scale, str) else None
+        hphob_list = self._Hphob.get(key) if key and self._Hphob else None
 
-            if len(_Hphob) < half_part:
-                print("WARNING: Windows size is to big to calculate")
+        if hphob_list is None:
+            table = _hydropathyScale(scale)
+            if self.length < window_size // 2:
+                logger.warning("Windows size is to big to calculate")
 
-            for i in range(half_part, len(_Hphob) - half_part):
-                self._Hphob_list.append(
-                    round(sum(_Hphob[i - half_part: i + window_size - half_part]) / window_size, 3))
+            prefix = list(accumulate((table[aa] for aa in self._seq), initial=0.))
+            hphob_list = _windowAverage(prefix, 0, self.length, window_size)
+            if key:
+                if self._Hphob is None:
+                    self._Hphob = {}
+                self._Hphob[key] = hphob_list
 
         if show_img:
             try:
                 import matplotlib.pyplot as plt
             except ImportError:
-                print(
-                    "Can't import matplotlib.pyplot, please use 'pip install matplotlib' to install.")
+                logger.error("Can't import matplotlib.pyplot, please use 'pip install matplotlib' to install.")
             else:
                 plt.title(
                     f"Hydropathy Score for {self._seq[:4]}...{self._seq[-4:]}")
                 plt.plot(range(window_size // 2 + 1, self.length -
-                               window_size // 2 + 1), self._Hphob_list, linewidth=0.8)
+                               window_size // 2 + 1), hphob_list, linewidth=0.8)
                 plt.xlim((1, self.length + 1))
                 plt.grid(linestyle="--")
                 plt.xlabel("Position")
                 plt.ylabel("Score")
                 plt.show()
 
-        return self._Hphob_list
+        return hphob_list
+
+    def seg(self, window: int = 12, locut: float = 2.2, hicut: float = 2.5) -> List[Tuple[int, int]]:
+        """Find low complexity regions by SEG, mask them by ``mask()``, see ``bioseq.mask.seg()``
+
+        Args:
+            window(int): Length of window
+            locut(float): Trigger complexity in bits
+            hicut(float): Extension complexity in bits
+        Returns:
+            List[Tuple[int, int]]: Sorted and disjoint (start, end) of low complexity regions
+        """
+        from bioseq.mask import seg
+
+        return seg(self._seq, window, locut, hicut)
+
+    def cleave(self,
+               enzyme: str = "trypsin",
+               missed_cleavages: int = 2,
+               min_length: int = 1,
+               max_length: Optional[int] = None) -> List["Peptide"]:
+        """In-silico digestion by a protease, see ``bioseq.digestion`` to index a proteome by fragment mass
+
+        Args:
+            enzyme(str): Name in ``config.ENZYMES`` or a zero width regular expression of cleavage site
+            missed_cleavages(int): Max number of cleavage sites inside a fragment
+            min_length(int): Min length of fragments
+            max_length(int): Max length of fragments, default is unlimited
+        Returns:
+            List[Peptide]: Fragments ordered by start then end, info is "start-end" of fragment in this peptide
+        """
+        from bioseq.digestion import fragments
+
+        return [Peptide(self._seq[start: end], f"{start}-{end}")
+                for start, end in fragments(self._seq, enzyme, missed_cleavages, min_length, max_length)]
 
     def _print(self) -> str:
         """
@@ -357,35 +794,160 @@ class Peptide(Sequence):
 T = TypeVar("T", "RNA", "DNA")
 
 
+def _gcWindows(chunks: Iterable[str], window: int, step: int) -> Iterator[Tuple[int, int]]:
+    """
+    Count G and C in each window of a sequence given by chunks, windows start at 0, step, 2 * step...
+    and the last incomplete window is dropped. Sequence is split into blocks of ``gcd(window, step)``,
+    each window is the difference of two cumulative block counts, so the cost is O(n) for any window
+    and the memory is bounded by the block number in a window.
+    """
+    if window <= 0 or step <= 0:
+        raise ValueError("window and step should be positive")
+
+    size = gcd(window, step)
+    blocks, blocks_step = window // size, step // size
+    g = c = skip = 0
+    # cumulative counts at the boundaries of blocks from the start of current window
+    prefix = deque([(0, 0)])
+    rest = ""
+
+    for chunk in chunks:
+        rest += chunk
+        end = len(rest) - len(rest) % size
+        for i in range(0, end, size):
+            g += rest.count("G", i, i + size)
+            c += rest.count("C", i, i + size)
+            if skip:
+                skip -= 1
+                continue
+            prefix.append((g, c))
+            if len(prefix) > blocks:
+                yield prefix[-1][0] - prefix[0][0], prefix[-1][1] - prefix[0][1]
+                # drop boundaries before the start of next window
+                if blocks_step < len(prefix):
+                    for _ in range(blocks_step):
+                        prefix.popleft()
+                else:
+                    skip = blocks_step - len(prefix)
+                    prefix.clear()
+        rest = rest[end:]
+
+
 class RNA(Sequence):
-    _GC: float
-    orf: List[str]          #: Can only visit after called `get_orf()`
-    peptide: List[Peptide]  #: Can only visit after called `transcript()`
+    __slots__ = ("_GC", "_orf", "_peptide")
+    _GC: Optional[float]
+    _orf: Optional[List[str]]
+    _peptide: Optional[List[Peptide]]
 
     def reset_cache(self):
-        self._GC, self.orf, self.peptide = 0., [], []
+        self._GC, self._orf, self._peptide = None, None, None
         super().reset_cache()
 
+    @property
+    def orf(self) -> List[str]:
+        """
+        Orf found by the last ``getOrf()``, empty before called
+        """
+        return self._orf if self._orf is not None else []
+
+    @orf.setter
+    def orf(self, orf: List[str]):
+        self._orf = orf
+
+    @property
+    def peptide(self) -> List[Peptide]:
+        """
+        Transcript product of the last ``transcript()``, empty before called
+        """
+        return self._peptide if self._peptide is not None else []
+
+    @peptide.setter
+    def peptide(self, peptide: List[Peptide]):
+        self._peptide = peptide
+
     @property
     def complement(self: T) -> T:
         """
         Return self complementary sequence
         """
-        complement_dict = config.NC_INFO[self.__class__.__name__ + "_COMPLEMENT"]
-        complement_seq = "".join([complement_dict[bp]
-                                 for bp in self._seq[::-1]])
-        return self.__class__(complement_seq)
+        table = _complementTable(self.__class__)
+        return self.__class__(self._seq.encode("ascii").translate(table)[::-1].decode("ascii"))
 
     @property
     def GC(self) -> float:
         """
         Calculate the GC percentage
         """
-        if not self._GC:
+        if self._GC is None:
             self._GC = round(
-                (self.composition["C"] + self.composition["G"]) / self.length, 4)
+                (self.composition.get("C", 0) + self.composition.get("G", 0)) / self.length, 4) \
+                if self.length else 0.
         return self._GC
 
+    def gcProfile(self, window: int = 1000, step: int = 1000) -> array:
+        """Calculate the GC percentage of each sliding window in O(n),
+        use ``bioseq.utils.gcProfileFasta()`` for the sequences too large to load
+
+        Args:
+            window(int): Length of each window, the last incomplete window is dropped
+            step(int): Distance between the start of two adjacent windows
+        Returns:
+            array: GC percentage of each window, ``array("d")``
+        """
+        return array("d", [(g + c) / window for g, c in _gcWindows((self._seq,), window, step)])
+
+    def gcSkew(self, window: int = 1000, step: int = 1000) -> array:
+        """Calculate the GC skew :math:`(G - C) / (G + C)` of each sliding window in O(n),
+        the skew of window without G or C is 0
+
+        Args:
+            window(int): Length of each window, the last incomplete window is dropped
+            step(int): Distance between the start of two adjacent windows
+        Returns:
+            array: GC skew of each window, ``array("d")``
+        """
+        return array("d", [(g - c) / (g + c) if g + c else 0.
+                           for g, c in _gcWindows((self._seq,), window, step)])
+
+    def codonUsage(self) -> "CodonUsage":
+        """Count in-frame codons from the first base, such as a CDS, see ``bioseq.codon``
+
+        Returns:
+            CodonUsage: 64 codon counts named by ``info``
+        """
+        from bioseq.codon import CodonUsage
+
+        return CodonUsage.fromString(self._seq, self.info)
+
+    def RSCU(self) -> Dict[str, float]:
+        """
+        Relative Synonymous Codon Usage of each codon, see ``CodonUsage.rscu()``
+        """
+        return self.codonUsage().rscu()
+
+    def CAI(self, reference: Union["CodonUsage", Dict[str, float]]) -> float:
+        """Codon Adaptation Index of this coding sequence, see ``CodonUsage.cai()``
+
+        Args:
+            reference(CodonUsage|Dict[str, float]): Usage of highly expressed genes, or the weights of codons
+        Returns:
+            float: CAI from 0 to 1
+        """
+        return self.codonUsage().cai(reference)
+
+    def dust(self, window: int = 64, threshold: float = 20.) -> List[Tuple[int, int]]:
+        """Find low complexity regions by DUST, mask them by ``mask()``, see ``bioseq.mask.dust()``
+
+        Args:
+            window(int): Length of window, at least 4
+            threshold(float): Windows scoring above it are masked, lower masks more
+        Returns:
+            List[Tuple[int, int]]: Sorted and disjoint (start, end) of low complexity regions
+        """
+        from bioseq.mask import dust
+
+        return dust(self._seq, window, threshold)
+
     @property
     def reversed(self: T) -> T:
         """
@@ -427,7 +989,11 @@ class RNA(Sequence):
         self.orf = [self._seq[se[0]: se[1]] for se in end_points[:topn]]
 
         if replace:
-            self._seq = self.orf[0]
+            orf = self.orf
+            self._seq = orf[0]
+            # cached properties such as digest (the key of AlignmentCache) belong to the old sequence
+            self.reset_cache()
+            self._orf = orf
 
         return self.orf
 
@@ -463,6 +1029,7 @@ class RNA(Sequence):
 
 
 class DNA(RNA):
+    __slots__ = ("_translate",)
     _translate: Optional[RNA]
 
     def reset_cache(self):
@@ -473,7 +1040,7 @@ class DNA(RNA):
         """
         Translate the sequence to RNA, which replace the T with U
         """
-        if not self._translate:
+        if self._translate is None:
             self._translate = RNA(self._seq.replace("T", "U"))
         return self._translate
 
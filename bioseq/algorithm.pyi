@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 
 def NeedlemanWunsch(query: str,
@@ -6,7 +6,8 @@ def NeedlemanWunsch(query: str,
                     match: float,
                     mismatch: float,
                     gap_open: float,
-                    gap_extend: float) -> Tuple[str, str, float]:
+                    gap_extend: float,
+                    mask: str = "\0") -> Tuple[str, str, float]:
     ...
 
 
@@ -15,5 +16,92 @@ def SmithWaterman(query: str,
                   match: float,
                   mismatch: float,
                   gap_open: float,
-                  gap_extend: float) -> Tuple[str, str, float]:
+                  gap_extend: float,
+                  mask: str = "\0") -> Tuple[str, str, float]:
+    ...
+
+
+def AlignStats(query: str,
+               subject: str,
+               match: float,
+               mismatch: float,
+               gap_open: float,
+               gap_extend: float,
+               local: bool,
+               mask: str = "\0") -> Tuple[float, int, int, int, int, str, int, int, int, int, int]:
+    ...
+
+
+def UPGMA(dist: bytes, n: int) -> Tuple[bytes, bytes]:
+    ...
+
+
+def NeighborJoining(dist: bytes, n: int) -> Tuple[bytes, bytes]:
+    ...
+
+
+def ProfileAlign(rows_a: bytes,
+                 depth_a: int,
+                 rows_b: bytes,
+                 depth_b: int,
+                 match: float,
+                 mismatch: float,
+                 gap_open: float,
+                 gap_extend: float,
+                 mask: str = "\0") -> bytes:
+    ...
+
+
+def SuffixArray(text: bytes) -> Tuple[bytes, bytes]:
+    ...
+
+
+def PackBases(seq: str, alphabet: bytes) -> bytes:
+    ...
+
+
+def UnpackBases(packed: bytes, length: int, alphabet: bytes) -> str:
+    ...
+
+
+def MinHash(seq: str, k: int, size: int, mode: int) -> bytes:
+    ...
+
+
+def SketchMatrix(hashes_a: bytes,
+                 offsets_a: bytes,
+                 hashes_b: bytes,
+                 offsets_b: bytes,
+                 size: int,
+                 containment: bool) -> bytes:
+    ...
+
+
+def KmerIndex(text: bytes, k: int, alphabet: bytes) -> Tuple[bytes, bytes]:
+    ...
+
+
+def SeedExtend(query: str,
+               text: bytes,
+               offsets: bytes,
+               positions: bytes,
+               k: int,
+               alphabet: bytes,
+               match: float,
+               mismatch: float,
+               xdrop: float,
+               min_score: float,
+               max_occurrences: int) -> bytes:
+    ...
+
+
+def Dust(seq: str, window: int, threshold: float) -> List[Tuple[int, int]]:
+    ...
+
+
+def Seg(seq: str, window: int, locut: float, hicut: float) -> List[Tuple[int, int]]:
+    ...
+
+
+def CodonCount(seq: str) -> bytes:
     ...
@@ -1,3 +1,6 @@
+#include <ctype.h>
+#include <math.h>
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -6,7 +9,8 @@
 
 mNode **initMatrix(int row_length, int column_length)
 { /*
-   *Description:  Initial the score matrix
+   *Description:  Initial the score matrix, row pointers, node pointers of each row and all nodes are allocated
+                  in one block, nodes are set to zero, the matrix is freed by release()
    *Input:
       @row_length:    The num of rows, equals to the len(query) + 1
       @column_length: The num of columns, equals to the len(subject) + 1
@@ -15,36 +19,24 @@ mNode **initMatrix(int row_length, int column_length)
       @matrix         The pointer of score matrix
    */
     int i = 0, j = 0;
-    mNode **matrix;
+    size_t row_bytes = sizeof(mNode *) * (row_length + 1);
+    size_t pointer_bytes = sizeof(mNode) * (size_t)row_length * (column_length + 1);
+    char *block;
 
-    if ((matrix = (mNode **)malloc(sizeof(mNode *) * (row_length + 1))) == NULL)
+    if ((block = calloc(1, row_bytes + pointer_bytes + sizeof(matrixNode) * (size_t)row_length * column_length)) == NULL)
     {
         fputs("Error: Out of space!\n", stderr);
         exit(1);
     }
+    mNode **matrix = (mNode **)block;
+    mNode *pointers = (mNode *)(block + row_bytes);
+    mNode nodes = (mNode)(block + row_bytes + pointer_bytes);
     /* create row_length x columns_length nodes*/
     for (i = 0; i < row_length; i++)
     {
-        if ((matrix[i] = (mNode *)malloc(sizeof(mNode) * (column_length + 1))) == NULL)
-        {
-            fputs("Error: Out of space!\n", stderr);
-            exit(1);
-        }
+        matrix[i] = pointers + (size_t)i * (column_length + 1);
         for (j = 0; j < column_length; j++)
-        {
-            if ((matrix[i][j] = (mNode)malloc(sizeof(matrixNode))) == NULL)
-            {
-                fputs("Error: Out of space!\n", stderr);
-                exit(1);
-            }
-            matrix[i][j]->uScore = 0;
-            matrix[i][j]->lScore = 0;
-            matrix[i][j]->mScore = 0;
-            matrix[i][j]->up = 0;
-            matrix[i][j]->left = 0;
-            matrix[i][j]->upLeft = 0;
-            matrix[i][j]->score = 0;
-        }
+            matrix[i][j] = nodes + (size_t)i * column_length + j;
     }
     return matrix;
 }
@@ -100,6 +92,74 @@ void backTracking(mNode node, int *current_i, int *current_j, char query_base, c
     }
 }
 
+void recordOp(mNode node, char query_base, char subject_base, char mask, alignStats *stats)
+{ /*
+   *Description: Record the operation of current node when back-tracking, call it before backTracking()
+   *Input:
+      @node:          current node
+      @query_base:    base in query to compare
+      @subject_base:  base in subject to compare
+      @mask:          base never matched, '\0' for none
+   *Output:
+      @stats:         operation is appended to stats->ops, counts are increased
+   *Return:           None
+   */
+    char op;
+    if (node->left)
+    {
+        op = 'D';
+        stats->deletions++;
+    }
+    else if (node->upLeft)
+    {
+        if (query_base == subject_base && query_base != mask)
+        {
+            op = '=';
+            stats->matches++;
+        }
+        else
+        {
+            op = 'X';
+            stats->mismatches++;
+        }
+    }
+    else if (node->up)
+    {
+        op = 'I';
+        stats->insertions++;
+    }
+    else
+        return;
+
+    if ((op == 'I' || op == 'D') && (stats->length == 0 || stats->ops[stats->length - 1] != op))
+        stats->gap_opens++;
+    stats->ops[stats->length++] = op;
+}
+
+int formatCigar(const alignStats *stats, char *cigar)
+{ /*
+   *Description: Format the run-length CIGAR string of recorded operations, such as "5=1X2I3="
+   *Input:
+      @stats:     stats recorded by recordOp()
+   *Output:
+      @cigar:     CIGAR string, should have at least 12 * stats->length + 1 bytes
+   *Return:
+      @length:    length of CIGAR string
+   */
+    int length = 0, run = 0;
+    for (int k = stats->length - 1; k >= 0; k--)
+    {
+        run++;
+        if (k == 0 || stats->ops[k - 1] != stats->ops[k])
+        {
+            length += sprintf(cigar + length, "%d%c", run, stats->ops[k]);
+            run = 0;
+        }
+    }
+    cigar[length] = '\0';
+    return length;
+}
+
 void release(mNode **matrix, int rows, int columns)
 { /*
    *Description: free the matrix
@@ -108,14 +168,7 @@ void release(mNode **matrix, int rows, int columns)
       @rows:      Rows num of matrix
       @columns    Columns of matrix
    */
-    for (int i = 0; i <= rows; i++)
-    {
-        for (int j = 0; j <= columns; j++)
-        {
-            free(matrix[i][j]);
-        }
-        free(matrix[i]);
-    }
+    /* the whole matrix is one block from initMatrix() */
     free(matrix);
 }
 
@@ -140,9 +193,10 @@ void reverseStr(char *str)
 
 void NeedlemanWunsch(char *query, char *subject,
                      char *aligned_query, char *aligned_subject,
+                     alignStats *stats,
                      float *score,
                      float match, float mismatch,
-                     float gap_open, float gap_extend)
+                     float gap_open, float gap_extend, char mask)
 { /*
    *Description:  Align query and subject by Needleman-Wunsch
    *Input:
@@ -152,13 +206,16 @@ void NeedlemanWunsch(char *query, char *subject,
       @mismatch:  Score when two base are different
       @gap_open:  Score when gap appear
       @gap_extend:Score when gap extend
+      @mask:      Base never matched even to itself, such as hard masked 'N', '\0' for none
    *Output:
-      @aligned_query:     Sequence 1 after aligned
-      @aligned_subject:   Sequence 2 after aligned
+      @aligned_query:     Sequence 1 after aligned, skipped if NULL
+      @aligned_subject:   Sequence 2 after aligned, skipped if NULL
+      @stats:             Statistics and operations of alignment, skipped if NULL
       @score:             Max score of align
    *Return:   None
    */
     float match_score;
+    char buffer[1]; // back-tracking target when aligned strings are not required
     int i = 0, j = 0, index = 0;
     int rows = strlen(query);
     int columns = strlen(subject);
@@ -203,7 +260,7 @@ void NeedlemanWunsch(char *query, char *subject,
             score_matrix[i][j]->lScore = max2(score_matrix[i][j - 1]->mScore + gap_open,
                                               score_matrix[i][j - 1]->lScore + gap_extend);
 
-            match_score = query[i - 1] == subject[j - 1] ? match : mismatch;
+            match_score = query[i - 1] == subject[j - 1] && query[i - 1] != mask ? match : mismatch;
             score_matrix[i][j]->mScore = score_matrix[i - 1][j - 1]->score + match_score;
 
             score_matrix[i][j]->score = max3(score_matrix[i][j]->uScore,
@@ -260,23 +317,38 @@ void NeedlemanWunsch(char *query, char *subject,
     j = columns;
     while ((i || j))
     {
-        backTracking(score_matrix[i][j], &i, &j, query[i - 1], subject[j - 1], aligned_query, aligned_subject, index);
+        if (stats != NULL)
+            recordOp(score_matrix[i][j], query[i - 1], subject[j - 1], mask, stats);
+        if (aligned_query != NULL)
+            backTracking(score_matrix[i][j], &i, &j, query[i - 1], subject[j - 1], aligned_query, aligned_subject, index);
+        else
+            backTracking(score_matrix[i][j], &i, &j, 0, 0, buffer, buffer, 0);
         index++;
     }
-    aligned_query[index] = '\0';
-    aligned_subject[index] = '\0';
-
-    reverseStr(aligned_query);
-    reverseStr(aligned_subject);
+    if (aligned_query != NULL)
+    {
+        aligned_query[index] = '\0';
+        aligned_subject[index] = '\0';
+        reverseStr(aligned_query);
+        reverseStr(aligned_subject);
+    }
+    if (stats != NULL)
+    {
+        stats->query_start = i;
+        stats->query_end = rows;
+        stats->subject_start = j;
+        stats->subject_end = columns;
+    }
 
     release(score_matrix, rows, columns);
 }
 
 void SmithWaterman(char *query, char *subject,
                    char *aligned_query, char *aligned_subject,
+                   alignStats *stats,
                    float *score,
                    float match, float mismatch,
-                   float gap_open, float gap_extend)
+                   float gap_open, float gap_extend, char mask)
 { /*
    *Description:  Align query and subject by Smith-Waterman
    *Input:
@@ -286,13 +358,16 @@ void SmithWaterman(char *query, char *subject,
       @mismatch:  Score when two base are different
       @gap_open:  Score when gap appear
       @gap_extend:Score when gap extend
+      @mask:      Base never matched even to itself, such as hard masked 'N', '\0' for none
    *Output:
-      @aligned_query:     Sequence 1 after aligned
-      @aligned_subject:   Sequence 2 after aligned
+      @aligned_query:     Sequence 1 after aligned, skipped if NULL
+      @aligned_subject:   Sequence 2 after aligned, skipped if NULL
+      @stats:             Statistics and operations of alignment, skipped if NULL
       @score:             Max score of align
    *Return:   None
    */
     float match_score;
+    char buffer[1]; // back-tracking target when aligned strings are not required
     int i = 0, j = 0, index = 0;
     int max_i = 0, max_j = 0;
     *score = 0;
@@ -316,7 +391,7 @@ void SmithWaterman(char *query, char *subject,
                                               score_matrix[i][j - 1]->lScore + gap_extend,
                                               0);
 
-            match_score = query[i - 1] == subject[j - 1] ? match : mismatch;
+            match_score = query[i - 1] == subject[j - 1] && query[i - 1] != mask ? match : mismatch;
             score_matrix[i][j]->mScore = max2(0, score_matrix[i - 1][j - 1]->score + match_score);
 
             score_matrix[i][j]->score = max3(score_matrix[i][j]->uScore,
@@ -382,14 +457,1106 @@ void SmithWaterman(char *query, char *subject,
     j = max_j;
     while (score_matrix[i][j]->score != 0)
     {
-        backTracking(score_matrix[i][j], &i, &j, query[i - 1], subject[j - 1], aligned_query, aligned_subject, index);
+        if (stats != NULL)
+            recordOp(score_matrix[i][j], query[i - 1], subject[j - 1], mask, stats);
+        if (aligned_query != NULL)
+            backTracking(score_matrix[i][j], &i, &j, query[i - 1], subject[j - 1], aligned_query, aligned_subject, index);
+        else
+            backTracking(score_matrix[i][j], &i, &j, 0, 0, buffer, buffer, 0);
         index++;
     }
-    aligned_query[index] = '\0';
-    aligned_subject[index] = '\0';
-
-    reverseStr(aligned_query);
-    reverseStr(aligned_subject);
+    if (aligned_query != NULL)
+    {
+        aligned_query[index] = '\0';
+        aligned_subject[index] = '\0';
+        reverseStr(aligned_query);
+        reverseStr(aligned_subject);
+    }
+    if (stats != NULL)
+    {
+        stats->query_start = i;
+        stats->query_end = max_i;
+        stats->subject_start = j;
+        stats->subject_end = max_j;
+    }
 
     release(score_matrix, rows, columns);
-}
\ No newline at end of file
+}
+int SuffixArray(const unsigned char *text, int length, int *sa)
+{ /*
+   *Description:  Build the suffix array of text by prefix doubling with counting sort, O(n*log(n))
+   *Input:
+      @text:      Text to be indexed, the last char should be a unique smallest sentinel
+      @length:    Length of text
+   *Output:
+      @sa:        Start positions of all suffixes in lexicographical order
+   *Return:       0 if success, -1 if out of space
+   */
+    int i, k, p, classes;
+    int buckets = length > 256 ? length : 256;
+    int *rank = (int *)malloc(sizeof(int) * length);
+    int *new_rank = (int *)malloc(sizeof(int) * length);
+    int *second = (int *)malloc(sizeof(int) * length);
+    int *count = (int *)malloc(sizeof(int) * buckets);
+    int *temp;
+
+    if (rank == NULL || new_rank == NULL || second == NULL || count == NULL)
+    {
+        free(rank);
+        free(new_rank);
+        free(second);
+        free(count);
+        return -1;
+    }
+
+    // sort all suffixes by their first char
+    memset(count, 0, sizeof(int) * buckets);
+    for (i = 0; i < length; i++)
+        count[text[i]]++;
+    for (i = 1; i < 256; i++)
+        count[i] += count[i - 1];
+    for (i = length - 1; i >= 0; i--)
+        sa[--count[text[i]]] = i;
+
+    rank[sa[0]] = 0;
+    classes = 1;
+    for (i = 1; i < length; i++)
+    {
+        if (text[sa[i]] != text[sa[i - 1]])
+            classes++;
+        rank[sa[i]] = classes - 1;
+    }
+
+    for (k = 1; k < length && classes < length; k <<= 1)
+    {
+        // order by the second key, suffixes without second half come first
+        p = 0;
+        for (i = length - k; i < length; i++)
+            second[p++] = i;
+        for (i = 0; i < length; i++)
+            if (sa[i] >= k)
+                second[p++] = sa[i] - k;
+
+        // stable counting sort by the first key
+        memset(count, 0, sizeof(int) * classes);
+        for (i = 0; i < length; i++)
+            count[rank[i]]++;
+        for (i = 1; i < classes; i++)
+            count[i] += count[i - 1];
+        for (i = length - 1; i >= 0; i--)
+            sa[--count[rank[second[i]]]] = second[i];
+
+        new_rank[sa[0]] = 0;
+        classes = 1;
+        for (i = 1; i < length; i++)
+        {
+            if (rank[sa[i]] != rank[sa[i - 1]] ||
+                (sa[i] + k < length ? rank[sa[i] + k] : -1) !=
+                    (sa[i - 1] + k < length ? rank[sa[i - 1] + k] : -1))
+                classes++;
+            new_rank[sa[i]] = classes - 1;
+        }
+        temp = rank;
+        rank = new_rank;
+        new_rank = temp;
+    }
+
+    free(rank);
+    free(new_rank);
+    free(second);
+    free(count);
+    return 0;
+}
+
+int PackBases(const char *seq, int length, const char *alphabet, unsigned char *packed)
+{ /*
+   *Description:  Pack each base to 2 bits, 4 bases per byte from the high bits
+   *Input:
+      @seq:       Sequence to be packed
+      @length:    Length of sequence
+      @alphabet:  4 bases whose code are 0, 1, 2, 3
+   *Output:
+      @packed:    Packed bytes, (length + 3) / 4 bytes, the last byte is padded by 0
+   *Return:       0 if success, -1 if seq has a base not in alphabet
+   */
+    signed char code[256];
+    int i;
+
+    memset(code, -1, sizeof(code));
+    for (i = 0; i < 4; i++)
+        code[(unsigned char)alphabet[i]] = i;
+
+    memset(packed, 0, (length + 3) / 4);
+    for (i = 0; i < length; i++)
+    {
+        if (code[(unsigned char)seq[i]] < 0)
+            return -1;
+        packed[i >> 2] |= code[(unsigned char)seq[i]] << (6 - 2 * (i & 3));
+    }
+    return 0;
+}
+
+void UnpackBases(const unsigned char *packed, int length, const char *alphabet, char *seq)
+{ /*
+   *Description:  Unpack the bytes packed by PackBases
+   *Input:
+      @packed:    Packed bytes
+      @length:    Number of bases
+      @alphabet:  4 bases whose code are 0, 1, 2, 3
+   *Output:
+      @seq:       Unpacked sequence, not end with '\0'
+   */
+    for (int i = 0; i < length; i++)
+        seq[i] = alphabet[(packed[i >> 2] >> (6 - 2 * (i & 3))) & 3];
+}
+
+static double *fullMatrix(const double *dist, int n)
+{ /*
+   *Description:  Expand the condensed distance matrix to a n x n matrix
+   *Input:
+      @dist:      Distance of each pair (i, j), i < j, in the order of (0, 1), (0, 2) ... (n-2, n-1)
+      @n:         Number of items
+   *Return:
+      @matrix     The n x n matrix, NULL if out of memory
+   */
+    double *matrix = malloc(sizeof(double) * n * n);
+    if (matrix == NULL)
+        return NULL;
+    for (int i = 0, k = 0; i < n; i++)
+    {
+        matrix[i * n + i] = 0;
+        for (int j = i + 1; j < n; j++, k++)
+            matrix[i * n + j] = matrix[j * n + i] = dist[k];
+    }
+    return matrix;
+}
+
+static void nearest(const double *d, int n, const int *active, int i, int *nn, double *nnd)
+{ /*
+   *Description:  Find the nearest active item of i
+   */
+    nn[i] = -1;
+    nnd[i] = 0;
+    for (int j = 0; j < n; j++)
+        if (j != i && active[j] && (nn[i] < 0 || d[i * n + j] < nnd[i]))
+        {
+            nn[i] = j;
+            nnd[i] = d[i * n + j];
+        }
+}
+
+int UPGMA(const double *dist, int n, int *merges, double *lengths)
+{ /*
+   *Description:  Build the guide tree by UPGMA, the nearest neighbor of each cluster is cached
+   *Input:
+      @dist:      Condensed distance matrix
+      @n:         Number of leaves
+   *Output:
+      @merges:    Ids of the two clusters merged at each step, (n - 1) x 2,
+                  leaves are 0 ~ n-1, the cluster created at step k is n + k
+      @lengths:   Branch lengths of the two merged clusters, (n - 1) x 2
+   *Return:       0 if success, -1 if out of memory
+   */
+    double *d = fullMatrix(dist, n);
+    int *active = malloc(sizeof(int) * n), *size = malloc(sizeof(int) * n);
+    int *id = malloc(sizeof(int) * n), *nn = malloc(sizeof(int) * n);
+    double *height = malloc(sizeof(double) * n), *nnd = malloc(sizeof(double) * n);
+    int status = -1;
+
+    if (d == NULL || active == NULL || size == NULL || id == NULL || nn == NULL || height == NULL || nnd == NULL)
+        goto cleanup;
+
+    for (int i = 0; i < n; i++)
+    {
+        active[i] = size[i] = 1;
+        id[i] = i;
+        height[i] = 0;
+    }
+    for (int i = 0; i < n; i++)
+        nearest(d, n, active, i, nn, nnd);
+
+    for (int step = 0; step < n - 1; step++)
+    {
+        int a = -1, b;
+        for (int i = 0; i < n; i++)
+            if (active[i] && nn[i] >= 0 && (a < 0 || nnd[i] < nnd[a]))
+                a = i;
+        b = nn[a];
+
+        double h = d[a * n + b] / 2;
+        merges[2 * step] = id[a];
+        merges[2 * step + 1] = id[b];
+        lengths[2 * step] = h - height[a];
+        lengths[2 * step + 1] = h - height[b];
+
+        // cluster b is merged into a, distance to new cluster is the average of all leaves
+        for (int k = 0; k < n; k++)
+            if (active[k] && k != a && k != b)
+                d[a * n + k] = d[k * n + a] = (d[a * n + k] * size[a] + d[b * n + k] * size[b]) / (size[a] + size[b]);
+        active[b] = 0;
+        size[a] += size[b];
+        id[a] = n + step;
+        height[a] = h;
+
+        for (int k = 0; k < n; k++)
+        {
+            if (!active[k] || k == a)
+                continue;
+            if (nn[k] == a || nn[k] == b)
+                nearest(d, n, active, k, nn, nnd);
+            else if (d[k * n + a] < nnd[k])
+            {
+                nn[k] = a;
+                nnd[k] = d[k * n + a];
+            }
+        }
+        nearest(d, n, active, a, nn, nnd);
+    }
+    status = 0;
+
+cleanup:
+    free(d);
+    free(active);
+    free(size);
+    free(id);
+    free(nn);
+    free(height);
+    free(nnd);
+    return status;
+}
+
+int NeighborJoining(const double *dist, int n, int *merges, double *lengths)
+{ /*
+   *Description:  Build the guide tree by Neighbor-Joining, the last two clusters are joined as root
+   *Input:
+      @dist:      Condensed distance matrix
+      @n:         Number of leaves
+   *Output:
+      @merges:    Ids of the two clusters joined at each step, same as UPGMA
+      @lengths:   Branch lengths of the two joined clusters, negative lengths are set to 0
+   *Return:       0 if success, -1 if out of memory
+   */
+    double *d = fullMatrix(dist, n);
+    double *r = malloc(sizeof(double) * n);
+    int *active = malloc(sizeof(int) * n), *id = malloc(sizeof(int) * n);
+    int status = -1;
+
+    if (d == NULL || r == NULL || active == NULL || id == NULL)
+        goto cleanup;
+
+    for (int i = 0; i < n; i++)
+    {
+        active[i] = 1;
+        id[i] = i;
+        r[i] = 0;
+        for (int j = 0; j < n; j++)
+            r[i] += d[i * n + j];
+    }
+
+    for (int step = 0, m = n; step < n - 1; step++, m--)
+    {
+        int a = -1, b = -1;
+        double best = 0, la, lb;
+        if (m > 2)
+        {
+            for (int i = 0; i < n; i++)
+            {
+                if (!active[i])
+                    continue;
+                for (int j = i + 1; j < n; j++)
+                {
+                    if (!active[j])
+                        continue;
+                    double q = (m - 2) * d[i * n + j] - r[i] - r[j];
+                    if (a < 0 || q < best)
+                    {
+                        best = q;
+                        a = i;
+                        b = j;
+                    }
+                }
+            }
+            la = d[a * n + b] / 2 + (r[a] - r[b]) / (2 * (m - 2));
+        }
+        else
+        {
+            for (int i = 0; i < n; i++)
+                if (active[i])
+                {
+                    if (a < 0)
+                        a = i;
+                    else
+                        b = i;
+                }
+            la = d[a * n + b] / 2;
+        }
+        lb = d[a * n + b] - la;
+        merges[2 * step] = id[a];
+        merges[2 * step + 1] = id[b];
+        lengths[2 * step] = la > 0 ? la : 0;
+        lengths[2 * step + 1] = lb > 0 ? lb : 0;
+
+        // cluster b is joined into a
+        active[b] = 0;
+        id[a] = n + step;
+        r[a] = 0;
+        for (int k = 0; k < n; k++)
+        {
+            if (!active[k] || k == a)
+                continue;
+            double dk = (d[a * n + k] + d[b * n + k] - d[a * n + b]) / 2;
+            r[k] += dk - d[a * n + k] - d[b * n + k];
+            d[a * n + k] = d[k * n + a] = dk;
+            r[a] += dk;
+        }
+    }
+    status = 0;
+
+cleanup:
+    free(d);
+    free(r);
+    free(active);
+    free(id);
+    return status;
+}
+
+#define NEG_INF -1e30f
+
+int ProfileAlign(const char *rows_a, int depth_a, int width_a,
+                 const char *rows_b, int depth_b, int width_b,
+                 float match, float mismatch, float gap_open, float gap_extend,
+                 char *ops, char mask)
+{ /*
+   *Description:  Align two groups of aligned sequences by their profiles, with affine gap (Gotoh).
+                  Score of two columns is the average score of all residue pairs, gap is scored as 0
+   *Input:
+      @rows_a:    Aligned sequences of group A, depth_a rows x width_a columns, '-' is gap
+      @rows_b:    Aligned sequences of group B
+      @match:     Score when two base are same
+      @mismatch:  Score when two base are different
+      @gap_open:  Score when gap appear
+      @gap_extend:Score when gap extend
+      @mask:      Base never matched even to itself, such as hard masked 'N', '\0' for none
+   *Output:
+      @ops:       Operation of each column: 'M' both columns, 'A' column of A only, 'B' column of B only,
+                  should have width_a + width_b bytes
+   *Return:
+      @length     Number of columns, -1 if out of memory
+   */
+    int symbol[256], sigma = 0;
+    int i, j, k, length = -1;
+    size_t cells = (size_t)(width_a + 1) * (width_b + 1);
+
+    memset(symbol, -1, sizeof(symbol));
+    for (k = 0; k < depth_a * width_a; k++)
+        if (rows_a[k] != '-' && symbol[(unsigned char)rows_a[k]] < 0)
+            symbol[(unsigned char)rows_a[k]] = sigma++;
+    for (k = 0; k < depth_b * width_b; k++)
+        if (rows_b[k] != '-' && symbol[(unsigned char)rows_b[k]] < 0)
+            symbol[(unsigned char)rows_b[k]] = sigma++;
+
+    // dense profile of B, sparse profile of A: (symbol, frequency) of each column from a_start[i]
+    float *profile_b = calloc((size_t)width_b * (sigma + 1), sizeof(float));
+    float *residue_b = calloc(width_b + 1, sizeof(float));
+    float *residue_a = calloc(width_a + 1, sizeof(float));
+    float *counts = calloc(sigma + 1, sizeof(float));
+    int *a_start = malloc(sizeof(int) * (width_a + 1));
+    int *a_symbol = malloc(sizeof(int) * ((size_t)width_a * (sigma < depth_a ? sigma : depth_a) + 1));
+    float *a_freq = malloc(sizeof(float) * ((size_t)width_a * (sigma < depth_a ? sigma : depth_a) + 1));
+    float *M = malloc(sizeof(float) * 3 * (width_b + 1) * 2);
+    unsigned char *trace = malloc(cells);
+
+    if (profile_b == NULL || residue_b == NULL || residue_a == NULL || counts == NULL || a_start == NULL ||
+        a_symbol == NULL || a_freq == NULL || M == NULL || trace == NULL)
+        goto cleanup;
+
+    for (i = 0; i < depth_b; i++)
+        for (j = 0; j < width_b; j++)
+        {
+            char c = rows_b[(size_t)i * width_b + j];
+            if (c != '-')
+            {
+                // masked residues count in residue_b only, so they are scored as mismatches
+                if (c != mask)
+                    profile_b[(size_t)j * sigma + symbol[(unsigned char)c]] += 1.0f / depth_b;
+                residue_b[j] += 1.0f / depth_b;
+            }
+        }
+    for (j = 0, k = 0; j < width_a; j++)
+    {
+        a_start[j] = k;
+        memset(counts, 0, sizeof(float) * (sigma + 1));
+        for (i = 0; i < depth_a; i++)
+        {
+            char c = rows_a[(size_t)i * width_a + j];
+            if (c != '-')
+                counts[symbol[(unsigned char)c]] += 1.0f / depth_a;
+        }
+        for (int s = 0; s < sigma; s++)
+            if (counts[s] > 0)
+            {
+                a_symbol[k] = s;
+                a_freq[k++] = counts[s];
+                residue_a[j] += counts[s];
+            }
+    }
+    a_start[width_a] = k;
+
+    /* Rolling rows of three states: match (both columns), x (column of A only), y (column of B only).
+       trace bits: 0-1 previous state of match, 2-3 previous state of x, 4-5 previous state of y */
+    float *prev = M, *curr = M + 3 * (width_b + 1);
+    prev[0] = 0;
+    prev[1] = prev[2] = NEG_INF;
+    for (j = 1; j <= width_b; j++)
+    {
+        prev[3 * j] = prev[3 * j + 1] = NEG_INF;
+        prev[3 * j + 2] = gap_open + gap_extend * (j - 1);
+        trace[j] = 2 << 4;
+    }
+    trace[0] = 0;
+    for (i = 1; i <= width_a; i++)
+    {
+        curr[0] = curr[2] = NEG_INF;
+        curr[1] = gap_open + gap_extend * (i - 1);
+        trace[(size_t)i * (width_b + 1)] = 1 << 2;
+        for (j = 1; j <= width_b; j++)
+        {
+            float *diag = prev + 3 * (j - 1), *up = prev + 3 * j, *left = curr + 3 * (j - 1), *cell = curr + 3 * j;
+            unsigned char t = 0;
+
+            // average score of residue pairs in column i of A and column j of B
+            float same = 0;
+            const float *column_b = profile_b + (size_t)(j - 1) * sigma;
+            for (k = a_start[i - 1]; k < a_start[i]; k++)
+                same += a_freq[k] * column_b[a_symbol[k]];
+            float score = match * same + mismatch * (residue_a[i - 1] * residue_b[j - 1] - same);
+
+            float best = diag[0];
+            if (diag[1] > best) { best = diag[1]; t = 1; }
+            if (diag[2] > best) { best = diag[2]; t = 2; }
+            cell[0] = best + score;
+
+            best = up[0] + gap_open;
+            if (up[1] + gap_extend > best) { best = up[1] + gap_extend; t |= 1 << 2; }
+            if (up[2] + gap_open > best) { best = up[2] + gap_open; t = (t & ~(3 << 2)) | 2 << 2; }
+            cell[1] = best;
+
+            best = left[0] + gap_open;
+            if (left[2] + gap_extend > best) { best = left[2] + gap_extend; t |= 2 << 4; }
+            if (left[1] + gap_open > best) { best = left[1] + gap_open; t = (t & ~(3 << 4)) | 1 << 4; }
+            cell[2] = best;
+
+            trace[(size_t)i * (width_b + 1) + j] = t;
+        }
+        float *temp = prev;
+        prev = curr;
+        curr = temp;
+    }
+
+    // back-tracking from the best state of the last cell
+    int state = 0;
+    if (prev[3 * width_b + 1] > prev[3 * width_b + state]) state = 1;
+    if (prev[3 * width_b + 2] > prev[3 * width_b + state]) state = 2;
+    i = width_a;
+    j = width_b;
+    length = 0;
+    while (i > 0 || j > 0)
+    {
+        unsigned char t = trace[(size_t)i * (width_b + 1) + j];
+        if (i == 0)
+            state = 2;
+        else if (j == 0)
+            state = 1;
+        if (state == 0)
+        {
+            ops[length++] = 'M';
+            state = t & 3;
+            i--;
+            j--;
+        }
+        else if (state == 1)
+        {
+            ops[length++] = 'A';
+            state = (t >> 2) & 3;
+            i--;
+        }
+        else
+        {
+            ops[length++] = 'B';
+            state = (t >> 4) & 3;
+            j--;
+        }
+    }
+    for (k = 0; k < length / 2; k++)
+    {
+        char temp = ops[k];
+        ops[k] = ops[length - 1 - k];
+        ops[length - 1 - k] = temp;
+    }
+
+cleanup:
+    free(profile_b);
+    free(residue_b);
+    free(residue_a);
+    free(counts);
+    free(a_start);
+    free(a_symbol);
+    free(a_freq);
+    free(M);
+    free(trace);
+    return length;
+}
+
+static uint64_t mixHash(uint64_t h)
+{ /*
+   *Description:  Finalizer of MurmurHash3, spread the k-mer code to 64 bits
+   */
+    h ^= h >> 33;
+    h *= 0xff51afd7ed558ccdULL;
+    h ^= h >> 33;
+    h *= 0xc4ceb9fe1a85ec53ULL;
+    h ^= h >> 33;
+    return h;
+}
+
+static int insertHash(uint64_t *sketch, int count, int size, uint64_t h)
+{ /*
+   *Description:  Insert a hash to the ascending bottom sketch, drop the largest one if full
+   *Return:       Number of hashes in sketch after insertion
+   */
+    int low = 0, high = count;
+
+    if (count == size && h >= sketch[size - 1])
+        return count;
+    while (low < high)
+    {
+        int mid = (low + high) / 2;
+        if (sketch[mid] < h)
+            low = mid + 1;
+        else
+            high = mid;
+    }
+    if (low < count && sketch[low] == h)
+        return count;
+    if (count == size)
+        count--;
+    memmove(sketch + low + 1, sketch + low, sizeof(uint64_t) * (count - low));
+    sketch[low] = h;
+    return count + 1;
+}
+
+int MinHash(const char *seq, int length, int k, int size, int mode, uint64_t *sketch)
+{ /*
+   *Description:  Bottom-k MinHash sketch of all k-mers by a rolling hash
+   *Input:
+      @seq:       Sequence to be sketched
+      @length:    Length of sequence
+      @k:         Length of k-mer, no more than 32 for nucleotide modes
+      @size:      Max number of hashes kept
+      @mode:      0: any characters, k-mer is rolled by a polynomial hash\n
+                  1: nucleotides, k-mer is rolled by 2-bit codes, k-mers with other characters are skipped\n
+                  2: same as 1 but use the smaller code of k-mer and its reverse complement
+   *Output:
+      @sketch:    The smallest distinct hashes in ascending order
+   *Return:       Number of hashes in sketch
+   */
+    int count = 0;
+
+    if (k <= 0 || size <= 0 || length < k)
+        return 0;
+    if (mode == 0)
+    {
+        const uint64_t base = 0x100000001b3ULL;
+        uint64_t h = 0, top = 1;
+        int i;
+
+        for (i = 0; i < k; i++)
+            top *= base;
+        for (i = 0; i < length; i++)
+        {
+            h = h * base + (unsigned char)seq[i];
+            if (i >= k)
+                h -= top * (unsigned char)seq[i - k];
+            if (i >= k - 1)
+                count = insertHash(sketch, count, size, mixHash(h));
+        }
+    }
+    else
+    {
+        signed char code[256];
+        uint64_t forward = 0, reverse = 0;
+        uint64_t mask = k == 32 ? ~0ULL : (1ULL << (2 * k)) - 1;
+        int shift = 2 * (k - 1), valid = 0;
+
+        memset(code, -1, sizeof(code));
+        code['A'] = code['a'] = 0;
+        code['C'] = code['c'] = 1;
+        code['G'] = code['g'] = 2;
+        code['T'] = code['t'] = code['U'] = code['u'] = 3;
+        for (int i = 0; i < length; i++)
+        {
+            int c = code[(unsigned char)seq[i]];
+            if (c < 0)
+            {
+                valid = 0;
+                continue;
+            }
+            forward = ((forward << 2) | (uint64_t)c) & mask;
+            reverse = (reverse >> 2) | ((uint64_t)(3 - c) << shift);
+            if (++valid >= k)
+                count = insertHash(sketch, count, size,
+                                   mixHash(mode == 2 && reverse < forward ? reverse : forward));
+        }
+    }
+    return count;
+}
+
+double SketchCompare(const uint64_t *a, int count_a, const uint64_t *b, int count_b, int size, int containment)
+{ /*
+   *Description:  Estimate the similarity of two sets by their bottom sketches
+   *Input:
+      @a, b:      Ascending hashes of two sketches
+      @size:      Max number of hashes of the sketches
+      @containment: 0: Jaccard index, shared hashes in the bottom size hashes of the union\n
+                  1: containment of a in b, fraction of hashes in a found in b,
+                     only hashes of a no more than the largest one of b are counted if b is full
+   *Return:       Estimated similarity in [0, 1]
+   */
+    int i = 0, j = 0, shared = 0, total = 0;
+
+    if (containment)
+    {
+        uint64_t bound = count_b == size && count_b > 0 ? b[count_b - 1] : ~0ULL;
+        for (; i < count_a && a[i] <= bound; i++, total++)
+        {
+            while (j < count_b && b[j] < a[i])
+                j++;
+            if (j < count_b && b[j] == a[i])
+                shared++;
+        }
+        return total ? (double)shared / total : 0.;
+    }
+    while (total < size && (i < count_a || j < count_b))
+    {
+        if (j >= count_b || (i < count_a && a[i] < b[j]))
+            i++;
+        else if (i >= count_a || b[j] < a[i])
+            j++;
+        else
+        {
+            shared++;
+            i++;
+            j++;
+        }
+        total++;
+    }
+    return total ? (double)shared / total : 0.;
+}
+
+static void kmerCodes(const char *alphabet, int sigma, signed char *code)
+{ /*
+   *Description:  Code of each character in alphabet, -1 for others
+   */
+    memset(code, -1, 256);
+    for (int i = 0; i < sigma; i++)
+        code[(unsigned char)alphabet[i]] = i;
+}
+
+int KmerIndex(const unsigned char *text, uint32_t length, int k, const char *alphabet, int sigma,
+              uint32_t *offsets, uint32_t *positions)
+{ /*
+   *Description:  Index start positions of all k-mers by counting sort, k-mers with characters
+                  not in alphabet are skipped
+   *Input:
+      @text:      Text to be indexed, such as records joined by a separator
+      @length:    Length of text
+      @k:         Length of k-mer, sigma^k should fit in uint32_t
+      @alphabet:  Characters whose code are 0 ~ sigma-1
+   *Output:
+      @offsets:   sigma^k + 1 boundaries, positions of k-mer code c are positions[offsets[c]: offsets[c + 1]]
+      @positions: Start positions sorted by k-mer code then position, capacity is length
+   *Return:       Number of positions, -1 if out of memory
+   */
+    signed char code[256];
+    uint32_t table = 1, total;
+    uint32_t *cursor = NULL;
+
+    for (int i = 0; i < k; i++)
+        table *= sigma;
+    kmerCodes(alphabet, sigma, code);
+    memset(offsets, 0, sizeof(uint32_t) * ((size_t)table + 1));
+    for (int pass = 0; pass < 2; pass++)
+    {
+        uint32_t kmer = 0;
+        int valid = 0;
+        for (uint32_t i = 0; i < length; i++)
+        {
+            int c = code[text[i]];
+            if (c < 0)
+            {
+                valid = 0;
+                continue;
+            }
+            kmer = (uint32_t)(((uint64_t)kmer * sigma + c) % table);
+            if (++valid < k)
+                continue;
+            if (pass == 0)
+                offsets[kmer + 1]++;
+            else
+                positions[cursor[kmer]++] = i + 1 - k;
+        }
+        if (pass == 0)
+        {
+            for (uint32_t c = 0; c < table; c++)
+                offsets[c + 1] += offsets[c];
+            cursor = malloc(sizeof(uint32_t) * table);
+            if (cursor == NULL)
+                return -1;
+            memcpy(cursor, offsets, sizeof(uint32_t) * table);
+        }
+    }
+    free(cursor);
+    total = offsets[table];
+    return (int)total;
+}
+
+typedef struct {
+    int64_t diagonal;   /* text position - query position */
+    int query;          /* start of seed in query */
+} seedHit;
+
+static int compareHits(const void *a, const void *b)
+{
+    const seedHit *x = a, *y = b;
+    if (x->diagonal != y->diagonal)
+        return x->diagonal < y->diagonal ? -1 : 1;
+    return (x->query > y->query) - (x->query < y->query);
+}
+
+int SeedExtend(const char *query, int query_length, const unsigned char *text, uint32_t text_length,
+               const uint32_t *offsets, const uint32_t *positions, int k, const char *alphabet, int sigma,
+               float match, float mismatch, float xdrop, float min_score, int max_occurrences,
+               double **hsps)
+{ /*
+   *Description:  Find seeds of query in the k-mer index, extend each seed on its diagonal without gaps
+                  until the score drops xdrop below the best. Seeds inside an extended segment are skipped.
+                  Extension stops at the separator '\0' between records, characters not in alphabet
+                  such as hard masked 'N' are mismatches even to themselves
+   *Input:
+      @query:     Query sequence
+      @text, offsets, positions: Text and its index built by KmerIndex
+      @min_score: Min score of reported segments
+      @max_occurrences: K-mers appearing more times than this in text are not used as seed
+   *Output:
+      @hsps:      Allocated array of (score, query start, query end, text start, text end) of each segment,
+                  sorted by diagonal, should be freed by caller
+   *Return:       Number of segments, -1 if out of memory
+   */
+    signed char code[256];
+    uint32_t table = 1, kmer = 0;
+    size_t count = 0, capacity = 1024, found = 0, found_capacity = 64;
+    seedHit *hits;
+    int valid = 0;
+
+    *hsps = NULL;
+    for (int i = 0; i < k; i++)
+        table *= sigma;
+    kmerCodes(alphabet, sigma, code);
+    hits = malloc(sizeof(seedHit) * capacity);
+    if (hits == NULL)
+        return -1;
+    for (int i = 0; i < query_length; i++)
+    {
+        int c = code[(unsigned char)query[i]];
+        if (c < 0)
+        {
+            valid = 0;
+            continue;
+        }
+        kmer = (uint32_t)(((uint64_t)kmer * sigma + c) % table);
+        if (++valid < k || offsets[kmer + 1] - offsets[kmer] > (uint32_t)max_occurrences)
+            continue;
+        for (uint32_t j = offsets[kmer]; j < offsets[kmer + 1]; j++)
+        {
+            if (count == capacity)
+            {
+                seedHit *larger = realloc(hits, sizeof(seedHit) * capacity * 2);
+                if (larger == NULL)
+                {
+                    free(hits);
+                    return -1;
+                }
+                hits = larger;
+                capacity *= 2;
+            }
+            hits[count].diagonal = (int64_t)positions[j] - (i + 1 - k);
+            hits[count].query = i + 1 - k;
+            count++;
+        }
+    }
+    qsort(hits, count, sizeof(seedHit), compareHits);
+
+    *hsps = malloc(sizeof(double) * 5 * found_capacity);
+    if (*hsps == NULL)
+    {
+        free(hits);
+        return -1;
+    }
+    int64_t diagonal = INT64_MIN;
+    int covered = 0;
+    for (size_t h = 0; h < count; h++)
+    {
+        int q_start = hits[h].query, q_end = q_start + k;
+        int64_t t_start = hits[h].diagonal + q_start, t_end = t_start + k;
+        float score = k * match, best, running;
+
+        if (hits[h].diagonal != diagonal)
+        {
+            diagonal = hits[h].diagonal;
+            covered = 0;
+        }
+        if (q_start < covered)
+            continue;
+        /* extend to right */
+        best = running = score;
+        for (int i = q_end; i < query_length && t_start + (i - q_start) < text_length; i++)
+        {
+            unsigned char base = text[t_start + (i - q_start)];
+            if (base == '\0')
+                break;
+            running += (unsigned char)query[i] == base && code[base] >= 0 ? match : mismatch;
+            if (running > best)
+            {
+                best = running;
+                q_end = i + 1;
+            }
+            else if (best - running > xdrop)
+                break;
+        }
+        /* extend to left */
+        score = running = best;
+        for (int i = q_start - 1; i >= 0 && t_start - (q_start - i) >= 0; i--)
+        {
+            unsigned char base = text[t_start - (q_start - i)];
+            if (base == '\0')
+                break;
+            running += (unsigned char)query[i] == base && code[base] >= 0 ? match : mismatch;
+            if (running > score)
+            {
+                score = running;
+                q_start = i;
+            }
+            else if (score - running > xdrop)
+                break;
+        }
+        covered = q_end;
+        if (score < min_score)
+            continue;
+        if (found == found_capacity)
+        {
+            double *larger = realloc(*hsps, sizeof(double) * 5 * found_capacity * 2);
+            if (larger == NULL)
+            {
+                free(hits);
+                free(*hsps);
+                *hsps = NULL;
+                return -1;
+            }
+            *hsps = larger;
+            found_capacity *= 2;
+        }
+        t_end = hits[h].diagonal + q_end;
+        t_start = hits[h].diagonal + q_start;
+        (*hsps)[5 * found] = score;
+        (*hsps)[5 * found + 1] = q_start;
+        (*hsps)[5 * found + 2] = q_end;
+        (*hsps)[5 * found + 3] = (double)t_start;
+        (*hsps)[5 * found + 4] = (double)t_end;
+        found++;
+    }
+    free(hits);
+    return (int)found;
+}
+
+static void maskRegion(int start, int end, int *intervals, int *found)
+{ /*
+   *Description:  Append [start, end) to sorted intervals, merged with the last one if overlapped or adjacent
+   */
+    if (*found && start <= intervals[2 * *found - 1])
+    {
+        if (end > intervals[2 * *found - 1])
+            intervals[2 * *found - 1] = end;
+        return;
+    }
+    intervals[2 * *found] = start;
+    intervals[2 * *found + 1] = end;
+    (*found)++;
+}
+
+static double dustTrim(const signed char *triplets, int *first, int *last)
+{ /*
+   *Description:  Narrow the triplets [first, last] of a window to its best scoring suffix, then to the best
+                  scoring prefix of that suffix, so the flanks of a low complexity region are not masked
+   *Return:       Score of the narrowed triplets
+   */
+    double best = -1;
+    for (int direction = 0; direction < 2; direction++)
+    {
+        int counts[64] = {0}, l = 0, step = direction ? 1 : -1;
+        int from = direction ? *first : *last, to = direction ? *last : *first, best_end = from;
+        long score = 0;
+        best = -1;
+        for (int p = from; p != to + step; p += step)
+        {
+            int t = triplets[p];
+            if (t < 0)
+                continue;
+            score += counts[t]++;
+            if (++l >= 2 && (double)score / (l - 1) > best)
+            {
+                best = (double)score / (l - 1);
+                best_end = p;
+            }
+        }
+        if (direction)
+            *last = best_end;
+        else
+            *first = best_end;
+    }
+    return best;
+}
+
+int Dust(const char *seq, int length, int window, double threshold, int *intervals)
+{ /*
+   *Description:  Find low complexity regions of nucleotides by DUST. Windows start every window / 2 bases,
+                  the best scoring part of each window is found in O(window) and masked if scoring above threshold,
+                  so the time is O(n). The score of l triplets is sum(c * (c - 1) / 2) / (l - 1) over the count c
+                  of each triplet. Triplets with bases other than ACGTU are not counted
+   *Input:
+      @seq:       Sequence, case insensitive
+      @window:    Length of window, at least 4
+      @threshold: Regions scoring above it are masked, 20 for DUST
+   *Output:
+      @intervals: Start and end (exclusive) of each masked region, at least length + 1 integers
+   *Return:       Number of regions, -1 if out of memory
+   */
+    signed char code[256];
+    signed char *triplets = malloc(length ? length : 1); /* triplet ending at each position, -1 if invalid */
+    int triplet = 0, valid = 0, found = 0, step = window / 2;
+
+    if (triplets == NULL)
+        return -1;
+    kmerCodes("ACGT", 4, code);
+    code['U'] = 3;
+    for (int c = 0; c < 4; c++)
+        code[(unsigned char)"acgt"[c]] = c;
+    code['u'] = 3;
+    for (int i = 0; i < length; i++)
+    {
+        int c = code[(unsigned char)seq[i]];
+        if (c < 0)
+            valid = 0;
+        else
+            triplet = ((triplet << 2) | c) & 63;
+        triplets[i] = c >= 0 && ++valid >= 3 ? triplet : -1;
+    }
+
+    for (int start = 0; start < length; start += step)
+    {
+        int end = start + window < length ? start + window : length;
+        int first = start + 2, last = end - 1;
+        if (last > first && dustTrim(triplets, &first, &last) > threshold)
+            maskRegion(first - 2, last + 1, intervals, &found);
+        if (end == length)
+            break;
+    }
+    free(triplets);
+    return found;
+}
+
+int Seg(const char *seq, int length, int window, double locut, double hicut, int *intervals)
+{ /*
+   *Description:  Find low complexity regions of residues by SEG in one pass. Shannon entropy (bits) of each window
+                  is updated in O(1) as window slides. Windows with entropy no more than locut trigger a region,
+                  which is extended to the adjacent windows with entropy no more than hicut.
+                  The optimization of region boundaries by probability in original SEG is skipped
+   *Input:
+      @seq:       Sequence, case insensitive
+      @window:    Length of window
+      @locut:     Trigger complexity, 2.2 for SEG
+      @hicut:     Extension complexity, 2.5 for SEG
+   *Output:
+      @intervals: Start and end (exclusive) of each masked region, at least length + 1 integers
+   *Return:       Number of regions, -1 if out of memory
+   */
+    int counts[256] = {0};
+    double *nlogn = malloc(sizeof(double) * (window + 1)); /* c * log2(c) */
+    double sum = 0, bits = log2(window);
+    int found = 0, run_start = -1, triggered = 0;
+
+    if (nlogn == NULL)
+        return -1;
+    nlogn[0] = 0;
+    for (int c = 1; c <= window; c++)
+        nlogn[c] = c * log2(c);
+
+    for (int i = 0; i < length; i++)
+    {
+        unsigned char c = toupper((unsigned char)seq[i]);
+        sum += nlogn[counts[c] + 1] - nlogn[counts[c]];
+        counts[c]++;
+        if (i >= window)
+        {
+            c = toupper((unsigned char)seq[i - window]);
+            sum += nlogn[counts[c] - 1] - nlogn[counts[c]];
+            counts[c]--;
+        }
+        if (i < window - 1)
+            continue;
+
+        double entropy = bits - sum / window;
+        if (entropy <= hicut + 1e-9)
+        {
+            if (run_start < 0)
+            {
+                run_start = i - window + 1;
+                triggered = 0;
+            }
+            triggered |= entropy <= locut + 1e-9;
+        }
+        else if (run_start >= 0)
+        {
+            /* the run ends at the previous window */
+            if (triggered)
+                maskRegion(run_start, i, intervals, &found);
+            run_start = -1;
+        }
+    }
+    if (run_start >= 0 && triggered)
+        maskRegion(run_start, length, intervals, &found);
+    free(nlogn);
+    return found;
+}
+
+void CodonCount(const char *seq, int length, int64_t *counts)
+{ /*
+   *Description:  Count in-frame codons from the first base, codon code is 16 * b1 + 4 * b2 + b3
+                  with A, C, G, T/U as 0 ~ 3, codons with other bases are skipped
+   *Input:
+      @seq:       DNA or RNA sequence, case insensitive
+   *Output:
+      @counts:    64 counts increased by the codons of seq
+   */
+    signed char code[256];
+    kmerCodes("ACGT", 4, code);
+    code['U'] = 3;
+    for (int c = 0; c < 4; c++)
+        code[(unsigned char)"acgt"[c]] = c;
+    code['u'] = 3;
+    for (int i = 0; i + 2 < length; i += 3)
+    {
+        int a = code[(unsigned char)seq[i]], b = code[(unsigned char)seq[i + 1]], c = code[(unsigned char)seq[i + 2]];
+        if ((a | b | c) >= 0)
+            counts[(a << 4) | (b << 2) | c]++;
+    }
+}
@@ -1,4 +1,6 @@
 
+#include <stdint.h>
+
 /* Unit in Score Matrix */
 typedef struct {
     int up;         /* whether go up node when back-tracking */
@@ -10,21 +12,61 @@ typedef struct {
     float mScore;   /* score if route from up-left node */
 }matrixNode, *mNode;
 
+/* Statistics of an alignment, recorded during back-tracking */
+typedef struct {
+    int query_start;    /* 0-based start of aligned region in query */
+    int query_end;      /* end (exclusive) of aligned region in query */
+    int subject_start;
+    int subject_end;
+    int matches;
+    int mismatches;
+    int insertions;     /* columns with query base and subject gap */
+    int deletions;      /* columns with query gap and subject base */
+    int gap_opens;      /* number of gap runs */
+    int length;         /* number of columns */
+    char* ops;          /* operation of each column in reverse order: '=', 'X', 'I', 'D' */
+}alignStats;
+
 mNode** initMatrix(int row_length, int column_length);
 float max3(float a, float b, float c);
 void backTracking(mNode node, int* current_i, int* current_j, char query_base, char subject_base, char* align_query, char* align_subject, int index);
 void reverseStr(char* str);
+void recordOp(mNode node, char query_base, char subject_base, char mask, alignStats* stats);
+int formatCigar(const alignStats* stats, char* cigar);
 void release(mNode** matrix, int rows, int columns);
 
 void NeedlemanWunsch(char* query, char* subject, 
                      char* aligned_query, char* aligned_subject,
+                     alignStats* stats,
                      float* score,  
                      float match, float mismatch, 
-                     float gap_open, float gap_extend);
+                     float gap_open, float gap_extend, char mask);
 
 void SmithWaterman(char* query, char* subject, 
                    char* aligned_query, char* aligned_subject, 
+                   alignStats* stats,
                    float* score,  
                    float match, float mismatch, 
-                   float gap_open, float gap_extend);
+                   float gap_open, float gap_extend, char mask);
+
 
+int SuffixArray(const unsigned char* text, int length, int* sa);
+int PackBases(const char* seq, int length, const char* alphabet, unsigned char* packed);
+void UnpackBases(const unsigned char* packed, int length, const char* alphabet, char* seq);
+int UPGMA(const double* dist, int n, int* merges, double* lengths);
+int NeighborJoining(const double* dist, int n, int* merges, double* lengths);
+int ProfileAlign(const char* rows_a, int depth_a, int width_a,
+                 const char* rows_b, int depth_b, int width_b,
+                 float match, float mismatch, float gap_open, float gap_extend,
+                 char* ops, char mask);
+int MinHash(const char* seq, int length, int k, int size, int mode, uint64_t* sketch);
+double SketchCompare(const uint64_t* a, int count_a, const uint64_t* b, int count_b, int size, int containment);
+int KmerIndex(const unsigned char* text, uint32_t length, int k, const char* alphabet, int sigma,
+              uint32_t* offsets, uint32_t* positions);
+int SeedExtend(const char* query, int query_length, const unsigned char* text, uint32_t text_length,
+               const uint32_t* offsets, const uint32_t* positions, int k, const char* alphabet, int sigma,
+               float match, float mismatch, float xdrop, float min_score, int max_occurrences,
+               double** hsps);
+int Dust(const char* seq, int length, int window, double threshold, int* intervals);
+int Seg(const char* seq, int length, int window, double locut, double hicut, int* intervals);
+void CodonCount(const char* seq, int length, int64_t* counts);
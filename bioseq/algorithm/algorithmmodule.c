@@ -11,17 +11,21 @@ algorithm_NeedlemanWunsch(PyObject *self, PyObject *args)
     float mismatch;
     float gap_open;
     float gap_extend;
+    int mask = 0;
 
-    if (!PyArg_ParseTuple(args, "ssffff", &query, &subject, &match, &mismatch, &gap_open, &gap_extend))
+    if (!PyArg_ParseTuple(args, "ssffff|C", &query, &subject, &match, &mismatch, &gap_open, &gap_extend, &mask))
         Py_RETURN_NONE;
 
-    int size = strlen(query) + strlen(subject);
+    int size = strlen(query) + strlen(subject) + 1;
     char *align_query = malloc(size);
     char *align_subject = malloc(size);
     float score;
-    NeedlemanWunsch(query, subject, align_query, align_subject, &score, match, mismatch, gap_open, gap_extend);
+    Py_BEGIN_ALLOW_THREADS
+    NeedlemanWunsch(query, subject, align_query, align_subject, NULL, &score, match, mismatch, gap_open, gap_extend,
+                    (char)mask);
+    Py_END_ALLOW_THREADS
 
-    PyObject *result = PyTuple_Pack(3, PyUnicode_FromString(align_query), PyUnicode_FromString(align_subject), PyFloat_FromDouble(score));
+    PyObject *result = Py_BuildValue("(ssf)", align_query, align_subject, score);
 
     free(align_query);
     free(align_subject);
@@ -37,26 +41,553 @@ algorithm_SmithWaterman(PyObject *self, PyObject *args)
     float mismatch;
     float gap_open;
     float gap_extend;
+    int mask = 0;
 
-    if (!PyArg_ParseTuple(args, "ssffff", &query, &subject, &match, &mismatch, &gap_open, &gap_extend))
+    if (!PyArg_ParseTuple(args, "ssffff|C", &query, &subject, &match, &mismatch, &gap_open, &gap_extend, &mask))
         Py_RETURN_NONE;
 
-    int size = strlen(query) + strlen(subject);
+    int size = strlen(query) + strlen(subject) + 1;
     char *align_query = malloc(size);
     char *align_subject = malloc(size);
     float score;
-    SmithWaterman(query, subject, align_query, align_subject, &score, match, mismatch, gap_open, gap_extend);
+    Py_BEGIN_ALLOW_THREADS
+    SmithWaterman(query, subject, align_query, align_subject, NULL, &score, match, mismatch, gap_open, gap_extend,
+                  (char)mask);
+    Py_END_ALLOW_THREADS
 
-    PyObject *result = PyTuple_Pack(3, PyUnicode_FromString(align_query), PyUnicode_FromString(align_subject), PyFloat_FromDouble(score));
+    PyObject *result = Py_BuildValue("(ssf)", align_query, align_subject, score);
 
     free(align_query);
     free(align_subject);
     return result;
 }
 
+static PyObject *
+algorithm_AlignStats(PyObject *self, PyObject *args)
+{
+    char *query;
+    char *subject;
+    float match;
+    float mismatch;
+    float gap_open;
+    float gap_extend;
+    int local;
+    int mask = 0;
+
+    if (!PyArg_ParseTuple(args, "ssffffp|C", &query, &subject, &match, &mismatch, &gap_open, &gap_extend, &local,
+                          &mask))
+        return NULL;
+
+    size_t size = strlen(query) + strlen(subject) + 1;
+    alignStats stats = {0};
+    stats.ops = malloc(size);
+    char *cigar = malloc(12 * size);
+    if (stats.ops == NULL || cigar == NULL)
+    {
+        free(stats.ops);
+        free(cigar);
+        return PyErr_NoMemory();
+    }
+
+    float score;
+    int cigar_length;
+    Py_BEGIN_ALLOW_THREADS
+    if (local)
+        SmithWaterman(query, subject, NULL, NULL, &stats, &score, match, mismatch, gap_open, gap_extend, (char)mask);
+    else
+        NeedlemanWunsch(query, subject, NULL, NULL, &stats, &score, match, mismatch, gap_open, gap_extend, (char)mask);
+    cigar_length = formatCigar(&stats, cigar);
+    Py_END_ALLOW_THREADS
+
+    PyObject *result = Py_BuildValue("(fiiiis#iiiii)", score,
+                                     stats.query_start, stats.query_end,
+                                     stats.subject_start, stats.subject_end,
+                                     cigar, (Py_ssize_t)cigar_length,
+                                     stats.matches, stats.mismatches,
+                                     stats.insertions, stats.deletions, stats.gap_opens);
+    free(stats.ops);
+    free(cigar);
+    return result;
+}
+
+static PyObject *
+guideTree(PyObject *args, int (*build)(const double *, int, int *, double *))
+{
+    Py_buffer dist;
+    int n;
+
+    if (!PyArg_ParseTuple(args, "y*i", &dist, &n))
+        return NULL;
+    if (n < 1 || dist.len != (Py_ssize_t)sizeof(double) * n * (n - 1) / 2)
+    {
+        PyBuffer_Release(&dist);
+        PyErr_SetString(PyExc_ValueError, "dist should be the condensed distance matrix of n items");
+        return NULL;
+    }
+
+    Py_ssize_t size = n > 1 ? 2 * (Py_ssize_t)(n - 1) : 1;
+    int *merges = malloc(sizeof(int) * size);
+    double *lengths = malloc(sizeof(double) * size);
+    int status = -1;
+    if (merges != NULL && lengths != NULL)
+    {
+        Py_BEGIN_ALLOW_THREADS
+        status = build(dist.buf, n, merges, lengths);
+        Py_END_ALLOW_THREADS
+    }
+    PyBuffer_Release(&dist);
+
+    PyObject *result = NULL;
+    if (status == 0)
+        result = Py_BuildValue("(y#y#)", (char *)merges, (Py_ssize_t)(sizeof(int) * 2 * (n - 1)),
+                               (char *)lengths, (Py_ssize_t)(sizeof(double) * 2 * (n - 1)));
+    else
+        PyErr_NoMemory();
+    free(merges);
+    free(lengths);
+    return result;
+}
+
+static PyObject *
+algorithm_UPGMA(PyObject *self, PyObject *args)
+{
+    return guideTree(args, UPGMA);
+}
+
+static PyObject *
+algorithm_NeighborJoining(PyObject *self, PyObject *args)
+{
+    return guideTree(args, NeighborJoining);
+}
+
+static PyObject *
+algorithm_ProfileAlign(PyObject *self, PyObject *args)
+{
+    Py_buffer rows_a, rows_b;
+    int depth_a, depth_b;
+    float match, mismatch, gap_open, gap_extend;
+    int mask = 0;
+
+    if (!PyArg_ParseTuple(args, "y*iy*iffff|C", &rows_a, &depth_a, &rows_b, &depth_b,
+                          &match, &mismatch, &gap_open, &gap_extend, &mask))
+        return NULL;
+    if (depth_a < 1 || depth_b < 1 || rows_a.len % depth_a || rows_b.len % depth_b ||
+        rows_a.len / depth_a > INT_MAX / 2 || rows_b.len / depth_b > INT_MAX / 2)
+    {
+        PyBuffer_Release(&rows_a);
+        PyBuffer_Release(&rows_b);
+        PyErr_SetString(PyExc_ValueError, "rows should be depth rows with same width");
+        return NULL;
+    }
+
+    int width_a = (int)(rows_a.len / depth_a), width_b = (int)(rows_b.len / depth_b), length;
+    char *ops = malloc(width_a + width_b + 1);
+    if (ops == NULL)
+        length = -1;
+    else
+    {
+        Py_BEGIN_ALLOW_THREADS
+        length = ProfileAlign(rows_a.buf, depth_a, width_a, rows_b.buf, depth_b, width_b,
+                              match, mismatch, gap_open, gap_extend, ops, (char)mask);
+        Py_END_ALLOW_THREADS
+    }
+    PyBuffer_Release(&rows_a);
+    PyBuffer_Release(&rows_b);
+
+    PyObject *result = length < 0 ? PyErr_NoMemory() : PyBytes_FromStringAndSize(ops, length);
+    free(ops);
+    return result;
+}
+
+static PyObject *
+algorithm_SuffixArray(PyObject *self, PyObject *args)
+{
+    const unsigned char *text;
+    Py_ssize_t length;
+
+    if (!PyArg_ParseTuple(args, "y#", &text, &length))
+        return NULL;
+
+    if (length == 0 || length > INT_MAX)
+    {
+        PyErr_SetString(PyExc_ValueError, "text length should be in range [1, 2^31 - 1]");
+        return NULL;
+    }
+
+    int *sa = malloc(sizeof(int) * length);
+    char *bwt = malloc(length);
+    if (sa == NULL || bwt == NULL)
+    {
+        free(sa);
+        free(bwt);
+        return PyErr_NoMemory();
+    }
+
+    int status;
+    Py_BEGIN_ALLOW_THREADS
+    status = SuffixArray(text, (int)length, sa);
+    // the char before each suffix makes up the Burrows-Wheeler transform
+    for (Py_ssize_t i = 0; status == 0 && i < length; i++)
+        bwt[i] = text[sa[i] == 0 ? length - 1 : sa[i] - 1];
+    Py_END_ALLOW_THREADS
+
+    if (status != 0)
+    {
+        free(sa);
+        free(bwt);
+        return PyErr_NoMemory();
+    }
+
+    PyObject *result = Py_BuildValue("(y#y#)", (char *)sa, (Py_ssize_t)(sizeof(int) * length), bwt, length);
+
+    free(sa);
+    free(bwt);
+    return result;
+}
+
+static PyObject *
+algorithm_PackBases(PyObject *self, PyObject *args)
+{
+    const char *seq;
+    const char *alphabet;
+    Py_ssize_t length, alphabet_length;
+
+    if (!PyArg_ParseTuple(args, "s#y#", &seq, &length, &alphabet, &alphabet_length))
+        return NULL;
+    if (alphabet_length != 4 || length > INT_MAX)
+    {
+        PyErr_SetString(PyExc_ValueError, "alphabet should have 4 bases and length should less than 2^31");
+        return NULL;
+    }
+
+    PyObject *packed = PyBytes_FromStringAndSize(NULL, (length + 3) / 4);
+    if (packed == NULL)
+        return NULL;
+    if (PackBases(seq, (int)length, alphabet, (unsigned char *)PyBytes_AS_STRING(packed)) != 0)
+    {
+        Py_DECREF(packed);
+        PyErr_SetString(PyExc_ValueError, "sequence has base not in alphabet");
+        return NULL;
+    }
+    return packed;
+}
+
+static PyObject *
+algorithm_UnpackBases(PyObject *self, PyObject *args)
+{
+    Py_buffer packed;
+    Py_ssize_t length;
+    const char *alphabet;
+    Py_ssize_t alphabet_length;
+
+    if (!PyArg_ParseTuple(args, "y*ny#", &packed, &length, &alphabet, &alphabet_length))
+        return NULL;
+    if (alphabet_length != 4 || length < 0 || length > INT_MAX || (length + 3) / 4 > packed.len)
+    {
+        PyBuffer_Release(&packed);
+        PyErr_SetString(PyExc_ValueError, "alphabet should have 4 bases and packed data should have length bases");
+        return NULL;
+    }
+
+    PyObject *seq = PyUnicode_New(length, 127);
+    if (seq != NULL)
+        UnpackBases(packed.buf, (int)length, alphabet, (char *)PyUnicode_DATA(seq));
+    PyBuffer_Release(&packed);
+    return seq;
+}
+
+static PyObject *
+algorithm_MinHash(PyObject *self, PyObject *args)
+{
+    const char *seq;
+    Py_ssize_t length;
+    int k, size, mode;
+
+    if (!PyArg_ParseTuple(args, "s#iii", &seq, &length, &k, &size, &mode))
+        return NULL;
+    if (length > INT_MAX || k <= 0 || size <= 0 || mode < 0 || mode > 2 || (mode > 0 && k > 32))
+    {
+        PyErr_SetString(PyExc_ValueError, "k and size should be positive, k should be no more than 32 for nucleotides");
+        return NULL;
+    }
+
+    uint64_t *sketch = malloc(sizeof(uint64_t) * size);
+    if (sketch == NULL)
+        return PyErr_NoMemory();
+    int count;
+    Py_BEGIN_ALLOW_THREADS
+    count = MinHash(seq, (int)length, k, size, mode, sketch);
+    Py_END_ALLOW_THREADS
+
+    PyObject *result = PyBytes_FromStringAndSize((char *)sketch, sizeof(uint64_t) * count);
+    free(sketch);
+    return result;
+}
+
+static int
+checkOffsets(const Py_buffer *hashes, const Py_buffer *offsets)
+{ /* offsets are int64 boundaries of each sketch in hashes, return number of sketches or -1 */
+    const int64_t *bounds = offsets->buf;
+    Py_ssize_t n = offsets->len / (Py_ssize_t)sizeof(int64_t) - 1;
+
+    if (n < 0 || offsets->len % sizeof(int64_t) || hashes->len % sizeof(uint64_t) || n > INT_MAX || bounds[0] != 0)
+        return -1;
+    for (Py_ssize_t i = 0; i < n; i++)
+        if (bounds[i + 1] < bounds[i] || bounds[i + 1] - bounds[i] > INT_MAX)
+            return -1;
+    return bounds[n] == hashes->len / (Py_ssize_t)sizeof(uint64_t) ? (int)n : -1;
+}
+
+static PyObject *
+algorithm_SketchMatrix(PyObject *self, PyObject *args)
+{
+    Py_buffer hashes_a, offsets_a, hashes_b, offsets_b;
+    int size, containment, n_a, n_b;
+
+    if (!PyArg_ParseTuple(args, "y*y*y*y*ip", &hashes_a, &offsets_a, &hashes_b, &offsets_b, &size, &containment))
+        return NULL;
+
+    PyObject *result = NULL;
+    n_a = checkOffsets(&hashes_a, &offsets_a);
+    n_b = checkOffsets(&hashes_b, &offsets_b);
+    if (n_a < 0 || n_b < 0)
+        PyErr_SetString(PyExc_ValueError, "offsets should be int64 boundaries of sketches in hashes");
+    else if ((result = PyBytes_FromStringAndSize(NULL, sizeof(double) * n_a * n_b)) != NULL)
+    {
+        const uint64_t *a = hashes_a.buf, *b = hashes_b.buf;
+        const int64_t *bound_a = offsets_a.buf, *bound_b = offsets_b.buf;
+        double *matrix = (double *)PyBytes_AS_STRING(result);
+
+        Py_BEGIN_ALLOW_THREADS
+        for (int i = 0; i < n_a; i++)
+            for (int j = 0; j < n_b; j++)
+                matrix[(Py_ssize_t)i * n_b + j] = SketchCompare(
+                    a + bound_a[i], (int)(bound_a[i + 1] - bound_a[i]),
+                    b + bound_b[j], (int)(bound_b[j + 1] - bound_b[j]), size, containment);
+        Py_END_ALLOW_THREADS
+    }
+    PyBuffer_Release(&hashes_a);
+    PyBuffer_Release(&offsets_a);
+    PyBuffer_Release(&hashes_b);
+    PyBuffer_Release(&offsets_b);
+    return result;
+}
+
+static int
+kmerTable(int k, Py_ssize_t sigma, uint32_t *table)
+{ /* sigma^k, -1 if k is not positive or the table has more than 2^28 entries */
+    uint64_t size = 1;
+
+    if (k <= 0 || sigma <= 0)
+        return -1;
+    for (int i = 0; i < k; i++)
+        if ((size *= sigma) > (1 << 28))
+            return -1;
+    *table = (uint32_t)size;
+    return 0;
+}
+
+static PyObject *
+algorithm_KmerIndex(PyObject *self, PyObject *args)
+{
+    Py_buffer text;
+    const char *alphabet;
+    Py_ssize_t sigma;
+    int k;
+    uint32_t table;
+
+    if (!PyArg_ParseTuple(args, "y*iy#", &text, &k, &alphabet, &sigma))
+        return NULL;
+    if (kmerTable(k, sigma, &table) != 0 || text.len >= UINT32_MAX)
+    {
+        PyBuffer_Release(&text);
+        PyErr_SetString(PyExc_ValueError, "len(alphabet) ** k should be no more than 2^28 and text less than 4GB");
+        return NULL;
+    }
+
+    PyObject *offsets = PyBytes_FromStringAndSize(NULL, sizeof(uint32_t) * ((Py_ssize_t)table + 1));
+    uint32_t *positions = malloc(sizeof(uint32_t) * (text.len ? text.len : 1));
+    PyObject *result = NULL;
+    if (offsets == NULL || positions == NULL)
+    {
+        if (offsets != NULL)
+            PyErr_NoMemory();
+    }
+    else
+    {
+        int total;
+        Py_BEGIN_ALLOW_THREADS
+        total = KmerIndex(text.buf, (uint32_t)text.len, k, alphabet, (int)sigma,
+                          (uint32_t *)PyBytes_AS_STRING(offsets), positions);
+        Py_END_ALLOW_THREADS
+        if (total < 0)
+            PyErr_NoMemory();
+        else
+            result = Py_BuildValue("(Oy#)", offsets, (char *)positions, (Py_ssize_t)(sizeof(uint32_t) * total));
+    }
+    Py_XDECREF(offsets);
+    free(positions);
+    PyBuffer_Release(&text);
+    return result;
+}
+
+static PyObject *
+algorithm_SeedExtend(PyObject *self, PyObject *args)
+{
+    const char *query, *alphabet;
+    Py_ssize_t query_length, sigma;
+    Py_buffer text, offsets, positions;
+    int k, max_occurrences;
+    float match, mismatch, xdrop, min_score;
+    uint32_t table;
+
+    if (!PyArg_ParseTuple(args, "s#y*y*y*iy#ffffi", &query, &query_length, &text, &offsets, &positions,
+                          &k, &alphabet, &sigma, &match, &mismatch, &xdrop, &min_score, &max_occurrences))
+        return NULL;
+
+    PyObject *result = NULL;
+    if (kmerTable(k, sigma, &table) != 0 || query_length > INT_MAX || text.len >= UINT32_MAX ||
+        offsets.len != (Py_ssize_t)sizeof(uint32_t) * ((Py_ssize_t)table + 1) ||
+        ((const uint32_t *)offsets.buf)[table] != positions.len / sizeof(uint32_t))
+        PyErr_SetString(PyExc_ValueError, "offsets and positions should be built by KmerIndex with the same k and alphabet");
+    else
+    {
+        double *hsps;
+        int found;
+        Py_BEGIN_ALLOW_THREADS
+        found = SeedExtend(query, (int)query_length, text.buf, (uint32_t)text.len, offsets.buf, positions.buf,
+                           k, alphabet, (int)sigma, match, mismatch, xdrop, min_score, max_occurrences, &hsps);
+        Py_END_ALLOW_THREADS
+        if (found < 0)
+            PyErr_NoMemory();
+        else
+            result = PyBytes_FromStringAndSize((char *)hsps, sizeof(double) * 5 * found);
+        free(hsps);
+    }
+    PyBuffer_Release(&text);
+    PyBuffer_Release(&offsets);
+    PyBuffer_Release(&positions);
+    return result;
+}
+
+static PyObject *
+maskIntervals(int found, int *intervals)
+{ /*
+   *Description:  List of (start, end) tuples of masked regions
+   */
+    PyObject *result = NULL;
+    if (found < 0)
+        PyErr_NoMemory();
+    else if ((result = PyList_New(found)) != NULL)
+    {
+        for (int i = 0; i < found; i++)
+        {
+            PyObject *interval = Py_BuildValue("(ii)", intervals[2 * i], intervals[2 * i + 1]);
+            if (interval == NULL)
+            {
+                Py_CLEAR(result);
+                break;
+            }
+            PyList_SET_ITEM(result, i, interval);
+        }
+    }
+    free(intervals);
+    return result;
+}
+
+static PyObject *
+algorithm_Dust(PyObject *self, PyObject *args)
+{
+    const char *seq;
+    Py_ssize_t length;
+    int window;
+    double threshold;
+
+    if (!PyArg_ParseTuple(args, "s#id", &seq, &length, &window, &threshold))
+        return NULL;
+    if (window < 4 || length > INT_MAX - 1)
+    {
+        PyErr_SetString(PyExc_ValueError, "window should be at least 4");
+        return NULL;
+    }
+    int *intervals = malloc(sizeof(int) * (length + 1));
+    int found = -1;
+    if (intervals != NULL)
+    {
+        Py_BEGIN_ALLOW_THREADS
+        found = Dust(seq, (int)length, window, threshold, intervals);
+        Py_END_ALLOW_THREADS
+    }
+    return maskIntervals(found, intervals);
+}
+
+static PyObject *
+algorithm_Seg(PyObject *self, PyObject *args)
+{
+    const char *seq;
+    Py_ssize_t length;
+    int window;
+    double locut, hicut;
+
+    if (!PyArg_ParseTuple(args, "s#idd", &seq, &length, &window, &locut, &hicut))
+        return NULL;
+    if (window < 1 || length > INT_MAX - 1)
+    {
+        PyErr_SetString(PyExc_ValueError, "window should be positive");
+        return NULL;
+    }
+    int *intervals = malloc(sizeof(int) * (length + 1));
+    int found = -1;
+    if (intervals != NULL)
+    {
+        Py_BEGIN_ALLOW_THREADS
+        found = Seg(seq, (int)length, window, locut, hicut, intervals);
+        Py_END_ALLOW_THREADS
+    }
+    return maskIntervals(found, intervals);
+}
+
+static PyObject *
+algorithm_CodonCount(PyObject *self, PyObject *args)
+{
+    const char *seq;
+    Py_ssize_t length;
+
+    if (!PyArg_ParseTuple(args, "s#", &seq, &length))
+        return NULL;
+    if (length > INT_MAX)
+    {
+        PyErr_SetString(PyExc_ValueError, "sequence is too long");
+        return NULL;
+    }
+    PyObject *result = PyBytes_FromStringAndSize(NULL, sizeof(int64_t) * 64);
+    if (result == NULL)
+        return NULL;
+    int64_t *counts = (int64_t *)PyBytes_AS_STRING(result);
+    memset(counts, 0, sizeof(int64_t) * 64);
+    Py_BEGIN_ALLOW_THREADS
+    CodonCount(seq, (int)length, counts);
+    Py_END_ALLOW_THREADS
+    return result;
+}
+
 static PyMethodDef AlgorithmMethods[] = {
     {"NeedlemanWunsch", algorithm_NeedlemanWunsch, METH_VARARGS, "algorithm NeedlemanWunsch."},
     {"SmithWaterman", algorithm_SmithWaterman, METH_VARARGS, "algorithm SmithWaterman."},
+    {"AlignStats", algorithm_AlignStats, METH_VARARGS, "algorithm AlignStats."},
+    {"UPGMA", algorithm_UPGMA, METH_VARARGS, "algorithm UPGMA."},
+    {"NeighborJoining", algorithm_NeighborJoining, METH_VARARGS, "algorithm NeighborJoining."},
+    {"ProfileAlign", algorithm_ProfileAlign, METH_VARARGS, "algorithm ProfileAlign."},
+    {"SuffixArray", algorithm_SuffixArray, METH_VARARGS, "algorithm SuffixArray."},
+    {"PackBases", algorithm_PackBases, METH_VARARGS, "algorithm PackBases."},
+    {"UnpackBases", algorithm_UnpackBases, METH_VARARGS, "algorithm UnpackBases."},
+    {"MinHash", algorithm_MinHash, METH_VARARGS, "algorithm MinHash."},
+    {"SketchMatrix", algorithm_SketchMatrix, METH_VARARGS, "algorithm SketchMatrix."},
+    {"KmerIndex", algorithm_KmerIndex, METH_VARARGS, "algorithm KmerIndex."},
+    {"SeedExtend", algorithm_SeedExtend, METH_VARARGS, "algorithm SeedExtend."},
+    {"Dust", algorithm_Dust, METH_VARARGS, "algorithm Dust."},
+    {"Seg", algorithm_Seg, METH_VARARGS, "algorithm Seg."},
+    {"CodonCount", algorithm_CodonCount, METH_VARARGS, "algorithm CodonCount."},
     {NULL, NULL, 0, NULL},
 };
 
@@ -0,0 +1,119 @@
+import re
+
+from typing import Iterator, List, Tuple
+
+_CIGAR = re.compile(r"(\d+)([=XID])")
+
+
+class Alignment:
+    """Compact result of pairwise alignment, returned by ``Sequence.align(subject, compact=True)``.
+
+    Only the coordinates of aligned region and a run-length CIGAR are kept,
+    statistics are counted in C during back-tracking. CIGAR operations follow SAM with subject as reference:
+    ``=`` match, ``X`` mismatch, ``I`` base only in query, ``D`` base only in subject.
+    Gapped strings are only created by ``aligned()``, unpacking an alignment gives the same
+    ``(aligned_query, aligned_subject, score)`` as ``Sequence.align()``.
+    """
+    __slots__ = ("query", "subject", "score", "query_start", "query_end", "subject_start", "subject_end",
+                 "cigar", "matches", "mismatches", "insertions", "deletions", "gap_opens")
+    query: str
+    subject: str
+    score: float
+    query_start: int
+    query_end: int
+    subject_start: int
+    subject_end: int
+    cigar: str
+    matches: int
+    mismatches: int
+    insertions: int
+    deletions: int
+    gap_opens: int
+
+    def __init__(self, query: str, subject: str, score: float,
+                 query_start: int, query_end: int, subject_start: int, subject_end: int,
+                 cigar: str, matches: int, mismatches: int, insertions: int, deletions: int, gap_opens: int):
+        self.query = query
+        self.subject = subject
+        self.score = score
+        self.query_start = query_start
+        self.query_end = query_end
+        self.subject_start = subject_start
+        self.subject_end = subject_end
+        self.cigar = cigar
+        self.matches = matches
+        self.mismatches = mismatches
+        self.insertions = insertions
+        self.deletions = deletions
+        self.gap_opens = gap_opens
+
+    @property
+    def length(self) -> int:
+        """
+        Number of columns of alignment
+        """
+        return self.matches + self.mismatches + self.insertions + self.deletions
+
+    @property
+    def gaps(self) -> int:
+        """
+        Number of gap columns in both query and subject
+        """
+        return self.insertions + self.deletions
+
+    @property
+    def identity(self) -> float:
+        """
+        Matches divided by the number of columns
+        """
+        return self.matches / self.length if self.length else 0.
+
+    @property
+    def query_coverage(self) -> float:
+        """
+        Fraction of query in the aligned region
+        """
+        return (self.query_end - self.query_start) / len(self.query) if self.query else 0.
+
+    @property
+    def subject_coverage(self) -> float:
+        """
+        Fraction of subject in the aligned region
+        """
+        return (self.subject_end - self.subject_start) / len(self.subject) if self.subject else 0.
+
+    @property
+    def operations(self) -> List[Tuple[int, str]]:
+        """
+        (length, operation) of each run in CIGAR
+        """
+        return [(int(length), op) for length, op in _CIGAR.findall(self.cigar)]
+
+    def aligned(self) -> Tuple[str, str]:
+        """Create the gapped strings of aligned region
+
+        Returns:
+            Tuple[str, str]: aligned query and aligned subject
+        """
+        query, subject = [], []
+        i, j = self.query_start, self.subject_start
+        for length, op in self.operations:
+            if op == "D":
+                query.append("-" * length)
+            else:
+                query.append(self.query[i: i + length])
+                i += length
+            if op == "I":
+                subject.append("-" * length)
+            else:
+                subject.append(self.subject[j: j + length])
+                j += length
+        return "".join(query), "".join(subject)
+
+    def __iter__(self) -> Iterator:
+        yield from self.aligned()
+        yield self.score
+
+    def __repr__(self) -> str:
+        return f"Alignment(score={self.score}, query={self.query_start}-{self.query_end}, " \
+               f"subject={self.subject_start}-{self.subject_end}, cigar={self.cigar!r})"
@@ -0,0 +1,243 @@
+from array import array
+from itertools import accumulate, compress, repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Type, Union, overload
+
+from bioseq._sequence import (
+    Peptide, Sequence, _chargedResidues, _hydropathyScale, _isoelectricPoint, _weightTable,
+    _windowAverage)
+
+
+def _sequences(peptides: Iterable[Union[str, Peptide]]) -> List[str]:
+    """
+    Get the upper case string of each peptide
+    """
+    return [peptide.seq if isinstance(peptide, Peptide) else peptide.upper()
+            for peptide in peptides]
+
+
+def peptide_hydropathy(peptides: Iterable[Union[str, Peptide]],
+                       window_size: int = 9,
+                       scale: Union[str, Dict[str, float]] = "KD") -> List[List[float]]:
+    """Calculate the Hydropathy Score of many peptides, same as ``Peptide.getHphob()``.
+    All peptides are joined and scored by one prefix sum, then sliced by the offset of each peptide.
+
+    Args:
+        peptides(Iterable[str|Peptide]): Peptides to be calculated, such as a whole proteome
+        window_size(int): the number for calculate average hydropathy value
+        scale(str|Dict[str, float]): name of scale in ``config.HYDROPATHY_SCALES`` or a custom table
+    Returns:
+        List[List[float]]: Hydropathy Score of each peptide
+    """
+    seqs = _sequences(peptides)
+    table = _hydropathyScale(scale)
+    prefix = list(accumulate(map(table.__getitem__, "".join(seqs)), initial=0.))
+
+    result, start = [], 0
+    for seq in seqs:
+        result.append(_windowAverage(prefix, start, len(seq), window_size))
+        start += len(seq)
+    return result
+
+
+def peptide_pI(peptides: Iterable[Union[str, Peptide]]) -> List[float]:
+    """Calculate the pI of many peptides, same as ``Peptide.pI``.
+    Peptides are reduced to counts of charged amino acids first,
+    the pI is only solved once for each distinct count, which is common in digested peptides.
+
+    Args:
+        peptides(Iterable[str|Peptide]): Peptides to be calculated
+    Returns:
+        List[float]: pI of each peptide
+    """
+    residues = _chargedResidues()
+    solved: Dict[Tuple[int, ...], float] = {}
+    result = []
+    for seq in _sequences(peptides):
+        counts = tuple([seq.count(aa) for aa in residues])
+        pI = solved.get(counts)
+        if pI is None:
+            pI = solved[counts] = _isoelectricPoint(counts)
+        result.append(pI)
+    return result
+
+
+class SequenceBatch:
+    """Columnar container of many sequences with same type.
+
+    All residues are stored in one contiguous ``bytearray`` with an offsets array,
+    and all infos are stored in another one, so each sequence only costs its residues and 16 bytes.
+    Properties are calculated for all sequences at once and returned as ``array``,
+    ``DNA``/``RNA``/``Peptide`` instance is only created when indexing the batch.
+    """
+    seq_type: Type[Sequence]
+
+    def __init__(self,
+                 sequences: Iterable[Union[str, Sequence]] = (),
+                 seq_type: Type[Sequence] = Sequence):
+        """Create a batch of sequences
+
+        Args:
+            sequences(Iterable[str|Sequence]): Sequences to be stored
+            seq_type(Type[Sequence]): The type of sequence created by indexing, such as DNA
+        """
+        self.seq_type = seq_type
+        self._residues = bytearray()
+        self._offsets = array("Q", [0])
+        self._info = bytearray()
+        self._info_offsets = array("Q", [0])
+        for seq in sequences:
+            if isinstance(seq, Sequence):
+                self.append(seq.seq, seq.info)
+            else:
+                self.append(seq)
+
+    @classmethod
+    def fromFasta(cls, filename: str, seq_type: Type[Sequence] = Sequence) -> "SequenceBatch":
+        """Load all records of a fasta file without creating ``Sequence`` instances
+
+        Args:
+            filename(str): the fasta file's name
+            seq_type(Type[Sequence]): The type of sequence created by indexing, such as DNA
+        Returns:
+            SequenceBatch: Batch of all records
+        """
+        from bioseq.utils import _iterFastaChunks
+
+        batch = cls(seq_type=seq_type)
+        for info, lines in _iterFastaChunks(filename):
+            for line in lines:
+                batch._residues += line.encode("ascii")
+            batch._offsets.append(len(batch._residues))
+            batch._info += info.encode("utf8")
+            batch._info_offsets.append(len(batch._info))
+        return batch
+
+    def append(self, seq: str, info: str = ""):
+        """Add a sequence to the end of batch
+
+        Args:
+            seq(str): Sequence
+            info(str): Some information string about the sequence
+        """
+        self._residues += seq.upper().encode("ascii")
+        self._offsets.append(len(self._residues))
+        self._info += info.encode("utf8")
+        self._info_offsets.append(len(self._info))
+
+    def seq(self, index: int) -> str:
+        """
+        Get the sequence string at index without creating a ``Sequence``
+        """
+        index = range(len(self))[index]
+        return self._residues[self._offsets[index]: self._offsets[index + 1]].decode("ascii")
+
+    def info(self, index: int) -> str:
+        """
+        Get the info string at index
+        """
+        index = range(len(self))[index]
+        return self._info[self._info_offsets[index]: self._info_offsets[index + 1]].decode("utf8")
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the buffers of residues, infos and offsets
+        """
+        return len(self._residues) + len(self._info) + \
+            (len(self._offsets) + len(self._info_offsets)) * self._offsets.itemsize
+
+    @property
+    def lengths(self) -> array:
+        """
+        Length of each sequence, ``array("Q")``
+        """
+        offsets = self._offsets
+        return array("Q", map(int.__sub__, offsets[1:], offsets[:-1]))
+
+    @property
+    def composition(self) -> Dict[str, array]:
+        """Count each element of all sequences
+
+        Returns:
+            Dict[str, array]: Each element's appearance times in each sequence, sorted by element
+        """
+        starts, ends = self._offsets[:-1], self._offsets[1:]
+        return {chr(char): array("Q", map(self._residues.count, repeat(bytes((char,))), starts, ends))
+                for char in sorted(set(self._residues))}
+
+    @property
+    def weight(self) -> array:
+        """Molar mass of each sequence, same as ``Sequence.weight``
+
+        Returns:
+            array: Molar mass with unit of Dalton, ``array("d")``
+        """
+        weight_table = _weightTable(self.seq_type)
+        weights = [-18. * (length - 1) for length in self.lengths]
+        for element, counts in self.composition.items():
+            element_weight = weight_table[element]
+            weights = [w + count * element_weight for w, count in zip(weights, counts)]
+        return array("d", weights)
+
+    @property
+    def GC(self) -> array:
+        """GC percentage of each sequence, same as ``RNA.GC``
+
+        Returns:
+            array: GC percentage, ``array("d")``
+        """
+        composition = self.composition
+        zeros = repeat(0)
+        return array("d", [round((g + c) / length, 4) if length else 0.
+                           for g, c, length in zip(composition.get("G", zeros),
+                                                   composition.get("C", zeros),
+                                                   self.lengths)])
+
+    def filter(self, condition: Union[Iterable[bool], Callable[[Sequence], bool]]) -> "SequenceBatch":
+        """Select sequences by a mask or a function
+
+        Args:
+            condition(Iterable[bool]|Callable[[Sequence], bool]): mask of each sequence such as
+                ``[length > 100 for length in batch.lengths]``, or a function receive each sequence
+        Returns:
+            SequenceBatch: A new batch with the selected sequences
+        """
+        if callable(condition):
+            condition = map(condition, self)
+        return self._select(compress(range(len(self)), condition))
+
+    def _select(self, indices: Iterable[int]) -> "SequenceBatch":
+        """
+        Copy sequences at indices to a new batch
+        """
+        batch = self.__class__(seq_type=self.seq_type)
+        offsets, info_offsets = self._offsets, self._info_offsets
+        for i in indices:
+            batch._residues += self._residues[offsets[i]: offsets[i + 1]]
+            batch._offsets.append(len(batch._residues))
+            batch._info += self._info[info_offsets[i]: info_offsets[i + 1]]
+            batch._info_offsets.append(len(batch._info))
+        return batch
+
+    @overload
+    def __getitem__(self, index: int) -> Sequence:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SequenceBatch":
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._select(range(len(self))[index])
+        return self.seq_type(self.seq(index), self.info(index))
+
+    def __iter__(self) -> Iterator[Sequence]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.seq_type.__name__} x {len(self)})"
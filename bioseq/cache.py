@@ -0,0 +1,191 @@
+"""Memoized results of ``Sequence.align()``.
+
+Results are keyed by the BLAKE2b digests of query and subject and the alignment parameters
+(mode, compact, MATCH, MISMATCH, GAP_OPEN, GAP_EXTEND, MASK), so changing ``AlignmentConfig`` never returns a stale result.
+The cache is opt-in, set ``AlignmentConfig.CACHE`` to use it in every ``Sequence.align()``:
+
+>>> from bioseq.config import AlignmentConfig
+>>> AlignmentConfig.CACHE = AlignmentCache(maxsize=10000, path="alignments.sqlite")
+>>> query.align(subject)     # aligned and cached
+>>> query.align(subject)     # returned from cache
+>>> AlignmentConfig.CACHE.stats()
+CacheStats(hits=1, misses=1, disk_hits=0, size=1, maxsize=10000)
+
+Recent results are kept in memory by LRU. With ``path``, results are also written to a SQLite file,
+which is shared by processes using the same path and kept after exit.
+Cached ``Alignment`` objects are shared by callers, so don't modify them.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple, Union
+
+from bioseq import metrics
+from bioseq.alignment import Alignment
+
+_PARAMETERS = struct.Struct("<BBdddd")
+
+AlignResult = Union[Tuple[str, str, float], Alignment]
+
+
+class CacheStats(NamedTuple):
+    #: results found in memory or on disk
+    hits: int
+    #: results aligned because not found
+    misses: int
+    #: hits found on disk, included in hits
+    disk_hits: int
+    #: results in memory
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+
+def _encode(result: AlignResult) -> str:
+    if isinstance(result, Alignment):
+        return json.dumps(["alignment"] + [getattr(result, name) for name in Alignment.__slots__])
+    return json.dumps(["tuple"] + list(result))
+
+
+def _decode(text: str) -> AlignResult:
+    kind, *values = json.loads(text)
+    if kind == "alignment":
+        return Alignment(*values)
+    return tuple(values)
+
+
+class AlignmentCache:
+    """Size-bounded LRU cache of alignment results with an optional SQLite tier, thread-safe
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        """Create cache
+
+        Args:
+            maxsize(int): Max number of results kept in memory
+            path(str): SQLite file to persist results, shared by processes, default is memory only
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize should be positive")
+        self.maxsize = maxsize
+        self.path = path
+        self._memory: "OrderedDict[bytes, AlignResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._disk_hits = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = 0
+
+    @staticmethod
+    def key(query: bytes, subject: bytes, mode: int, compact: bool,
+            match: float, mismatch: float, gap_open: float, gap_extend: float, mask: str = "\0") -> bytes:
+        """Key of an alignment
+
+        Args:
+            query(bytes): Digest of query, ``Sequence.digest``
+            subject(bytes): Digest of subject
+            mask(str): ``AlignmentConfig.MASK``, "\\0" for none
+        Returns:
+            bytes: 16 bytes BLAKE2b digest of the sequences and parameters
+        """
+        parameters = _PARAMETERS.pack(mode, compact, match, mismatch, gap_open, gap_extend) + mask.encode("utf8")
+        return hashlib.blake2b(query + subject + parameters, digest_size=16).digest()
+
+    def _database(self) -> sqlite3.Connection:
+        """
+        Connection of current process, reopened after fork because a connection can't be shared by processes
+        """
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS alignments (key BLOB PRIMARY KEY, result TEXT)")
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key: bytes, result: AlignResult):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, key: bytes) -> Optional[AlignResult]:
+        """
+        Cached result of key, None if not found
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            tier = "memory"
+            if result is not None:
+                self._memory.move_to_end(key)
+            elif self.path is not None:
+                row = self._database().execute("SELECT result FROM alignments WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    result, tier = _decode(row[0]), "disk"
+                    self._disk_hits += 1
+                    self._remember(key, result)
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if metrics.ENABLED:
+            if result is None:
+                metrics.inc("bioseq_align_cache_misses_total")
+            else:
+                metrics.inc("bioseq_align_cache_hits_total", tier=tier)
+        return result
+
+    def put(self, key: bytes, result: AlignResult):
+        """
+        Cache the result of key
+        """
+        with self._lock:
+            self._remember(key, result)
+            if self.path is not None:
+                connection = self._database()
+                connection.execute("INSERT OR REPLACE INTO alignments VALUES (?, ?)", (key, _encode(result)))
+                connection.commit()
+
+    def stats(self) -> CacheStats:
+        """
+        Hit and miss statistics since created or cleared
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._disk_hits, len(self._memory), self.maxsize)
+
+    def clear(self, disk: bool = False):
+        """Remove results in memory and reset statistics
+
+        Args:
+            disk(bool): Also remove results in the SQLite file
+        """
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._misses = self._disk_hits = 0
+            if disk and self.path is not None:
+                connection = self._database()
+                connection.execute("DELETE FROM alignments")
+                connection.commit()
+
+    def close(self):
+        """
+        Close the SQLite file, it's reopened when needed
+        """
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __repr__(self) -> str:
+        return f"AlignmentCache(maxsize={self.maxsize}, path={self.path!r}, size={len(self)})"
@@ -0,0 +1,273 @@
+"""Command line interface of bioseq, installed as ``bioseq`` and also run by ``python -m bioseq``.
+
+Each command reads fasta records from files or stdin ("-", the default) and writes to stdout,
+records are streamed, so commands can be chained in shell pipelines::
+
+    zcat cds.fasta.gz | bioseq translate --to-stop | bioseq stats --type protein
+    bioseq fetch NM_001256799.3 | bioseq orf --peptide
+    bioseq align --threads 4 reference.fasta reads.fasta > hits.tsv
+
+With ``--threads``, records are processed by batches in a pool and written in the input order,
+at most two batches of each worker are pending, so the memory is bounded for endless stdin.
+"""
+import argparse
+import os
+import sys
+
+from collections import deque
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from bioseq import config
+from bioseq._sequence import DNA, RNA, Peptide, _complementTable
+
+#: type of records by ``--type``
+TYPES = {"dna": DNA, "rna": RNA, "protein": Peptide}
+
+Record = Tuple[str, str]
+
+
+def _records(inputs: List[str]) -> Iterator[Record]:
+    """
+    Info and upper case sequence of each record of the fasta files, "-" is stdin
+    """
+    from bioseq.utils import _iterFastaChunks
+
+    for source in inputs:
+        for info, lines in _iterFastaChunks(sys.stdin if source == "-" else source):
+            yield info, "".join(lines)
+
+
+def _fasta(info: str, seq: str, line_width: int) -> str:
+    width = line_width or len(seq) or 1
+    return f">{info}\n" + "".join(seq[i: i + width] + "\n" for i in range(0, len(seq), width))
+
+
+def _batches(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _mapBatch(func: Callable[[Record, argparse.Namespace], str], args: argparse.Namespace,
+              batch: List[Record]) -> List[str]:
+    return [func(record, args) for record in batch]
+
+
+def _parallelMap(func: Callable[[Record, argparse.Namespace], str],
+                 records: Iterable[Record],
+                 args: argparse.Namespace,
+                 processes: bool = True) -> Iterator[str]:
+    """Apply func to each record in order, by batches in a pool of ``args.threads`` workers
+
+    Args:
+        func: Module level function formatting the output of a record
+        records: Records to be processed
+        args: Parsed arguments passed to func
+        processes: Use processes for functions holding GIL, or threads for functions releasing GIL in C
+    Returns:
+        Iterator[str]: Output of each record
+    """
+    batches = _batches(records, args.batch_size)
+    if args.threads <= 1:
+        for batch in batches:
+            yield from _mapBatch(func, args, batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    executor_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    work = partial(_mapBatch, func, args)
+    with executor_type(args.threads) as executor:
+        pending: deque = deque()
+        for batch in batches:
+            pending.append(executor.submit(work, batch))
+            if len(pending) >= 2 * args.threads:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _stats(record: Record, args: argparse.Namespace) -> str:
+    info, seq = record
+    sequence = TYPES[args.type](seq, info)
+    try:
+        weight = f"{sequence.weight:.1f}"
+    except KeyError:
+        # unknown residues such as N or X
+        weight = "NA"
+    if isinstance(sequence, RNA):
+        extra = f"{sequence.GC:.4f}" if seq else "NA"
+    else:
+        extra = f"{sequence.pI:.2f}" if seq else "NA"
+    name = (info.split(maxsplit=1) or [""])[0]
+    return f"{name}\t{len(seq)}\t{weight}\t{extra}\n"
+
+
+def _translate(record: Record, args: argparse.Namespace) -> str:
+    info, seq = record
+    seq = seq.replace("T", "U")
+    table = config.CODON_TABLE
+    # codons with ambiguity bases are translated to X
+    peptide = "".join([table.get(seq[i: i + 3], "X") for i in range(args.frame - 1, len(seq) - 2, 3)])
+    if args.to_stop:
+        peptide = peptide.split("*", 1)[0]
+    return _fasta(info, peptide, args.line_width)
+
+
+def _revcomp(record: Record, args: argparse.Namespace) -> str:
+    info, seq = record
+    table = _complementTable(TYPES[args.type])
+    return _fasta(info, seq.encode("ascii").translate(table)[::-1].decode("ascii"), args.line_width)
+
+
+def _orf(record: Record, args: argparse.Namespace) -> str:
+    info, seq = record
+    sequence = TYPES[args.type](seq, info)
+    name = (info.split(maxsplit=1) or [""])[0]
+    if args.peptide:
+        results = [peptide.seq for peptide in sequence.transcript(args.topn)]
+    else:
+        results = sequence.getOrf(args.topn)
+    return "".join(_fasta(f"{name}_orf{i} {info}", result, args.line_width) for i, result in enumerate(results, 1))
+
+
+def _align(record: Record, args: argparse.Namespace) -> str:
+    info, seq = record
+    query = TYPES[args.type](seq)
+    name = (info.split(maxsplit=1) or [""])[0]
+    lines = []
+    for subject_name, subject in args.subjects:
+        alignment = query.align(subject, mode=1 if args.mode == "global" else 2, compact=True)
+        if alignment.score < args.min_score:
+            continue
+        lines.append(f"{name}\t{subject_name}\t{alignment.score:g}\t{alignment.identity:.4f}\t"
+                     f"{alignment.query_start}\t{alignment.query_end}\t"
+                     f"{alignment.subject_start}\t{alignment.subject_end}\t{alignment.cigar}\n")
+    return "".join(lines)
+
+
+def stats(args: argparse.Namespace) -> Iterator[str]:
+    yield "name\tlength\tweight\t" + ("pI" if TYPES[args.type] is Peptide else "gc") + "\n"
+    yield from _parallelMap(_stats, _records(args.input), args)
+
+
+def translate(args: argparse.Namespace) -> Iterator[str]:
+    return _parallelMap(_translate, _records(args.input), args)
+
+
+def revcomp(args: argparse.Namespace) -> Iterator[str]:
+    return _parallelMap(_revcomp, _records(args.input), args)
+
+
+def orf(args: argparse.Namespace) -> Iterator[str]:
+    return _parallelMap(_orf, _records(args.input), args)
+
+
+def align(args: argparse.Namespace) -> Iterator[str]:
+    args.subjects = [((info.split(maxsplit=1) or [""])[0], seq) for info, seq in _records([args.subject])]
+    yield "query\tsubject\tscore\tidentity\tquery_start\tquery_end\tsubject_start\tsubject_end\tcigar\n"
+    # aligners release GIL, so threads are enough and the subjects aren't copied to processes
+    yield from _parallelMap(_align, _records(args.input), args, processes=False)
+
+
+def fetch(args: argparse.Namespace) -> Iterator[str]:
+    from bioseq.utils import fetchENS, fetchNCBI
+
+    uids = args.uid or sys.stdin.read().split()
+    fetcher = fetchNCBI if args.source == "ncbi" else fetchENS
+    for sequence in fetcher(uids):
+        if sequence.seq:
+            yield _fasta(sequence.info, sequence.seq, args.line_width)
+
+
+def index(args: argparse.Namespace) -> Iterator[str]:
+    from bioseq.utils import indexFasta
+
+    for filename in args.input:
+        for record in indexFasta(filename):
+            yield f"{filename}\t{record.name}\t{record.length}\n"
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bioseq", description="Stream fasta records through sequence tools")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    inputs = argparse.ArgumentParser(add_help=False)
+    inputs.add_argument("input", nargs="*", default=["-"], help="fasta files, '-' or none for stdin")
+    workers = argparse.ArgumentParser(add_help=False)
+    workers.add_argument("-t", "--threads", type=int, default=1, help="number of workers, default is 1")
+    workers.add_argument("--batch-size", type=int, default=256, help="records sent to a worker at once")
+    fasta = argparse.ArgumentParser(add_help=False)
+    fasta.add_argument("-w", "--line-width", type=int, default=60, help="residues of each line, 0 for no wrap")
+
+    def seqType(parser: argparse.ArgumentParser, choices: Iterable[str], default: str = "dna"):
+        parser.add_argument("--type", choices=list(choices), default=default, help=f"type of records, default is {default}")
+
+    command = commands.add_parser("stats", parents=[inputs, workers],
+                                  help="length, weight and GC (nucleotide) or pI (protein) of each record as TSV")
+    seqType(command, TYPES)
+    command.set_defaults(func=stats)
+
+    command = commands.add_parser("translate", parents=[inputs, workers, fasta],
+                                  help="translate coding sequences to peptides by config.CODON_TABLE")
+    command.add_argument("--frame", type=int, choices=(1, 2, 3), default=1, help="reading frame, default is 1")
+    command.add_argument("--to-stop", action="store_true", help="stop at the first stop codon")
+    command.set_defaults(func=translate)
+
+    command = commands.add_parser("revcomp", parents=[inputs, workers, fasta],
+                                  help="reverse complement of each record")
+    seqType(command, ("dna", "rna"))
+    command.set_defaults(func=revcomp)
+
+    command = commands.add_parser("orf", parents=[inputs, workers, fasta],
+                                  help="longest open reading frames of each record")
+    seqType(command, ("dna", "rna"))
+    command.add_argument("-n", "--topn", type=int, default=1, help="number of orfs of each record, default is 1")
+    command.add_argument("--peptide", action="store_true", help="write the translated peptides instead")
+    command.set_defaults(func=orf)
+
+    command = commands.add_parser("align", parents=[workers],
+                                  help="align each query record to every subject record, write TSV")
+    command.add_argument("subject", help="fasta file of subjects")
+    command.add_argument("input", nargs="*", default=["-"], help="fasta files of queries, '-' or none for stdin")
+    seqType(command, TYPES)
+    command.add_argument("--mode", choices=("local", "global"), default="local", help="default is local")
+    command.add_argument("--min-score", type=float, default=float("-inf"), help="skip alignments scoring less")
+    command.set_defaults(func=align)
+
+    command = commands.add_parser("fetch", parents=[fasta], help="fetch sequences from NCBI or Ensembl")
+    command.add_argument("uid", nargs="*", help="ids to fetch, read from stdin if none")
+    command.add_argument("--source", choices=("ncbi", "ensembl"), default="ncbi", help="default is ncbi")
+    command.set_defaults(func=fetch)
+
+    command = commands.add_parser("index", help="write samtools compatible .fai index of fasta files")
+    command.add_argument("input", nargs="+", help="fasta files")
+    command.set_defaults(func=index)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a command, ``argv`` is ``sys.argv[1:]`` by default
+
+    Returns:
+        int: Exit status
+    """
+    args = _parser().parse_args(argv)
+    try:
+        for text in args.func(args):
+            sys.stdout.write(text)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader such as ``head`` exited, stop writing without traceback
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"bioseq {args.command}: {e}", file=sys.stderr)
+        return 1
+    return 0
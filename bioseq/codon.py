@@ -0,0 +1,159 @@
+"""Codon usage, RSCU and Codon Adaptation Index.
+
+Codons are counted in C to a 64-bin histogram indexed by codon code ``16 * b1 + 4 * b2 + b3``
+with A, C, G, T/U as 0 ~ 3, the order of ``CODONS``. Histograms of many sequences are merged by addition,
+so a transcriptome is counted in parallel by ``bioseq.utils.codonUsageFasta()``:
+
+>>> reference = codonUsageFasta("highly_expressed.fasta")
+>>> [cds.CAI(reference) for cds in loadFasta("cds.fasta", iterator=True)]
+
+Synonymous codons are grouped by ``config.CODON_TABLE``, so a changed genetic code is used after modified.
+"""
+from array import array
+from collections import defaultdict
+from itertools import product
+from math import exp, log
+from typing import Dict, Iterable, List, Mapping, Union
+
+from bioseq import algorithm, config
+
+#: 64 codons in the order of codon code
+CODONS = tuple("".join(codon) for codon in product("ACGU", repeat=3))
+_CODES = {codon: code for code, codon in enumerate(CODONS)}
+
+
+def _synonymousFamilies() -> List[List[int]]:
+    """
+    Codes of codons encoding each amino acid by ``config.CODON_TABLE``, stop codons excluded
+    """
+    families: Dict[str, List[int]] = defaultdict(list)
+    for codon, amino_acid in config.CODON_TABLE.items():
+        if amino_acid != "*" and codon in _CODES:
+            families[amino_acid].append(_CODES[codon])
+    return list(families.values())
+
+
+class CodonUsage:
+    """Counts of 64 codons of a sequence or many sequences, created by ``RNA.codonUsage()``,
+    ``CodonUsage.fromString()`` or ``bioseq.utils.codonUsageFasta()``
+    """
+    __slots__ = ("counts", "name")
+    #: count of each codon in the order of ``CODONS``, ``array("q")``
+    counts: array
+    name: str
+
+    def __init__(self, counts: Iterable[int] = (), name: str = ""):
+        self.counts = counts if isinstance(counts, array) else array("q", counts)
+        if not self.counts:
+            self.counts = array("q", bytes(8 * 64))
+        if len(self.counts) != 64:
+            raise ValueError("counts should have 64 items")
+        self.name = name
+
+    @classmethod
+    def fromString(cls, seq: str, name: str = "") -> "CodonUsage":
+        """Count in-frame codons from the first base of a coding sequence
+
+        Args:
+            seq(str): DNA or RNA sequence, case insensitive, codons with other bases are skipped
+            name(str): Name of usage
+        Returns:
+            CodonUsage: Codon counts of seq
+        """
+        counts = array("q")
+        counts.frombytes(algorithm.CodonCount(seq))
+        return cls(counts, name)
+
+    @property
+    def total(self) -> int:
+        """
+        Number of counted codons
+        """
+        return sum(self.counts)
+
+    def __getitem__(self, codon: str) -> int:
+        return self.counts[_CODES[codon.upper().replace("T", "U")]]
+
+    def __add__(self, other: "CodonUsage") -> "CodonUsage":
+        """
+        Merged usage of two sequence collections, with the name of this usage
+        """
+        return CodonUsage(array("q", map(int.__add__, self.counts, other.counts)), self.name)
+
+    def __iadd__(self, other: "CodonUsage") -> "CodonUsage":
+        for code, count in enumerate(other.counts):
+            self.counts[code] += count
+        return self
+
+    def frequency(self, per_thousand: bool = False) -> Dict[str, float]:
+        """Frequency of each codon in all counted codons
+
+        Args:
+            per_thousand(bool): Frequency per thousand codons like the Codon Usage Database, instead of fraction
+        Returns:
+            Dict[str, float]: Frequency of each codon
+        """
+        total = self.total or 1
+        scale = 1000 if per_thousand else 1
+        return {codon: count * scale / total for codon, count in zip(CODONS, self.counts)}
+
+    def rscu(self) -> Dict[str, float]:
+        """Relative Synonymous Codon Usage, count of codon divided by the average count of its synonymous codons.
+        1 means no bias, codons of absent amino acids and stop codons are 0
+
+        Returns:
+            Dict[str, float]: RSCU of each codon
+        """
+        rscu = dict.fromkeys(CODONS, 0.)
+        for family in _synonymousFamilies():
+            total = sum(self.counts[code] for code in family)
+            for code in family:
+                if total:
+                    rscu[CODONS[code]] = self.counts[code] * len(family) / total
+        return rscu
+
+    def weights(self, pseudo_count: float = 0.5) -> Dict[str, float]:
+        """Relative adaptiveness of each codon used by CAI, count of codon divided by the max count of its
+        synonymous codons. Stop codons and amino acids with only one codon are excluded
+
+        Args:
+            pseudo_count(float): Count of absent codons, so they aren't weighted zero
+        Returns:
+            Dict[str, float]: Weight of codons in multi-codon families
+        """
+        weights = {}
+        for family in _synonymousFamilies():
+            if len(family) < 2:
+                continue
+            counts = [self.counts[code] or pseudo_count for code in family]
+            for code, count in zip(family, counts):
+                weights[CODONS[code]] = count / max(counts)
+        return weights
+
+    def cai(self, reference: Union["CodonUsage", Mapping[str, float]]) -> float:
+        """Codon Adaptation Index, the geometric mean of the weights of counted codons.
+        Codons not in the weights or weighted 0, such as Met, Trp and stop codons, are skipped
+
+        Args:
+            reference(CodonUsage|Mapping[str, float]): Usage of highly expressed genes,
+                or the weights of codons like ``weights()``
+        Returns:
+            float: CAI from 0 to 1, 0 if no weighted codon is counted
+        """
+        if isinstance(reference, CodonUsage):
+            reference = reference.weights()
+        log_sum, counted = 0., 0
+        for codon, weight in reference.items():
+            count = self.counts[_CODES[codon.upper().replace("T", "U")]]
+            if count and weight > 0:
+                log_sum += count * log(weight)
+                counted += count
+        return exp(log_sum / counted) if counted else 0.
+
+    def __eq__(self, o: object) -> bool:
+        if not isinstance(o, CodonUsage):
+            return False
+        return self.counts == o.counts
+
+    def __repr__(self) -> str:
+        return f"CodonUsage(name={self.name!r}, codons={self.total})"
@@ -43,11 +43,15 @@ class AlignmentConfig:
         MISMATCH (float): score when meet a mismatch pair
         GAP_OPEN (float): score when open a gap
         GAP_EXTEND (float): score when extend a gap
+        CACHE (AlignmentCache): memoize results of ``Sequence.align()`` if set, see ``bioseq.cache``
+        MASK (str): residue never matching even itself, such as "N" of hard masked DNA, see ``bioseq.mask``
     """
     MATCH: float = 2
     MISMATCH: float = -3
     GAP_OPEN: float = -3
     GAP_EXTEND: float = -3
+    CACHE: Optional[Any] = None
+    MASK: str = ""
 
 ############################### Molecular Weight ################################
 
@@ -67,9 +71,18 @@ MW: Dict = {
 
 ############################## Nuclear Acid Info ################################
 #: :meta hide-value: Complementary table of nucleic acid, include "DNA_COMPLEMENT", "RNA_COMPLEMENT".
+#: | Include IUPAC ambiguity codes, lower case is complemented to lower case.
 NC_INFO: Dict = {
-    "DNA_COMPLEMENT": {"A": "T", "C": "G", "G": "C", "T": "A", },
-    "RNA_COMPLEMENT": {"A": "U", "C": "G", "G": "C", "U": "A", }
+    "DNA_COMPLEMENT": {
+        "A": "T", "C": "G", "G": "C", "T": "A",
+        "R": "Y", "Y": "R", "S": "S", "W": "W", "K": "M", "M": "K",
+        "B": "V", "V": "B", "D": "H", "H": "D", "N": "N",
+    },
+    "RNA_COMPLEMENT": {
+        "A": "U", "C": "G", "G": "C", "U": "A",
+        "R": "Y", "Y": "R", "S": "S", "W": "W", "K": "M", "M": "K",
+        "B": "V", "V": "B", "D": "H", "H": "D", "N": "N",
+    },
 }
 
 ################################# Peptide Info ##################################
@@ -82,6 +95,31 @@ HYDROPATHY = {
     "M": 1.9, "N": -3.5, "P": -1.6, "Q": -3.5, "R": -4.5,
     "S": -0.8, "T": -0.7, "V": 4.2, "W": -0.9, "Y": -1.3,
 }
+#: :meta hide-value: | Hydropathy scales can be chosen in ``Peptide.getHphob()``, "KD" is ``HYDROPATHY``
+#: | "HW": Hopp T.P., Woods K.R. Proc. Natl. Acad. Sci. U.S.A. 78:3824-3828(1981), the higher, the more hydrophilic
+#: | "Eisenberg": Eisenberg D., et al. J. Mol. Biol. 179:125-142(1984), normalized consensus
+#: | "GES": Engelman D.M., Steitz T.A., Goldman A. Annu. Rev. Biophys. Biophys. Chem. 15:321-353(1986)
+HYDROPATHY_SCALES: Dict[str, Dict[str, float]] = {
+    "KD": HYDROPATHY,
+    "HW": {
+        "A": -0.5, "C": -1.0, "D": 3.0, "E": 3.0, "F": -2.5,
+        "G": 0.0, "H": -0.5, "I": -1.8, "K": 3.0, "L": -1.8,
+        "M": -1.3, "N": 0.2, "P": 0.0, "Q": 0.2, "R": 3.0,
+        "S": 0.3, "T": -0.4, "V": -1.5, "W": -3.4, "Y": -2.3,
+    },
+    "Eisenberg": {
+        "A": 0.62, "C": 0.29, "D": -0.90, "E": -0.74, "F": 1.19,
+        "G": 0.48, "H": -0.40, "I": 1.38, "K": -1.50, "L": 1.06,
+        "M": 0.64, "N": -0.78, "P": 0.12, "Q": -0.85, "R": -2.53,
+        "S": -0.18, "T": -0.05, "V": 1.08, "W": 0.81, "Y": 0.26,
+    },
+    "GES": {
+        "A": 1.6, "C": 2.0, "D": -9.2, "E": -8.2, "F": 3.7,
+        "G": 1.0, "H": -3.0, "I": 3.1, "K": -8.8, "L": 2.8,
+        "M": 3.4, "N": -4.8, "P": -0.2, "Q": -4.1, "R": -12.3,
+        "S": 0.6, "T": 1.2, "V": 2.6, "W": 1.9, "Y": -0.7,
+    },
+}
 #: :meta hide-value: | pK value of charged amino acids.
 #: | reference ``biopython.SeqUtils.IsoelectricPoint``, Value from EMBOSS Database
 PK = {
@@ -89,3 +127,29 @@ PK = {
     "pos_pK": {"K": 10.8, "R": 12.5, "H": 6.5},
     "neg_pK": {"D": 3.9, "E": 4.1, "C": 8.5, "Y": 10.1}
 }
+
+############################### Protease Digestion ###############################
+#: :meta hide-value: | Cleavage rule of proteases, zero width regular expression matching each cleavage site.
+#: | reference ExPASy PeptideCutter, simplified to the common rules
+ENZYMES: Dict[str, str] = {
+    "trypsin": r"(?<=[KR])(?!P)",
+    "trypsin/p": r"(?<=[KR])",
+    "lys-c": r"(?<=K)",
+    "arg-c": r"(?<=R)(?!P)",
+    "asp-n": r"(?=D)",
+    "glu-c": r"(?<=E)",
+    "chymotrypsin": r"(?<=[FWY])(?!P)",
+    "pepsin": r"(?<=[FL])",
+}
+#: :meta hide-value: | Monoisotopic mass of amino acid residues, used by mass of digested peptides.
+#: | Peptide mass is the sum of residues plus a water (18.010565)
+MONOISOTOPIC_MASS: Dict[str, float] = {
+    "A": 71.03711, "C": 103.00919, "D": 115.02694, "E": 129.04259, "F": 147.06841,
+    "G": 57.02146, "H": 137.05891, "I": 113.08406, "K": 128.09496, "L": 113.08406,
+    "M": 131.04049, "N": 114.04293, "P": 97.05276, "Q": 128.05858, "R": 156.10111,
+    "S": 87.03203, "T": 101.04768, "V": 99.06841, "W": 186.07931, "Y": 163.06333,
+}
+
+############################### Low Complexity Masking ###############################
+#: Character replacing residues of low complexity regions in hard masking, see ``bioseq.mask``
+MASK_CHAR: Dict[str, str] = {"DNA": "N", "RNA": "N", "Peptide": "X"}
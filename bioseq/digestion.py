@@ -0,0 +1,278 @@
+"""In-silico protease digestion and a peptide mass index for mass spectrometry lookups.
+
+Fragment masses are differences of the prefix sums of residue masses of each protein,
+so no fragment is summed residue by residue. All fragments of a proteome are kept in arrays sorted by mass,
+a tolerance window is found by binary search.
+
+>>> index = PeptideMassIndex.fromFasta("proteome.fasta", missed_cleavages=2)
+>>> index.save("proteome.pmi")
+>>> with PeptideMassIndex.load("proteome.pmi") as index:
+...     index.lookup(1234.567, ppm=10)
+"""
+import re
+import struct
+
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from bioseq import config
+from bioseq._sequence import Sequence
+from bioseq.io import _MappedFile, _packNames, _textsAndNames, _writeSections
+
+#: Mass of a water of each mass type, average is the same as ``Sequence.weight``
+WATER = {"monoisotopic": 18.010565, "average": 18.}
+
+_MAGIC = b"BSQPMI01"
+# magic, fragment num, protein num, length of proteins text, length of names blob
+_HEADER = struct.Struct("<8sQQQQ")
+# proteins are digested by chunks in parallel
+_CHUNK = 1000
+
+
+@lru_cache(maxsize=None)
+def _enzyme(enzyme: str) -> "re.Pattern":
+    """
+    Compiled cleavage rule of enzyme in ``config.ENZYMES``, or enzyme itself as a regular expression
+    """
+    return re.compile(config.ENZYMES.get(enzyme.lower(), enzyme))
+
+
+def _residueMasses(mass_type: str) -> Dict[str, float]:
+    """
+    Residue mass of each amino acid, average is derived from ``config.MW`` to agree with ``Peptide.weight``
+    """
+    if mass_type == "monoisotopic":
+        return config.MONOISOTOPIC_MASS
+    if mass_type == "average":
+        return {residue: weight - WATER["average"] for residue, weight in config.MW["Peptide"].items()}
+    raise ValueError("mass_type should be 'monoisotopic' or 'average'")
+
+
+def cleavageSites(seq: str, enzyme: str = "trypsin") -> List[int]:
+    """Boundaries of fully cleaved fragments
+
+    Args:
+        seq(str): Protein sequence
+        enzyme(str): Name in ``config.ENZYMES`` or a zero width regular expression of cleavage site
+    Returns:
+        List[int]: Sorted positions, start with 0 and end with the length of seq
+    """
+    sites = [0]
+    sites.extend(match.start() for match in _enzyme(enzyme).finditer(seq) if 0 < match.start() < len(seq))
+    if seq:
+        sites.append(len(seq))
+    return sites
+
+
+def fragments(seq: str,
+              enzyme: str = "trypsin",
+              missed_cleavages: int = 2,
+              min_length: int = 1,
+              max_length: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """Digest a protein, yield fragments with up to missed_cleavages sites inside
+
+    Args:
+        seq(str): Protein sequence
+        enzyme(str): Name in ``config.ENZYMES`` or a zero width regular expression of cleavage site
+        missed_cleavages(int): Max number of cleavage sites inside a fragment
+        min_length(int): Min length of fragments
+        max_length(int): Max length of fragments, default is unlimited
+    Returns:
+        Iterator[Tuple[int, int]]: (start, end) of each fragment, ordered by start then end
+    """
+    sites = cleavageSites(seq, enzyme)
+    for i, start in enumerate(sites[:-1]):
+        for end in sites[i + 1: i + missed_cleavages + 2]:
+            if max_length is not None and end - start > max_length:
+                break
+            if end - start >= min_length:
+                yield start, end
+
+
+def _digest(proteins: List[str], first: int, enzyme: str, missed_cleavages: int,
+            min_length: int, max_length: Optional[int], mass_type: str) -> Tuple[array, array, array, array]:
+    """
+    Fragments of proteins with known residues, return masses, protein indices from first, starts and ends
+    """
+    table, water = _residueMasses(mass_type), WATER[mass_type]
+    masses, owners, starts, ends = array("d"), array("I"), array("I"), array("I")
+    for index, seq in enumerate(proteins, first):
+        prefix = list(accumulate((table.get(residue, 0.) for residue in seq), initial=0.))
+        # fragments over unknown residues such as X have no mass
+        unknown = list(accumulate((residue not in table for residue in seq), initial=0))
+        for start, end in fragments(seq, enzyme, missed_cleavages, min_length, max_length):
+            if unknown[end] == unknown[start]:
+                masses.append(prefix[end] - prefix[start] + water)
+                owners.append(index)
+                starts.append(start)
+                ends.append(end)
+    return masses, owners, starts, ends
+
+
+def _digestChunk(args: tuple) -> Tuple[array, array, array, array]:
+    return _digest(*args)
+
+
+class PeptideHit(NamedTuple):
+    mass: float
+    #: index of protein in the index
+    protein: int
+    name: str
+    start: int
+    end: int
+    sequence: str
+
+
+class PeptideMassIndex(_MappedFile):
+    """Masses of all digested fragments of a proteome sorted in arrays, answer tolerance window lookups in O(log n).
+    Save it by ``save()`` and open it later by ``load()``, the loaded index is memory-mapped,
+    so processes loading the same file share one copy in page cache.
+    """
+    names: List[str]
+    _MAPPED = ("_masses", "_proteins", "_starts", "_ends", "_offsets", "_text")
+
+    def __init__(self,
+                 proteins: Iterable[Union[str, Sequence]],
+                 names: Optional[Iterable[str]] = None,
+                 enzyme: str = "trypsin",
+                 missed_cleavages: int = 2,
+                 min_length: int = 6,
+                 max_length: Optional[int] = 50,
+                 mass_type: str = "monoisotopic",
+                 workers: Optional[int] = 1):
+        """Digest proteins and build index
+
+        Args:
+            proteins(Iterable[str|Sequence]): Protein sequences
+            names(Iterable[str]): Name of each protein, default is ``info`` of Sequence or ""
+            enzyme(str): Name in ``config.ENZYMES`` or a zero width regular expression of cleavage site
+            missed_cleavages(int): Max number of cleavage sites inside a fragment
+            min_length(int): Min length of fragments
+            max_length(int): Max length of fragments, None is unlimited
+            mass_type(str): "monoisotopic" by ``config.MONOISOTOPIC_MASS`` or "average" by ``config.MW``
+            workers(int): Number of processes, None is the number of CPUs, 1 digests in this process
+        """
+        texts, self.names = _textsAndNames(proteins, names, "Protein")
+        _residueMasses(mass_type)
+
+        tasks = [(texts[i: i + _CHUNK], i, enzyme, missed_cleavages, min_length, max_length, mass_type)
+                 for i in range(0, len(texts), _CHUNK)]
+        if workers == 1:
+            parts = list(map(_digestChunk, tasks))
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                parts = list(executor.map(_digestChunk, tasks))
+
+        masses, owners, starts, ends = array("d"), array("I"), array("I"), array("I")
+        for part in parts:
+            for column, values in zip((masses, owners, starts, ends), part):
+                column.extend(values)
+        order = sorted(range(len(masses)), key=masses.__getitem__)
+        self._masses = array("d", [masses[i] for i in order])
+        self._proteins = array("I", [owners[i] for i in order])
+        self._starts = array("I", [starts[i] for i in order])
+        self._ends = array("I", [ends[i] for i in order])
+
+        self._offsets = array("Q", accumulate(map(len, texts), initial=0))
+        self._text = "".join(texts).encode("ascii")
+
+    @classmethod
+    def fromFasta(cls, filename: str, **kwargs) -> "PeptideMassIndex":
+        """Build index from all records of a fasta file, each protein's name is its info line
+
+        Args:
+            filename(str): the fasta file's name
+            kwargs: Options of ``PeptideMassIndex()``
+        Returns:
+            PeptideMassIndex: Index of the fasta file
+        """
+        from bioseq.utils import loadFasta
+
+        return cls(loadFasta(filename, iterator=True), **kwargs)
+
+    @property
+    def masses(self) -> array:
+        """
+        Sorted masses of all fragments
+        """
+        return self._masses
+
+    def _hit(self, i: int) -> PeptideHit:
+        protein, start, end = self._proteins[i], self._starts[i], self._ends[i]
+        offset = self._offsets[protein]
+        return PeptideHit(self._masses[i], protein, self.names[protein], start, end,
+                          str(self._text[offset + start: offset + end], "ascii"))
+
+    def _window(self, mass: float, tolerance: float, ppm: Optional[float]) -> range:
+        if ppm is not None:
+            tolerance = mass * ppm * 1e-6
+        return range(bisect_left(self._masses, mass - tolerance), bisect_right(self._masses, mass + tolerance))
+
+    def count(self, mass: float, tolerance: float = 0.02, ppm: Optional[float] = None) -> int:
+        """
+        Number of fragments within the tolerance window of mass, see ``lookup()``
+        """
+        return len(self._window(mass, tolerance, ppm))
+
+    def lookup(self, mass: float, tolerance: float = 0.02, ppm: Optional[float] = None) -> List[PeptideHit]:
+        """Find fragments whose mass is within the tolerance window of mass
+
+        Args:
+            mass(float): Observed mass of neutral peptide
+            tolerance(float): Absolute tolerance in Dalton
+            ppm(float): Relative tolerance in parts per million, used instead of tolerance if given
+        Returns:
+            List[PeptideHit]: Fragments sorted by mass
+        """
+        return [self._hit(i) for i in self._window(mass, tolerance, ppm)]
+
+    def lookupMany(self, masses: Iterable[float], tolerance: float = 0.02,
+                   ppm: Optional[float] = None) -> List[List[PeptideHit]]:
+        """
+        ``lookup()`` of each mass
+        """
+        return [self.lookup(mass, tolerance, ppm) for mass in masses]
+
+    def save(self, filename: str):
+        """Save index to a binary file, which can be memory-mapped by ``PeptideMassIndex.load()``
+
+        Args:
+            filename(str): the index file's name
+        """
+        name_offsets, name_blob = _packNames(self.names)
+        sections = [self._masses, self._proteins, self._starts, self._ends,
+                    self._offsets, name_offsets, name_blob, self._text]
+        with open(filename, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(self._masses), len(self.names), len(self._text), len(name_blob)))
+            _writeSections(f, sections)
+
+    @classmethod
+    def load(cls, filename: str) -> "PeptideMassIndex":
+        """Memory-map an index file saved by ``PeptideMassIndex.save()``
+
+        Args:
+            filename(str): the index file's name
+        Returns:
+            PeptideMassIndex: The index whose arrays are read from disk on demand
+        """
+        # length of names blob in header is the same as the last name offset
+        index, sections, (fragment_num, protein_num, text_length, _) = \
+            cls._map(filename, _HEADER, _MAGIC, "peptide mass index")
+        index._masses = sections.read(8 * fragment_num).cast("d")
+        index._proteins = sections.read(4 * fragment_num).cast("I")
+        index._starts = sections.read(4 * fragment_num).cast("I")
+        index._ends = sections.read(4 * fragment_num).cast("I")
+        index._offsets = sections.read(8 * (protein_num + 1)).cast("Q")
+        index.names = sections.names(protein_num)
+        index._text = sections.read(text_length)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._masses)
+
+    def __repr__(self) -> str:
+        return f"PeptideMassIndex({len(self)} fragments of {len(self.names)} proteins)"
@@ -0,0 +1,157 @@
+from typing import Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+from bioseq._sequence import DNA, RNA, Peptide, Sequence
+
+
+class _Frozen:
+    """
+    Mixin to make sequence immutable and hashable, the hash only depends on sequence
+    """
+    __slots__ = ()
+    _seq: str
+
+    def mutation(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} is immutable, use mutable type to mutate it")
+
+    def edit(self):
+        raise TypeError(f"{self.__class__.__name__} is immutable, use mutable type to edit it")
+
+    def freeze(self):
+        return self
+
+    def __hash__(self) -> int:
+        # same as the hash of str, which is cached by str itself
+        return hash(self._seq)
+
+
+class FrozenSequence(_Frozen, Sequence):
+    """
+    Immutable and hashable ``Sequence``
+    """
+    __slots__ = ()
+
+
+class FrozenPeptide(_Frozen, Peptide):
+    """
+    Immutable and hashable ``Peptide``
+    """
+    __slots__ = ()
+
+
+class FrozenRNA(_Frozen, RNA):
+    """
+    Immutable and hashable ``RNA``
+    """
+    __slots__ = ()
+
+    def getOrf(self, topn: int = 1, replace: bool = False) -> List[str]:
+        if replace:
+            raise TypeError(f"{self.__class__.__name__} is immutable, can't replace by orf")
+        return super().getOrf(topn)
+
+
+class FrozenDNA(_Frozen, DNA):
+    """
+    Immutable and hashable ``DNA``
+    """
+    __slots__ = ()
+
+    def getOrf(self, topn: int = 1, replace: bool = False) -> List[str]:
+        if replace:
+            raise TypeError(f"{self.__class__.__name__} is immutable, can't replace by orf")
+        return super().getOrf(topn)
+
+
+_FROZEN_TYPES: Dict[type, type] = {
+    DNA: FrozenDNA, RNA: FrozenRNA, Peptide: FrozenPeptide, Sequence: FrozenSequence,
+}
+
+
+def _frozenType(seq_type: type) -> type:
+    """
+    Frozen type of the nearest base type in ``_FROZEN_TYPES``
+    """
+    for cls in seq_type.__mro__:
+        if cls in _FROZEN_TYPES:
+            return _FROZEN_TYPES[cls]
+    raise TypeError(f"{seq_type.__name__} is not a Sequence")
+
+
+def freeze(seq: Sequence) -> Sequence:
+    """Convert a sequence to the immutable type, same as ``Sequence.freeze()``
+
+    Args:
+        seq(Sequence): Sequence to be frozen
+    Returns:
+        FrozenSequence | FrozenDNA | FrozenRNA | FrozenPeptide: Frozen sequence share the string with seq
+    """
+    if isinstance(seq, _Frozen):
+        return seq
+    return _frozenType(type(seq))(seq.seq, seq.info)
+
+
+class InternPool:
+    """Pool of frozen sequences, identical sequences of same type are interned to one instance,
+    so they share the storage and the cached properties such as ``composition``, ``weight`` and ``pI``.
+    The ``info`` of interned instance is the first seen one, all infos can be found by ``headers()``
+    """
+
+    def __init__(self, keep_headers: bool = True):
+        """
+        Args:
+            keep_headers(bool): Whether to keep the info of each duplicated sequence
+        """
+        self.keep_headers = keep_headers
+        self._pool: Dict[Tuple[type, str], Sequence] = {}
+        self._headers: Dict[Tuple[type, str], List[str]] = {}
+
+    def intern(self, seq: Union[str, Sequence], seq_type: Type[Sequence] = Sequence) -> Sequence:
+        """Get the interned instance of seq, seq is added to pool if it has not been seen
+
+        Args:
+            seq(str|Sequence): Sequence to be interned
+            seq_type(Type[Sequence]): Type of sequence when seq is a str
+        Returns:
+            Sequence: Frozen sequence in the pool
+        """
+        if isinstance(seq, str):
+            seq = seq_type(seq)
+        key = (_frozenType(type(seq)), seq.seq)
+        interned = self._pool.get(key)
+        if interned is None:
+            interned = self._pool[key] = freeze(seq)
+            if self.keep_headers:
+                self._headers[key] = [seq.info]
+        elif self.keep_headers:
+            self._headers[key].append(seq.info)
+        return interned
+
+    def dedup(self, sequences: Iterable[Union[str, Sequence]]) -> Iterator[Sequence]:
+        """Yield each distinct sequence at its first appearance, such as the records from
+        ``loadFasta(filename, iterator=True)``
+
+        Args:
+            sequences(Iterable[str|Sequence]): Sequences to be deduplicated
+        Returns:
+            Iterator[Sequence]: Frozen sequences not seen before
+        """
+        for seq in sequences:
+            size = len(self._pool)
+            interned = self.intern(seq)
+            if len(self._pool) > size:
+                yield interned
+
+    def headers(self, seq: Sequence) -> List[str]:
+        """
+        All infos of the sequences interned to seq, in the order of interning
+        """
+        return self._headers.get((_frozenType(type(seq)), seq.seq), [])
+
+    def __contains__(self, seq: Sequence) -> bool:
+        return (_frozenType(type(seq)), seq.seq) in self._pool
+
+    def __iter__(self) -> Iterator[Sequence]:
+        return iter(self._pool.values())
+
+    def __len__(self) -> int:
+        return len(self._pool)
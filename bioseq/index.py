@@ -0,0 +1,198 @@
+import struct
+
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Tuple, Union
+
+from bioseq import algorithm
+from bioseq._sequence import Sequence
+from bioseq.io import _MappedFile, _packNames, _textsAndNames, _writeSections
+
+_MAGIC = b"BSQIDX01"
+# magic, text length, record num, occurrence checkpoint step, alphabet size
+_HEADER = struct.Struct("<8sIIII")
+_SENTINEL = b"\x00"
+_SEPARATOR = b"\x01"
+
+
+class SequenceIndex(_MappedFile):
+    """FM-index of one or more sequences, answer ``count()`` and ``locate()`` in O(pattern length).
+
+    The index is built from the suffix array of all sequences joined by a separator,
+    so a match never spans two records. Save it by ``save()`` and open it later by ``load()``,
+    the loaded index is memory-mapped so the build cost only paid once per reference.
+    """
+    names: List[str]
+    _MAPPED = ("_C", "_starts", "_bwt", "_occ", "_sa")
+
+    def __init__(self,
+                 sequences: Iterable[Union[str, Sequence]],
+                 names: Optional[Iterable[str]] = None,
+                 step: int = 64):
+        """Build index from sequences
+
+        Args:
+            sequences(Iterable[str|Sequence]): Sequences to be indexed
+            names(Iterable[str]): Name of each sequence, default is ``info`` of Sequence or ""
+            step(int): Interval of occurrence checkpoints, smaller is faster but larger
+        """
+        texts, self.names = _textsAndNames(sequences, names)
+        starts, position = array("I"), 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+        text = _SEPARATOR.join(t.encode("ascii") for t in texts) + _SENTINEL
+        sa, bwt = algorithm.SuffixArray(text)
+
+        self._step = step
+        self._starts = starts
+        self._sa = array("i")
+        self._sa.frombytes(sa)
+        self._bwt = bwt
+        self._alphabet = bytes(sorted(set(bwt)))
+        self._buildTables(text)
+
+    @classmethod
+    def fromFasta(cls, filename: str, step: int = 64) -> "SequenceIndex":
+        """Build index from all records of a fasta file, each record's name is its info line
+
+        Args:
+            filename(str): the fasta file's name
+            step(int): Interval of occurrence checkpoints
+        Returns:
+            SequenceIndex: Index of the fasta file
+        """
+        from bioseq.utils import loadFasta
+
+        return cls(loadFasta(filename, iterator=True), step=step)
+
+    def _buildTables(self, text: bytes):
+        """
+        Build the first column table ``C`` and occurrence checkpoints from bwt
+        """
+        self._symbol = [-1] * 256
+        for i, char in enumerate(self._alphabet):
+            self._symbol[char] = i
+
+        self._C = array("I")
+        total = 0
+        for char in self._alphabet:
+            self._C.append(total)
+            total += text.count(char)
+
+        # occ[j * sigma + s]: the appearance times of alphabet[s] in bwt[:j * step]
+        self._occ = array("I", bytes(4 * len(self._alphabet)))
+        running = [0] * len(self._alphabet)
+        for start in range(0, len(self._bwt), self._step):
+            block = self._bwt[start: start + self._step]
+            for i, char in enumerate(self._alphabet):
+                running[i] += block.count(char)
+            self._occ.extend(running)
+
+    def _rank(self, symbol: int, index: int) -> int:
+        """
+        Appearance times of alphabet[symbol] in bwt[:index]
+        """
+        checkpoint = index // self._step
+        start = checkpoint * self._step
+        return self._occ[checkpoint * len(self._alphabet) + symbol] + \
+            bytes(self._bwt[start: index]).count(self._alphabet[symbol])
+
+    def _range(self, pattern: Union[str, Sequence]) -> Tuple[int, int]:
+        """
+        Backward search the pattern, return the range of suffix array start with pattern,
+        empty pattern matches nothing rather than every suffix include separators
+        """
+        if isinstance(pattern, Sequence):
+            pattern = pattern.seq
+        elif not isinstance(pattern, str):
+            raise TypeError("Pattern should be str or Sequence")
+        if not pattern:
+            return 0, 0
+
+        start, end = 0, len(self._bwt)
+        for char in reversed(pattern.upper().encode("ascii")):
+            symbol = self._symbol[char] if char > _SEPARATOR[0] else -1
+            if symbol < 0:
+                return 0, 0
+            start = self._C[symbol] + self._rank(symbol, start)
+            end = self._C[symbol] + self._rank(symbol, end)
+            if start >= end:
+                return 0, 0
+        return start, end
+
+    def count(self, pattern: Union[str, Sequence]) -> int:
+        """Count the appearance times of pattern in all sequences, include the overlapped
+
+        Args:
+            pattern(str|Sequence): Pattern to be searched
+        Returns:
+            int: Appearance times
+        """
+        start, end = self._range(pattern)
+        return end - start
+
+    def locate(self, pattern: Union[str, Sequence]) -> List[Tuple[int, int]]:
+        """Find all positions of pattern, include the overlapped
+
+        Args:
+            pattern(str|Sequence): Pattern to be searched
+        Returns:
+            List[Tuple[int, int]]: Sorted (record index, position in record) of each appearance
+        """
+        start, end = self._range(pattern)
+        result = []
+        for position in sorted(self._sa[start: end]):
+            record = bisect_right(self._starts, position) - 1
+            result.append((record, position - self._starts[record]))
+        return result
+
+    def find(self, pattern: Union[str, Sequence], record: int = 0) -> List[int]:
+        """Find all positions of pattern in one record, like ``Sequence.find()`` but include the overlapped
+
+        Args:
+            pattern(str|Sequence): Pattern to be searched
+            record(int): Index of record
+        Returns:
+            List[int]: Sorted positions of pattern in the record
+        """
+        return [position for i, position in self.locate(pattern) if i == record]
+
+    def save(self, filename: str):
+        """Save index to a binary file, which can be memory-mapped by ``SequenceIndex.load()``
+
+        Args:
+            filename(str): the index file's name
+        """
+        sections = [self._alphabet, self._C, self._starts, *_packNames(self.names, "I"),
+                    self._bwt, self._occ, self._sa]
+        with open(filename, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(self._bwt), len(self.names),
+                                 self._step, len(self._alphabet)))
+            _writeSections(f, sections)
+
+    @classmethod
+    def load(cls, filename: str) -> "SequenceIndex":
+        """Memory-map an index file saved by ``SequenceIndex.save()``
+
+        Args:
+            filename(str): the index file's name
+        Returns:
+            SequenceIndex: The index whose tables are read from disk on demand
+        """
+        index, sections, (length, records, step, sigma) = cls._map(filename, _HEADER, _MAGIC, "sequence index")
+        index._step = step
+        index._alphabet = bytes(sections.read(sigma))
+        index._C = sections.read(4 * sigma).cast("I")
+        index._starts = sections.read(4 * records).cast("I")
+        index.names = sections.names(records, "I")
+        index._bwt = sections.read(length)
+        index._occ = sections.read(4 * sigma * (-(-length // step) + 1)).cast("I")
+        index._sa = sections.read(4 * length).cast("i")
+        index._symbol = [-1] * 256
+        for i, char in enumerate(index._alphabet):
+            index._symbol[char] = i
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
@@ -0,0 +1,338 @@
+import mmap
+import struct
+
+from array import array
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union
+
+from bioseq import algorithm, metrics
+from bioseq._sequence import DNA, RNA, Peptide, Sequence
+
+_MAGIC = b"BSQBIN01"
+# magic, record num, offset of info blob, offset of record table
+_HEADER = struct.Struct("<8sQQQ")
+#: Type code of each record, subclass is saved as its nearest base type
+_TYPES = (Sequence, DNA, RNA, Peptide)
+_RAW, _PACKED = 0, 1
+
+#: Bases of 2-bit code 0, 1, 2, 3 for packed nucleotides
+_ALPHABET = {"DNA": b"ACGT", "RNA": b"ACGU"}
+
+
+def _padding(size: int) -> int:
+    """
+    Padding bytes to align the next section to 8 bytes
+    """
+    return -size % 8
+
+
+def _textsAndNames(sequences: Iterable[Union[str, Sequence]],
+                   names: Optional[Iterable[str]] = None,
+                   kind: str = "Sequence") -> Tuple[List[str], List[str]]:
+    """
+    Upper case text and name of each sequence to be indexed, the name is ``info`` of Sequence or "" by default,
+    kind is the word of sequences in error messages
+    """
+    texts, default_names = [], []
+    for seq in sequences:
+        if isinstance(seq, Sequence):
+            texts.append(seq.seq)
+            default_names.append(seq.info)
+        elif isinstance(seq, str):
+            texts.append(seq.upper())
+            default_names.append("")
+        else:
+            raise TypeError(f"{kind} should be str or Sequence")
+    if names is None:
+        return texts, default_names
+    names = list(names)
+    if len(names) != len(texts):
+        raise ValueError(f"The number of names is not equal to {kind.lower()}s")
+    return texts, names
+
+
+def _packNames(names: List[str], typecode: str = "Q") -> List[bytes]:
+    """
+    Sections of names: offsets of each name in the blob, then the blob of utf8 names
+    """
+    encoded = [name.encode("utf8") for name in names]
+    offsets, offset = array(typecode, [0]), 0
+    for name in encoded:
+        offset += len(name)
+        offsets.append(offset)
+    return [offsets.tobytes(), b"".join(encoded)]
+
+
+def _writeSections(f: BinaryIO, sections: Iterable[Any]):
+    """
+    Write each section followed by padding, a section is any object supporting the buffer protocol
+    """
+    for section in sections:
+        section = bytes(section)
+        f.write(section)
+        f.write(bytes(_padding(len(section))))
+
+
+class _SectionReader:
+    """
+    Read sections written by ``_writeSections()`` one by one, as memoryview of the buffer without copy
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], offset: int):
+        self._view = memoryview(buffer)
+        self._offset = offset
+
+    def read(self, size: int) -> memoryview:
+        data = self._view[self._offset: self._offset + size]
+        self._offset += size + _padding(size)
+        return data
+
+    def names(self, records: int, typecode: str = "Q") -> List[str]:
+        """
+        Names of records from the sections written by ``_packNames()``
+        """
+        offsets = self.read(array(typecode).itemsize * (records + 1)).cast(typecode)
+        blob = bytes(self.read(offsets[-1]))
+        names = [blob[offsets[i]: offsets[i + 1]].decode("utf8") for i in range(records)]
+        offsets.release()
+        return names
+
+
+M = TypeVar("M", bound="_MappedFile")
+
+
+class _MappedFile:
+    """
+    Base of binary files and indexes which can be memory-mapped by ``load()``, the file is released by ``close()``
+    or at the end of ``with`` statement. Subclass lists attributes of memoryview on the file in ``_MAPPED``
+    """
+    _MAPPED: Tuple[str, ...] = ()
+    _mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def _map(cls: Type[M], filename: str, header: struct.Struct, magic: bytes,
+             description: str) -> Tuple[M, _SectionReader, tuple]:
+        """
+        Memory-map filename and check the magic, return an instance without ``__init__()``,
+        reader of sections after header, and the other fields of header
+        """
+        with open(filename, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        fields = header.unpack_from(buffer) if len(buffer) >= header.size else (b"",)
+        if fields[0] != magic:
+            buffer.close()
+            raise ValueError(f"{filename} is not a {description} file")
+        instance = cls.__new__(cls)
+        instance._mmap = buffer
+        return instance, _SectionReader(buffer, header.size), fields[1:]
+
+    def close(self):
+        """
+        Release the memory-mapped file if loaded from disk
+        """
+        if self._mmap is not None:
+            for attr in self._MAPPED:
+                getattr(self, attr).release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self: M) -> M:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _typeCode(seq: Sequence) -> int:
+    """
+    Index of the nearest base type of seq in ``_TYPES``
+    """
+    for cls in type(seq).__mro__:
+        if cls in _TYPES:
+            return _TYPES.index(cls)
+    raise TypeError(f"{seq.__class__.__name__} is not a Sequence")
+
+
+def save(sequences: Iterable[Sequence], filename: str, pack: bool = True) -> int:
+    """Save sequences to a binary file, which can be opened by ``bioseq.io.load()`` without parsing
+
+    Args:
+        sequences(Iterable[Sequence]): Sequences to be saved, can be an iterator of large file
+        filename(str): the binary file's name
+        pack(bool): Pack DNA and RNA only consisted of 4 bases to 2 bits per base
+    Returns:
+        int: The number of saved records
+    """
+    with open(filename, "wb") as f:
+        records = write(sequences, f, pack)
+        if metrics.ENABLED:
+            metrics.inc("bioseq_io_bytes_total", f.tell(), op="save")
+    return records
+
+
+def write(sequences: Iterable[Sequence], f: BinaryIO, pack: bool = True) -> int:
+    """Write sequences to a seekable binary stream in the format of ``bioseq.io.save()``,
+    such as ``io.BytesIO``
+
+    Args:
+        sequences(Iterable[Sequence]): Sequences to be written
+        f(BinaryIO): Seekable stream, the format starts from its current position
+        pack(bool): Pack DNA and RNA only consisted of 4 bases to 2 bits per base
+    Returns:
+        int: The number of written records, the stream is at the end of format after writing
+    """
+    types, encodings = array("B"), array("B")
+    lengths, data_offsets, info_offsets = array("Q"), array("Q", [0]), array("Q", [0])
+    infos = bytearray()
+
+    start = f.tell()
+    f.write(bytes(_HEADER.size))
+    for seq in sequences:
+        if not isinstance(seq, Sequence):
+            raise TypeError("Only Sequence can be saved")
+        code = _typeCode(seq)
+        type_name = _TYPES[code].__name__
+        data, encoding = seq.seq.encode("ascii"), _RAW
+        if pack and type_name in _ALPHABET:
+            try:
+                data, encoding = algorithm.PackBases(seq.seq, _ALPHABET[type_name]), _PACKED
+            except ValueError:
+                pass    # has base not in alphabet, such as N
+
+        f.write(data)
+        types.append(code)
+        encodings.append(encoding)
+        lengths.append(seq.length)
+        data_offsets.append(data_offsets[-1] + len(data))
+        infos += seq.info.encode("utf8")
+        info_offsets.append(len(infos))
+
+    f.write(bytes(_padding(data_offsets[-1])))
+    info_start = f.tell() - start
+    table_start = info_start + len(infos) + _padding(len(infos))
+    _writeSections(f, (infos, types, encodings, lengths, data_offsets, info_offsets))
+
+    end = f.tell()
+    f.seek(start)
+    f.write(_HEADER.pack(_MAGIC, len(lengths), info_start, table_start))
+    f.seek(end)
+    return len(lengths)
+
+
+class SequenceFile(_MappedFile):
+    """Random access reader of the binary file saved by ``bioseq.io.save()``.
+
+    The file is only parsed when accessing a record, by index or by name (the first word of info).
+    """
+    _MAPPED = ("_types", "_encodings", "_lengths", "_data_offsets", "_info_offsets", "_view")
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        """Read records from a buffer in the format of ``bioseq.io.save()``
+
+        Args:
+            buffer: Content of binary file, such as a memory-mapped file, which is closed by ``close()``
+        """
+        fields = _HEADER.unpack_from(buffer) if len(buffer) >= _HEADER.size else (b"",)
+        if fields[0] != _MAGIC:
+            raise ValueError("Not a binary sequence file")
+        records, info_start, table_start = fields[1:]
+
+        # check the table is in the buffer before any view is exported, so a failed buffer can be closed
+        layout, offset = [], table_start
+        for itemsize, size in ((1, records), (1, records), (8, records),
+                               (8, records + 1), (8, records + 1)):
+            layout.append((offset, itemsize, itemsize * size))
+            offset += itemsize * size + _padding(itemsize * size)
+        if layout[-1][0] + layout[-1][2] > len(buffer):
+            raise ValueError("Binary sequence file is truncated")
+
+        self._view = memoryview(buffer)
+        sections = [self._view[start: start + size].cast("B" if itemsize == 1 else "Q")
+                    for start, itemsize, size in layout]
+        self._types, self._encodings, self._lengths, self._data_offsets, self._info_offsets = sections
+        self._info_start = info_start
+        self._names: Optional[Dict[str, int]] = None
+        if isinstance(buffer, mmap.mmap):
+            self._mmap = buffer
+
+    def raw(self, index: int) -> memoryview:
+        """
+        Stored bytes of record without copy, nucleotides may be packed to 2 bits
+        """
+        start = _HEADER.size + self._data_offsets[index]
+        return self._view[start: _HEADER.size + self._data_offsets[index + 1]]
+
+    def seq(self, index: int) -> str:
+        """
+        Sequence string of record at index
+        """
+        data = self.raw(index)
+        if self._encodings[index] == _PACKED:
+            alphabet = _ALPHABET[_TYPES[self._types[index]].__name__]
+            return algorithm.UnpackBases(data, self._lengths[index], alphabet)
+        return str(data, "ascii")
+
+    def info(self, index: int) -> str:
+        """
+        Info string of record at index
+        """
+        start = self._info_start + self._info_offsets[index]
+        return str(self._view[start: self._info_start + self._info_offsets[index + 1]], "utf8")
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Name of each record, which is the first word of info
+        """
+        return [(self.info(i).split(maxsplit=1) or [""])[0] for i in range(len(self))]
+
+    def index(self, name: str) -> int:
+        """
+        Index of the first record with name, the name table is built on the first call
+        """
+        if self._names is None:
+            self._names = {}
+            for i, key in enumerate(self.names):
+                self._names.setdefault(key, i)
+        return self._names[name]
+
+    def __getitem__(self, index: Union[int, str]) -> Sequence:
+        if isinstance(index, str):
+            index = self.index(index)
+        index = range(len(self))[index]
+        return _TYPES[self._types[index]](self.seq(index), self.info(index))
+
+    def __iter__(self) -> Iterator[Sequence]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def close(self):
+        """
+        Release the buffer, records can't be read after closed
+        """
+        # views are also exported from buffers other than mmap, such as shared memory
+        for attr in self._MAPPED:
+            getattr(self, attr).release()
+        super().close()
+
+
+def load(filename: str) -> SequenceFile:
+    """Memory-map the binary file saved by ``bioseq.io.save()``
+
+    Args:
+        filename(str): the binary file's name
+    Returns:
+        SequenceFile: Reader of records
+    """
+    with open(filename, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        result = SequenceFile(buffer)
+    except ValueError:
+        buffer.close()
+        raise
+    if metrics.ENABLED:
+        metrics.inc("bioseq_io_bytes_total", len(buffer), op="load")
+    return result
@@ -0,0 +1,78 @@
+"""Masking of low complexity regions before alignment and search.
+
+Regions are found in one pass by DUST for ``DNA``/``RNA`` and by SEG for ``Peptide``,
+then soft masked to lower case or hard masked to ``config.MASK_CHAR``.
+Hard masked residues are skipped by ``SeedIndex``, they are never seeded or extended,
+and never match in ``Sequence.align()`` when ``AlignmentConfig.MASK`` is set:
+
+>>> AlignmentConfig.MASK = "N"
+>>> masked = DNA(dna.mask(dna.dust()), dna.info)
+>>> masked.align(subject, mode=2)
+
+Use ``bioseq.utils.maskFasta()`` to mask a fasta file record by record.
+"""
+from typing import Iterable, List, Tuple
+
+from bioseq import algorithm, config
+
+
+def _maskChar(seq_type: type) -> str:
+    """
+    Hard masking character in ``config.MASK_CHAR`` of seq_type or its nearest base type, default is "N"
+    """
+    for cls in seq_type.__mro__:
+        if cls.__name__ in config.MASK_CHAR:
+            return config.MASK_CHAR[cls.__name__]
+    return "N"
+
+
+def dust(seq: str, window: int = 64, threshold: float = 20.) -> List[Tuple[int, int]]:
+    """Find low complexity regions of nucleotides by DUST in O(n).
+    The score of a window of l triplets is :math:`\\sum_t c_t(c_t - 1) / 2 / (l - 1)` where :math:`c_t`
+    is the count of triplet t, the best scoring part of each window scoring above threshold is masked.
+
+    Args:
+        seq(str): DNA or RNA sequence, case insensitive, triplets with other bases are not counted
+        window(int): Length of window, at least 4
+        threshold(float): Windows scoring above it are masked, lower masks more
+    Returns:
+        List[Tuple[int, int]]: Sorted and disjoint (start, end) of low complexity regions
+    """
+    return algorithm.Dust(seq, window, threshold)
+
+
+def seg(seq: str, window: int = 12, locut: float = 2.2, hicut: float = 2.5) -> List[Tuple[int, int]]:
+    """Find low complexity regions of residues by SEG in O(n).
+    Windows whose Shannon entropy is no more than locut bits trigger a region,
+    which is extended to the adjacent windows no more than hicut bits.
+    Boundaries are not optimized by probability as the original SEG does.
+
+    Args:
+        seq(str): Peptide sequence, case insensitive
+        window(int): Length of window
+        locut(float): Trigger complexity in bits
+        hicut(float): Extension complexity in bits
+    Returns:
+        List[Tuple[int, int]]: Sorted and disjoint (start, end) of low complexity regions
+    """
+    return algorithm.Seg(seq, window, locut, hicut)
+
+
+def applyMask(seq: str, regions: Iterable[Tuple[int, int]], soft: bool = False, char: str = "N") -> str:
+    """Mask regions of sequence
+
+    Args:
+        seq(str): Sequence to be masked
+        regions(Iterable[Tuple[int, int]]): Sorted and disjoint (start, end) of regions, such as ``dust()``
+        soft(bool): Convert regions to lower case instead of replacing them
+        char(str): Character replacing residues in hard masking
+    Returns:
+        str: Masked sequence
+    """
+    parts, end = [], 0
+    for start, stop in regions:
+        parts.append(seq[end: start])
+        parts.append(seq[start: stop].lower() if soft else char * (stop - start))
+        end = stop
+    parts.append(seq[end:])
+    return "".join(parts)
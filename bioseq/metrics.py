@@ -0,0 +1,238 @@
+"""Optional instrumentation of hot paths, such as alignment, fasta loading and fetching sequences.
+
+Metrics are only recorded after ``enable()``, instrumented functions only check ``metrics.ENABLED`` when disabled.
+Recorded counters and histograms can be exported by ``snapshot()`` or ``prometheus()``.
+
+>>> from bioseq import metrics
+>>> metrics.enable()
+>>> _ = DNA("ATCG").align("ATG")
+>>> metrics.snapshot()["counters"]["bioseq_align_cells_total"]
+{'mode="global"': 12.0}
+"""
+import threading
+import time
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+#: Whether metrics are recorded, use ``enable()`` and ``disable()`` to change it
+ENABLED = False
+
+#: Upper bounds of histogram buckets in seconds
+BUCKETS: Tuple[float, ...] = (0.0001, 0.001, 0.01, 0.1, 1., 10., 60.)
+
+#: Description of each metric in prometheus text
+HELP: Dict[str, str] = {
+    "bioseq_align_calls_total": "Number of Sequence.align calls",
+    "bioseq_align_cells_total": "Number of dynamic programming cells filled by alignment",
+    "bioseq_align_seconds": "Time of each Sequence.align call",
+    "bioseq_align_cache_hits_total": "Number of Sequence.align results found in cache",
+    "bioseq_align_cache_misses_total": "Number of Sequence.align results not found in cache",
+    "bioseq_fasta_bytes_total": "Bytes of fasta file parsed",
+    "bioseq_fasta_records_total": "Records of fasta file parsed",
+    "bioseq_io_bytes_total": "Bytes of binary sequence file saved or mapped",
+    "bioseq_fetch_requests_total": "Number of requests to remote database",
+    "bioseq_fetch_retries_total": "Number of retried requests to remote database",
+    "bioseq_fetch_errors_total": "Number of failed requests to remote database",
+    "bioseq_fetch_seconds": "Time of each request to remote database",
+    "bioseq_profile_seconds": "Time of each block profiled by metrics.profile()",
+}
+
+_Labels = Tuple[Tuple[str, str], ...]
+_lock = threading.Lock()
+# ENABLED is True if enabled by enable() or any profile is running, changed under _lock
+_enabled = False
+_profiles = 0
+_counters: Dict[str, Dict[_Labels, float]] = {}
+# name: labels: [count of each bucket..., count of +Inf, sum]
+_histograms: Dict[str, Dict[_Labels, List[float]]] = {}
+
+
+def _switch(enabled: Optional[bool] = None, profiles: int = 0):
+    """
+    Update the flag set by ``enable()``/``disable()`` or the number of running profiles, then ``ENABLED``
+    """
+    global ENABLED, _enabled, _profiles
+    with _lock:
+        if enabled is not None:
+            _enabled = enabled
+        _profiles += profiles
+        ENABLED = _enabled or _profiles > 0
+
+
+def enable():
+    """
+    Start recording metrics
+    """
+    _switch(True)
+
+
+def disable():
+    """
+    Stop recording metrics, recorded metrics are kept until ``reset()``.
+    Metrics are still recorded while any ``profile`` is running
+    """
+    _switch(False)
+
+
+def reset():
+    """
+    Remove all recorded metrics
+    """
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def inc(name: str, value: float = 1, **labels: str):
+    """Increase a counter
+
+    Args:
+        name(str): Name of counter, should end with ``_total``
+        value(float): Increment
+        labels(str): Labels of the counter, such as ``mode="global"``
+    """
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0.) + value
+
+
+def observe(name: str, value: float, **labels: str):
+    """Add an observation to a histogram
+
+    Args:
+        name(str): Name of histogram, such as ``bioseq_align_seconds``
+        value(float): Observed value
+        labels(str): Labels of the histogram
+    """
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        buckets = series.get(key)
+        if buckets is None:
+            buckets = series[key] = [0.] * (len(BUCKETS) + 2)
+        buckets[bisect_left(BUCKETS, value)] += 1
+        buckets[-1] += value
+
+
+def _formatLabels(labels: _Labels) -> str:
+    """
+    Format labels as ``key="value",...`` in prometheus text
+    """
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+def snapshot() -> Dict[str, Dict[str, Dict[str, object]]]:
+    """Copy of all recorded metrics
+
+    Returns:
+        Dict: ``{"counters": {name: {labels: value}}, "histograms": {name: {labels: {"count", "sum", "buckets"}}}}``,
+        labels are formatted as ``key="value",...``, buckets are cumulative counts of each bound in ``BUCKETS``
+    """
+    with _lock:
+        counters = {name: {_formatLabels(labels): value for labels, value in series.items()}
+                    for name, series in _counters.items()}
+        histograms = {}
+        for name, series in _histograms.items():
+            histograms[name] = {}
+            for labels, buckets in series.items():
+                cumulative, total = [], 0.
+                for count in buckets[:-1]:
+                    total += count
+                    cumulative.append(total)
+                histograms[name][_formatLabels(labels)] = {
+                    "count": total, "sum": buckets[-1],
+                    "buckets": dict(zip(BUCKETS + (float("inf"),), cumulative)),
+                }
+    return {"counters": counters, "histograms": histograms}
+
+
+def prometheus() -> str:
+    """Export all recorded metrics in prometheus text format
+
+    Returns:
+        str: Text can be served at ``/metrics`` or written to the textfile collector of node exporter
+    """
+    lines = []
+    data = snapshot()
+    for name, series in data["counters"].items():
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} counter")
+        lines.extend(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+                     for labels, value in series.items())
+    for name, series in data["histograms"].items():
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in series.items():
+            for bound, count in histogram["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = ",".join(filter(None, (labels, f'le="{le}"')))
+                lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_count{suffix} {histogram['count']}")
+            lines.append(f"{name}_sum{suffix} {histogram['sum']}")
+    return "\n".join(lines) + "\n"
+
+
+class profile:
+    """Context manager to profile a block, metrics are recorded inside the block even if disabled.
+    The elapsed time is observed in ``bioseq_profile_seconds{block=name}``.
+    Profiles can be nested or run in many threads, recording stops when the last one exits,
+    but ``counters`` include the increments by other threads during the block.
+
+    >>> with metrics.profile("align reads") as p:
+    ...     for read in reads:
+    ...         reference.align(read)
+    >>> p.elapsed, p.counters["bioseq_align_cells_total"]
+    """
+    name: str
+    #: seconds used by the block
+    elapsed: float
+    #: increment of each counter inside the block, summed over labels
+    counters: Dict[str, float]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.elapsed = 0.
+        self.counters = {}
+        self._start = 0.
+        self._before: Dict[str, float] = {}
+
+    @staticmethod
+    def _totals() -> Dict[str, float]:
+        with _lock:
+            return {name: sum(series.values()) for name, series in _counters.items()}
+
+    def __enter__(self) -> "profile":
+        _switch(profiles=1)
+        self._before = self._totals()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed = time.perf_counter() - self._start
+        observe("bioseq_profile_seconds", self.elapsed, block=self.name)
+        self.counters = {name: value - self._before.get(name, 0.)
+                         for name, value in self._totals().items()
+                         if value != self._before.get(name, 0.)}
+        _switch(profiles=-1)
+
+
+class timer:
+    """
+    Context manager to observe the elapsed time of a block to a histogram, used by instrumented functions
+    """
+
+    def __init__(self, name: str, **labels: str):
+        self.name = name
+        self.labels = labels
+        self._start = 0.
+
+    def __enter__(self) -> "timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        observe(self.name, time.perf_counter() - self._start, **self.labels)
+
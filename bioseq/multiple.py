@@ -0,0 +1,323 @@
+from array import array
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence as SequenceType, Tuple, Union
+
+from bioseq import algorithm
+from bioseq._sequence import Sequence
+from bioseq.config import AlignmentConfig
+
+_GAP = b"-"
+#: Default length of k-mer for "kmer" distance, 4 ** 8 nucleotide k-mers are rarely shared by chance in a few kb,
+#: while 20 ** 3 peptide k-mers are enough for proteins
+KMER_SIZE: Dict[str, int] = {"nucleotide": 8, "peptide": 3}
+
+
+class MultipleAlignment:
+    """Result of multiple sequence alignment, returned by ``bioseq.msa()``.
+
+    Residues are stored column by column in one ``bytearray``, so a column is a contiguous slice
+    and a row is a strided slice. Rows are in the order of input sequences.
+    """
+    __slots__ = ("names", "tree", "_columns", "_depth")
+    names: List[str]
+    #: guide tree in Newick format
+    tree: str
+
+    def __init__(self, rows: Iterable[str], names: Optional[Iterable[str]] = None, tree: str = ""):
+        """Create alignment from aligned sequences
+
+        Args:
+            rows(Iterable[str]): Aligned sequences with same length, "-" is gap
+            names(Iterable[str]): Name of each row, default is the index
+            tree(str): Guide tree in Newick format
+        """
+        rows = [row.encode("ascii") if isinstance(row, str) else bytes(row) for row in rows]
+        if len({len(row) for row in rows}) > 1:
+            raise ValueError("Aligned sequences should have same length")
+        self._depth = len(rows)
+        self._columns = bytearray(len(rows[0]) * len(rows) if rows else 0)
+        for i, row in enumerate(rows):
+            self._columns[i::self._depth] = row
+        self.names = list(names) if names is not None else [str(i) for i in range(len(rows))]
+        if len(self.names) != self._depth:
+            raise ValueError("The number of names is not equal to sequences")
+        self.tree = tree
+
+    @property
+    def width(self) -> int:
+        """
+        Number of columns
+        """
+        return len(self._columns) // self._depth if self._depth else 0
+
+    def row(self, index: int) -> str:
+        """
+        Aligned sequence at index
+        """
+        index = range(self._depth)[index]
+        return self._columns[index::self._depth].decode("ascii")
+
+    def column(self, index: int) -> str:
+        """
+        Residues of all sequences at column index
+        """
+        index = range(self.width)[index]
+        return self._columns[index * self._depth: (index + 1) * self._depth].decode("ascii")
+
+    def columns(self) -> Iterator[str]:
+        """
+        Iterate all columns
+        """
+        for i in range(self.width):
+            yield self.column(i)
+
+    def consensus(self, threshold: float = 0.) -> str:
+        """Most common residue of each column
+
+        Args:
+            threshold(float): Column whose most common residue has a fraction below threshold is "X",
+                column only has gaps is "-"
+        Returns:
+            str: Consensus sequence
+        """
+        result = []
+        for column in self.columns():
+            counts = Counter(column.replace("-", ""))
+            if not counts:
+                result.append("-")
+                continue
+            residue, count = counts.most_common(1)[0]
+            result.append(residue if count / self._depth >= threshold else "X")
+        return "".join(result)
+
+    @property
+    def conservation(self) -> array:
+        """
+        Fraction of the most common residue in each column, gaps are not counted as residue, ``array("d")``
+        """
+        result = array("d")
+        for column in self.columns():
+            counts = Counter(column.replace("-", ""))
+            result.append(max(counts.values()) / self._depth if counts else 0.)
+        return result
+
+    def format(self, line_width: int = 60) -> str:
+        """Format alignment as aligned fasta
+
+        Args:
+            line_width(int): Residues of each line
+        Returns:
+            str: Aligned fasta text
+        """
+        lines = []
+        for name, row in zip(self.names, self):
+            lines.append(f">{name}")
+            lines.extend(row[i: i + line_width] for i in range(0, len(row), line_width))
+        return "\n".join(lines) + "\n"
+
+    def __getitem__(self, index: Union[int, str]) -> str:
+        if isinstance(index, str):
+            index = self.names.index(index)
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._depth):
+            yield self.row(i)
+
+    def __len__(self) -> int:
+        return self._depth
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._depth} sequences x {self.width} columns)"
+
+
+def _alignDistances(seqs: List[str], i: int) -> List[float]:
+    """
+    Distance of seqs[i] to each sequence after it, 1 - identity of global alignment
+    """
+    args = (AlignmentConfig.MATCH, AlignmentConfig.MISMATCH, AlignmentConfig.GAP_OPEN, AlignmentConfig.GAP_EXTEND)
+    mask = AlignmentConfig.MASK or "\0"
+    result = []
+    for j in range(i + 1, len(seqs)):
+        _, _, _, _, _, _, matches, mismatches, insertions, deletions, _ = \
+            algorithm.AlignStats(seqs[i], seqs[j], *args, False, mask)
+        length = matches + mismatches + insertions + deletions
+        result.append(1 - matches / length if length else 0.)
+    return result
+
+
+def _kmerDistances(kmers: List[frozenset], i: int) -> List[float]:
+    """
+    Distance of kmers[i] to each k-mer set after it, 1 - shared k-mers / k-mers of the smaller one
+    """
+    result = []
+    for j in range(i + 1, len(kmers)):
+        smaller = min(len(kmers[i]), len(kmers[j]))
+        result.append(1 - len(kmers[i] & kmers[j]) / smaller if smaller else 1.)
+    return result
+
+
+def _kmerSize(seqs: List[str]) -> int:
+    """
+    Default length of k-mer in ``KMER_SIZE`` by the alphabet of upper case sequences
+    """
+    nucleotide = all(not seq.strip("ACGTUN") for seq in seqs)
+    return KMER_SIZE["nucleotide" if nucleotide else "peptide"]
+
+
+def distanceMatrix(sequences: SequenceType[Union[str, Sequence]],
+                   method: str = "align",
+                   k: Optional[int] = None,
+                   workers: Optional[int] = None) -> array:
+    """Pairwise distances of sequences, rows are computed in threads
+
+    Args:
+        sequences(Sequence[str|Sequence]): Sequences to be compared
+        method(str): "align" for 1 - identity of global alignment by ``AlignmentConfig``,
+            "kmer" for 1 - fraction of shared k-mers, which is much faster for thousands of sequences
+        k(int): Length of k-mer, default is ``KMER_SIZE`` of nucleotides if all sequences are nucleotides,
+            else of peptides. A sequence shorter than k shares no k-mer with others
+        workers(int): Number of threads, default is the number of CPUs
+    Returns:
+        array: Condensed distance matrix in the order of (0, 1), (0, 2) ... (n-2, n-1), ``array("d")``
+    """
+    seqs = [seq.seq if isinstance(seq, Sequence) else seq.upper() for seq in sequences]
+    if method == "align":
+        task, data = _alignDistances, seqs
+    elif method == "kmer":
+        task = _kmerDistances
+        k = k or _kmerSize(seqs)
+        data = [frozenset(seq[i: i + k] for i in range(len(seq) - k + 1)) for seq in seqs]
+    else:
+        raise ValueError("method should be 'align' or 'kmer'")
+
+    result = array("d")
+    with ThreadPoolExecutor(workers) as executor:
+        for distances in executor.map(task, [data] * len(seqs), range(len(seqs))):
+            result.extend(distances)
+    return result
+
+
+def guideTree(distances: array, n: int, method: str = "upgma") -> Tuple[List[Tuple[int, int]], List[Tuple[float, float]]]:
+    """Build guide tree from condensed distance matrix
+
+    Args:
+        distances(array): Condensed distance matrix of n items, such as the result of ``distanceMatrix()``
+        n(int): Number of items
+        method(str): "upgma" or "nj" (Neighbor-Joining)
+    Returns:
+        Tuple[List[Tuple[int, int]], List[Tuple[float, float]]]: Ids of the two clusters merged at each step
+        and their branch lengths, leaves are 0 ~ n-1 and the cluster created at step k is n + k
+    """
+    builders = {"upgma": algorithm.UPGMA, "nj": algorithm.NeighborJoining}
+    if method not in builders:
+        raise ValueError("method should be 'upgma' or 'nj'")
+    merges, lengths = array("i"), array("d")
+    raw_merges, raw_lengths = builders[method](array("d", distances).tobytes(), n)
+    merges.frombytes(raw_merges)
+    lengths.frombytes(raw_lengths)
+    return list(zip(merges[::2], merges[1::2])), list(zip(lengths[::2], lengths[1::2]))
+
+
+def _newick(names: List[str], merges: List[Tuple[int, int]], lengths: List[Tuple[float, float]]) -> str:
+    """
+    Format guide tree in Newick format
+    """
+    nodes = list(names)
+    for (a, b), (length_a, length_b) in zip(merges, lengths):
+        nodes.append(f"({nodes[a]}:{length_a:.5g},{nodes[b]}:{length_b:.5g})")
+    return nodes[-1] + ";"
+
+
+def _insertGaps(rows: bytes, depth: int, ops: bytes, keep: int) -> bytes:
+    """
+    Insert gap columns to rows of a group, the columns of group are the ops equal to keep or "M"
+    """
+    width = len(rows) // depth
+    pieces, start = [], 0     # (start, end) of original columns or -gap length
+    for op, run in groupby(ops):
+        length = len(list(run))
+        if op == ord("M") or op == keep:
+            pieces.append((start, start + length))
+            start += length
+        else:
+            pieces.append((-length, 0))
+    result = []
+    for i in range(depth):
+        row = rows[i * width: (i + 1) * width]
+        result.extend(row[begin: end] if begin >= 0 else _GAP * -begin for begin, end in pieces)
+    return b"".join(result)
+
+
+def _mergeGroups(left: Future, right: Future) -> Tuple[List[int], bytes]:
+    """
+    Align two groups by their profiles, groups are (index of members, aligned rows)
+    """
+    members_a, rows_a = left.result()
+    members_b, rows_b = right.result()
+    ops = algorithm.ProfileAlign(rows_a, len(members_a), rows_b, len(members_b),
+                                 AlignmentConfig.MATCH, AlignmentConfig.MISMATCH,
+                                 AlignmentConfig.GAP_OPEN, AlignmentConfig.GAP_EXTEND, AlignmentConfig.MASK or "\0")
+    rows = _insertGaps(rows_a, len(members_a), ops, ord("A")) + _insertGaps(rows_b, len(members_b), ops, ord("B"))
+    return members_a + members_b, rows
+
+
+def msa(sequences: Iterable[Union[str, Sequence]],
+        names: Optional[Iterable[str]] = None,
+        tree: str = "upgma",
+        distance: str = "align",
+        k: Optional[int] = None,
+        workers: Optional[int] = None) -> MultipleAlignment:
+    """Progressive multiple sequence alignment.
+    Pairwise distances are computed in threads, then sequences are merged along the guide tree
+    by profile-profile alignment, independent subtrees are aligned in parallel.
+    Scores are set by ``bioseq.config.AlignmentConfig``.
+
+    Args:
+        sequences(Iterable[str|Sequence]): Sequences to be aligned
+        names(Iterable[str]): Name of each sequence, default is ``info`` of Sequence or the index
+        tree(str): "upgma" or "nj" (Neighbor-Joining) to build guide tree
+        distance(str): "align" or "kmer", see ``distanceMatrix()``, "kmer" is recommended for thousands of sequences
+        k(int): Length of k-mer of "kmer" distance, default is chosen by the alphabet, see ``distanceMatrix()``
+        workers(int): Number of threads, default is the number of CPUs
+    Returns:
+        MultipleAlignment: Aligned sequences in the order of input
+    """
+    seqs, default_names = [], []
+    for i, seq in enumerate(sequences):
+        if isinstance(seq, Sequence):
+            seqs.append(seq.seq)
+            default_names.append(seq.info or str(i))
+        elif isinstance(seq, str):
+            seqs.append(seq.upper())
+            default_names.append(str(i))
+        else:
+            raise TypeError("Sequence should be str or Sequence")
+    names = list(names) if names is not None else default_names
+    if not seqs:
+        raise ValueError("No sequence to align")
+    if len(names) != len(seqs):
+        raise ValueError("The number of names is not equal to sequences")
+    if len(seqs) == 1:
+        return MultipleAlignment(seqs, names, f"{names[0]};")
+
+    n = len(seqs)
+    merges, lengths = guideTree(distanceMatrix(seqs, distance, k, workers), n, tree)
+
+    with ThreadPoolExecutor(workers) as executor:
+        groups: Dict[int, Future] = {}
+        for i, seq in enumerate(seqs):
+            groups[i] = Future()
+            groups[i].set_result(([i], seq.encode("ascii")))
+        # children are always submitted before parent, so a waiting parent never blocks its children
+        for step, (a, b) in enumerate(merges):
+            groups[n + step] = executor.submit(_mergeGroups, groups.pop(a), groups.pop(b))
+        members, rows = groups[2 * n - 2].result()
+
+    width = len(rows) // n
+    aligned: List[bytes] = [b""] * n
+    for i, member in enumerate(members):
+        aligned[member] = rows[i * width: (i + 1) * width]
+    return MultipleAlignment(aligned, names, _newick(names, merges, lengths))
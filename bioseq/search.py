@@ -0,0 +1,290 @@
+"""Seed-and-extend search of a query against a database of sequences, like BLAST.
+
+1. Exact k-mer seeds of query are looked up in a ``SeedIndex`` of the database.
+2. Each seed is extended on its diagonal without gaps until the score drops ``xdrop`` below the best.
+3. Ungapped segments on nearby diagonals of one record are clustered to a region.
+4. Only the best regions are aligned by Smith-Waterman, on a window around the region.
+
+Scores are set by ``bioseq.config.AlignmentConfig``.
+
+>>> index = SeedIndex.fromFasta("genomes.fasta", k=11)
+>>> index.save("genomes.seed")
+>>> with SeedIndex.load("genomes.seed") as index:
+...     for hit in index.search(query):
+...         print(hit.name, hit.score, hit.subject_start, hit.subject_end)
+"""
+import struct
+
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, NamedTuple, Optional, Type, Union
+
+from bioseq import algorithm, config
+from bioseq._sequence import DNA, RNA, Sequence
+from bioseq.alignment import Alignment
+from bioseq.config import AlignmentConfig
+from bioseq.io import _MappedFile, _packNames, _textsAndNames, _writeSections
+
+_MAGIC = b"BSQSEED1"
+# magic, k, alphabet size, record num, text length, number of positions
+_HEADER = struct.Struct("<8sIIIQQ")
+_SEPARATOR = b"\x00"
+#: Default length of k-mer of each type
+_DEFAULT_K = {"DNA": 11, "RNA": 11, "Peptide": 3}
+
+
+def _typeName(seq_type: Type[Sequence]) -> str:
+    """
+    Name of the nearest type in ``config.MW`` of seq_type
+    """
+    for cls in seq_type.__mro__:
+        if cls.__name__ in config.MW:
+            return cls.__name__
+    raise TypeError("Only DNA, RNA and Peptide can be indexed")
+
+
+class Hit(NamedTuple):
+    """
+    A gapped local alignment between query and a database record, coordinates are 0-based and end exclusive
+    """
+    #: index of record in database
+    record: int
+    name: str
+    score: float
+    #: "+" or "-", query is reverse complemented to align to the record on "-" strand
+    strand: str
+    #: coordinates on the original query, even on "-" strand
+    query_start: int
+    query_end: int
+    subject_start: int
+    subject_end: int
+    #: alignment between the searched strand of query and the record
+    alignment: Alignment
+
+    @property
+    def identity(self) -> float:
+        return self.alignment.identity
+
+
+class _Segment(NamedTuple):
+    score: float
+    query_start: int
+    query_end: int
+    subject_start: int
+    subject_end: int
+
+
+class SeedIndex(_MappedFile):
+    """Persistent k-mer index of a sequence database for ``search()``.
+
+    Records are joined by a separator into one text, positions of each k-mer are sorted in one array.
+    Save it by ``save()`` and open it later by ``load()``, the loaded index is memory-mapped.
+    """
+    names: List[str]
+    k: int
+    #: characters of k-mers, from ``config.MW`` of the indexed type
+    alphabet: bytes
+    _MAPPED = ("_offsets", "_positions", "_text")
+
+    def __init__(self,
+                 sequences: Iterable[Union[str, Sequence]],
+                 names: Optional[Iterable[str]] = None,
+                 k: Optional[int] = None,
+                 seq_type: Type[Sequence] = DNA):
+        """Build index from sequences
+
+        Args:
+            sequences(Iterable[str|Sequence]): Sequences of database
+            names(Iterable[str]): Name of each sequence, default is ``info`` of Sequence or ""
+            k(int): Length of k-mer, default is 11 for nucleotides and 3 for peptides
+            seq_type(Type[Sequence]): Type of sequences, which decides the alphabet
+        """
+        type_name = _typeName(seq_type)
+        self.k = k or _DEFAULT_K[type_name]
+        self.alphabet = "".join(sorted(config.MW[type_name])).encode("ascii")
+        self._nucleotide = type_name != "Peptide"
+
+        texts, self.names = _textsAndNames(sequences, names)
+        self._starts, position = array("Q"), 0
+        for text in texts:
+            self._starts.append(position)
+            position += len(text) + 1
+        self._text = _SEPARATOR.join(text.encode("ascii") for text in texts)
+        offsets, positions = algorithm.KmerIndex(self._text, self.k, self.alphabet)
+        self._offsets, self._positions = memoryview(offsets), memoryview(positions)
+
+    @classmethod
+    def fromFasta(cls, filename: str, k: Optional[int] = None, seq_type: Type[Sequence] = DNA) -> "SeedIndex":
+        """Build index from all records of a fasta file, each record's name is its info line
+
+        Args:
+            filename(str): the fasta file's name
+            k(int): Length of k-mer
+            seq_type(Type[Sequence]): Type of records
+        Returns:
+            SeedIndex: Index of the fasta file
+        """
+        from bioseq.utils import loadFasta
+
+        return cls(loadFasta(filename, iterator=True), k=k, seq_type=seq_type)
+
+    def record(self, index: int) -> str:
+        """
+        Sequence of record at index
+        """
+        index = range(len(self))[index]
+        end = self._starts[index + 1] - 1 if index + 1 < len(self) else len(self._text)
+        return str(self._text[self._starts[index]: end], "ascii")
+
+    def _segments(self, query: str, xdrop: float, min_score: float, max_occurrences: int) -> List[_Segment]:
+        """
+        Ungapped segments extended from seeds, coordinates are on the text
+        """
+        raw = array("d")
+        raw.frombytes(algorithm.SeedExtend(query, self._text, self._offsets, self._positions,
+                                           self.k, self.alphabet, AlignmentConfig.MATCH, AlignmentConfig.MISMATCH,
+                                           xdrop, min_score, max_occurrences))
+        return [_Segment(raw[i], *map(int, raw[i + 1: i + 5])) for i in range(0, len(raw), 5)]
+
+    def _regions(self, segments: List[_Segment], query_length: int, band: int) -> List[list]:
+        """
+        Cluster segments of one strand to regions, segments of a region are in one record,
+        on diagonals within band and not farther than the query length
+        """
+        regions = []
+        segments = sorted(segments, key=lambda segment: segment.subject_start)
+        for segment in segments:
+            record = bisect_right(self._starts, segment.subject_start) - 1
+            diagonal = segment.subject_start - segment.query_start
+            # segments are sorted by subject start, so only the recent regions can be close
+            for region in reversed(regions[-8:]):
+                if region[1] == record and abs(region[2] - diagonal) <= band and \
+                        segment.subject_start - region[6] <= query_length:
+                    region[0] += segment.score
+                    region[3] = min(region[3], segment.query_start)
+                    region[4] = max(region[4], segment.query_end)
+                    region[6] = max(region[6], segment.subject_end)
+                    break
+            else:
+                # score, record, diagonal, query start, query end, subject start, subject end
+                regions.append([segment.score, record, diagonal, segment.query_start, segment.query_end,
+                                segment.subject_start, segment.subject_end])
+        return regions
+
+    def search(self,
+               query: Union[str, Sequence],
+               max_hits: int = 50,
+               min_score: Optional[float] = None,
+               xdrop: Optional[float] = None,
+               band: int = 16,
+               max_occurrences: int = 1000,
+               both_strands: bool = True) -> List[Hit]:
+        """Search query in database by seed-and-extend
+
+        Args:
+            query(str|Sequence): Query sequence
+            max_hits(int): Max number of regions aligned with gaps and returned
+            min_score(float): Min score of ungapped segments and hits, default is 1.5 times the score of a seed
+            xdrop(float): Ungapped extension stops when the score drops xdrop below the best, default is 5 matches
+            band(int): Segments on diagonals within band are clustered, also the padding of the gapped window
+            max_occurrences(int): K-mers appearing more times in database are not used as seeds, such as repeats
+            both_strands(bool): Also search the reverse complement of nucleotide query
+        Returns:
+            List[Hit]: Hits sorted by score from the highest
+        """
+        if isinstance(query, Sequence):
+            query = query.seq
+        elif isinstance(query, str):
+            query = query.upper()
+        else:
+            raise TypeError("Query should be str or Sequence")
+        if min_score is None:
+            min_score = 1.5 * self.k * AlignmentConfig.MATCH
+        if xdrop is None:
+            xdrop = 5 * AlignmentConfig.MATCH
+
+        strands = [("+", query)]
+        if both_strands and self._nucleotide:
+            seq_type = RNA if b"U" in self.alphabet else DNA
+            strands.append(("-", seq_type(query).complement.seq))
+
+        regions = []
+        for strand, seq in strands:
+            segments = self._segments(seq, xdrop, min_score, max_occurrences)
+            regions.extend([strand, seq] + region for region in self._regions(segments, len(seq), band))
+        regions.sort(key=lambda region: region[2], reverse=True)
+
+        hits: List[Hit] = []
+        for strand, seq, _, record, _, q_start, q_end, s_start, s_end in regions:
+            if len(hits) >= max_hits:
+                break
+            offset = self._starts[record]
+            s_start, s_end = s_start - offset, s_end - offset
+            if any(hit.record == record and hit.strand == strand and
+                   hit.alignment.query_start <= q_start and q_end <= hit.alignment.query_end and
+                   hit.subject_start <= s_start and s_end <= hit.subject_end for hit in hits):
+                continue
+            hit = self._extend(seq, record, strand, q_start, q_end, s_start, s_end, band)
+            if hit.score >= min_score:
+                hits.append(hit)
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits
+
+    def _extend(self, query: str, record: int, strand: str,
+                q_start: int, q_end: int, s_start: int, s_end: int, band: int) -> Hit:
+        """
+        Gapped local alignment on the window around a region
+        """
+        subject = self.record(record)
+        q_from, s_from = max(0, q_start - band), max(0, s_start - band)
+        q_window = query[q_from: q_end + band]
+        s_window = subject[s_from: s_end + band]
+        score, qs, qe, ss, se, *stats = algorithm.AlignStats(
+            q_window, s_window, AlignmentConfig.MATCH, AlignmentConfig.MISMATCH,
+            AlignmentConfig.GAP_OPEN, AlignmentConfig.GAP_EXTEND, True, AlignmentConfig.MASK or "\0")
+        alignment = Alignment(query, subject, score, qs + q_from, qe + q_from, ss + s_from, se + s_from, *stats)
+        if strand == "+":
+            start, end = alignment.query_start, alignment.query_end
+        else:
+            start, end = len(query) - alignment.query_end, len(query) - alignment.query_start
+        return Hit(record, self.names[record], score, strand, start, end,
+                   alignment.subject_start, alignment.subject_end, alignment)
+
+    def save(self, filename: str):
+        """Save index to a binary file, which can be memory-mapped by ``SeedIndex.load()``
+
+        Args:
+            filename(str): the index file's name
+        """
+        sections = [self.alphabet, self._starts, *_packNames(self.names),
+                    self._offsets, self._positions, self._text]
+        with open(filename, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.k, len(self.alphabet), len(self.names),
+                                 len(self._text), len(self._positions) // 4))
+            _writeSections(f, sections)
+
+    @classmethod
+    def load(cls, filename: str) -> "SeedIndex":
+        """Memory-map an index file saved by ``SeedIndex.save()``
+
+        Args:
+            filename(str): the index file's name
+        Returns:
+            SeedIndex: The index whose tables are read from disk on demand
+        """
+        index, sections, (k, sigma, records, length, positions) = cls._map(filename, _HEADER, _MAGIC, "seed index")
+        index.k = k
+        index.alphabet = bytes(sections.read(sigma))
+        index._nucleotide = len(index.alphabet) == 4
+        index._starts = array("Q", sections.read(8 * records).cast("Q"))
+        index.names = sections.names(records)
+        index._offsets = sections.read(4 * (sigma ** k + 1))
+        index._positions = sections.read(4 * positions)
+        index._text = sections.read(length)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"SeedIndex({len(self)} records, k={self.k}, alphabet={self.alphabet.decode()!r})"
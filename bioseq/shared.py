@@ -0,0 +1,186 @@
+"""Sequence sets published once to ``multiprocessing.shared_memory`` and read by many processes.
+
+The set is stored in the binary format of ``bioseq.io``, workers attach the same memory by name
+instead of receiving pickled copies of every sequence. Pickling a ``SharedSequenceSet`` only pickles its name,
+so the set can be passed to pool workers directly:
+
+>>> with SharedSequenceSet.create(loadFasta("genome.fasta", iterator=True)) as genome:
+...     with ProcessPoolExecutor() as executor:
+...         list(executor.map(alignRead, [genome] * len(reads), reads))
+
+In each worker, ``genome["chr1"]`` or ``genome[0]`` returns a frozen ``DNA``/``RNA``/``Peptide``,
+only the accessed record is decoded into the worker.
+"""
+import atexit
+import io
+import sys
+import threading
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, Optional, Union
+
+from bioseq.frozen import _frozenType
+from bioseq.io import SequenceFile, _TYPES, write
+from bioseq._sequence import Sequence
+
+_attach_lock = threading.Lock()
+# sets attached by unpickling in this process, so each worker attaches a set once
+_attached: Dict[str, "SharedSequenceSet"] = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach existing shared memory without tracking it, only its creator unlinks it
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    # before Python 3.13 the attached memory is registered to the resource tracker of this process,
+    # which unlinks it when this process exits even if other processes are using it (bpo-39959)
+    with _attach_lock:
+        register, resource_tracker.register = resource_tracker.register, lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedSequenceSet(SequenceFile):
+    """Sequences in shared memory, created by ``create()`` or ``fromFile()`` and attached by ``attach()``.
+    Records are read-only, accessed by index or by name like ``bioseq.io.SequenceFile``.
+    The creator should ``unlink()`` the memory after all workers finished, which is done when leaving ``with`` block
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, owner: bool = False):
+        """Read the set from shared memory, use ``create()``, ``fromFile()`` or ``attach()`` instead
+
+        Args:
+            memory(SharedMemory): Shared memory in the format of ``bioseq.io.save()``
+            owner(bool): Whether this process created the memory and should unlink it
+        """
+        super().__init__(memory.buf)
+        self._memory = memory
+        self._owner = owner
+
+    @classmethod
+    def create(cls, sequences: Iterable[Sequence], name: Optional[str] = None,
+               pack: bool = True) -> "SharedSequenceSet":
+        """Publish sequences to new shared memory
+
+        Args:
+            sequences(Iterable[Sequence]): Sequences to be published
+            name(str): Name of shared memory, default is a random name
+            pack(bool): Pack DNA and RNA only consisted of 4 bases to 2 bits per base
+        Returns:
+            SharedSequenceSet: The set owned by this process
+        """
+        buffer = io.BytesIO()
+        write(sequences, buffer, pack)
+        data = buffer.getbuffer()
+        memory = shared_memory.SharedMemory(name, create=True, size=len(data))
+        memory.buf[:len(data)] = data
+        data.release()
+        return cls(memory, owner=True)
+
+    @classmethod
+    def fromFile(cls, filename: str, name: Optional[str] = None, block_size: int = 1 << 24) -> "SharedSequenceSet":
+        """Publish a file saved by ``bioseq.io.save()`` to new shared memory, the file is copied by blocks
+
+        Args:
+            filename(str): the binary file's name
+            name(str): Name of shared memory, default is a random name
+            block_size(int): Bytes copied at once
+        Returns:
+            SharedSequenceSet: The set owned by this process
+        """
+        with open(filename, "rb") as f:
+            size = f.seek(0, io.SEEK_END)
+            f.seek(0)
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+            try:
+                for start in range(0, size, block_size):
+                    f.readinto(memory.buf[start: start + block_size])
+                return cls(memory, owner=True)
+            except BaseException:
+                memory.close()
+                memory.unlink()
+                raise
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSequenceSet":
+        """Attach the set published by another process
+
+        Args:
+            name(str): ``name`` of the published set
+        Returns:
+            SharedSequenceSet: The set, closed by this process but not unlinked
+        """
+        return cls(_attach(name))
+
+    @property
+    def name(self) -> str:
+        """
+        Name of shared memory, used by ``attach()``
+        """
+        return self._memory.name
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of shared memory
+        """
+        return self._memory.size
+
+    def __getitem__(self, index: Union[int, str]) -> Sequence:
+        if isinstance(index, str):
+            index = self.index(index)
+        index = range(len(self))[index]
+        return _frozenType(_TYPES[self._types[index]])(self.seq(index), self.info(index))
+
+    def close(self):
+        """
+        Detach shared memory from this process, records can't be read after closed
+        """
+        super().close()
+        self._memory.close()
+
+    def unlink(self):
+        """
+        Destroy shared memory after all processes closed it, only called by the creator
+        """
+        self._memory.unlink()
+
+    def __exit__(self, *args):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def __reduce__(self):
+        return _unpickle, (self.__class__, self.name)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r}, records={len(self)}, nbytes={self.nbytes})"
+
+
+def _unpickle(cls: type, name: str) -> SharedSequenceSet:
+    """
+    Attach the set by name when unpickled, reuse the set attached by previous unpickling in this process
+    """
+    with _attach_lock:
+        shared = _attached.get(name)
+    if shared is None or shared._memory.buf is None:
+        shared = cls.attach(name)
+        with _attach_lock:
+            _attached[name] = shared
+    return shared
+
+
+@atexit.register
+def _closeAttached():
+    """
+    Close sets attached by unpickling before their shared memory is collected
+    """
+    with _attach_lock:
+        for shared in _attached.values():
+            if shared._memory.buf is not None:
+                shared.close()
+        _attached.clear()
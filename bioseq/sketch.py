@@ -0,0 +1,256 @@
+"""MinHash sketches to estimate the similarity of sequences or files without alignment.
+
+A sketch keeps the ``size`` smallest distinct hashes of all k-mers, hashes are rolled in C.
+Comparing two sketches costs O(size) regardless of the sequence length,
+so candidates can be filtered by sketches before the exact ``Sequence.align()``.
+
+>>> sketches = SketchSet([seq.sketch(k=15) for seq in genomes])
+>>> for index, distance in sketches.search(query.sketch(k=15), max_distance=0.1):
+...     query.align(genomes[index])
+"""
+import struct
+
+from array import array
+from math import log
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from bioseq import algorithm
+
+#: k-mers of any characters are hashed
+ANY = 0
+#: only k-mers of ACGT/U are hashed
+NUCLEOTIDE = 1
+#: only k-mers of ACGT/U are hashed, k-mer and its reverse complement have the same hash
+CANONICAL = 2
+
+_MAGIC = b"BSKETCH1"
+# magic, k, size, mode, number of sketches, number of hashes, length of names blob
+_HEADER = struct.Struct("<8sIIIQQQ")
+
+
+class Sketch:
+    """Bottom-k MinHash sketch of a sequence or a file, created by ``Sequence.sketch()``,
+    ``Sketch.fromString()`` or ``bioseq.utils.sketchFasta()``
+    """
+    __slots__ = ("hashes", "k", "size", "mode", "name")
+    #: the smallest distinct hashes in ascending order, ``array("Q")``
+    hashes: array
+    k: int
+    size: int
+    #: ``ANY``, ``NUCLEOTIDE`` or ``CANONICAL``
+    mode: int
+    name: str
+
+    def __init__(self, hashes: Iterable[int], k: int, size: int, mode: int = ANY, name: str = ""):
+        self.hashes = hashes if isinstance(hashes, array) else array("Q", hashes)
+        self.k = k
+        self.size = size
+        self.mode = mode
+        self.name = name
+
+    @classmethod
+    def fromString(cls, seq: str, k: int = 21, size: int = 1000, mode: int = ANY, name: str = "") -> "Sketch":
+        """Sketch all k-mers of a string
+
+        Args:
+            seq(str): Sequence to be sketched
+            k(int): Length of k-mer, no more than 32 for nucleotide modes
+            size(int): Max number of hashes kept
+            mode(int): ``ANY``, ``NUCLEOTIDE`` or ``CANONICAL``
+            name(str): Name of the sketch
+        Returns:
+            Sketch: Sketch of seq
+        """
+        hashes = array("Q")
+        hashes.frombytes(algorithm.MinHash(seq, k, size, mode))
+        return cls(hashes, k, size, mode, name)
+
+    def _check(self, other: "Sketch"):
+        if (self.k, self.size, self.mode) != (other.k, other.size, other.mode):
+            raise ValueError("Only sketches with the same k, size and mode can be compared")
+
+    def _compare(self, other: "Sketch", containment: bool) -> float:
+        self._check(other)
+        return SketchSet([self]).compare(SketchSet([other]), containment)[0][0]
+
+    def jaccard(self, other: "Sketch") -> float:
+        """
+        Estimated Jaccard index of k-mers of two sketched sequences
+        """
+        return self._compare(other, False)
+
+    def containment(self, other: "Sketch") -> float:
+        """
+        Estimated fraction of k-mers of this sequence found in the other, suitable for sequences of different lengths
+        """
+        return self._compare(other, True)
+
+    def distance(self, other: "Sketch") -> float:
+        """
+        Mash distance, which estimates the mutation rate between two sequences by Jaccard index
+        """
+        return _mashDistance(self.jaccard(other), self.k)
+
+    def merge(self, other: "Sketch") -> "Sketch":
+        """Sketch of the union of two sketched sequences, such as sketches of blocks of one record
+
+        Returns:
+            Sketch: New sketch with the name of this sketch
+        """
+        self._check(other)
+        hashes = sorted(set(self.hashes).union(other.hashes))[:self.size]
+        return Sketch(array("Q", hashes), self.k, self.size, self.mode, self.name)
+
+    def __eq__(self, o: object) -> bool:
+        if not isinstance(o, Sketch):
+            return False
+        return (self.k, self.size, self.mode, self.hashes) == (o.k, o.size, o.mode, o.hashes)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __repr__(self) -> str:
+        return f"Sketch(name={self.name!r}, k={self.k}, size={self.size}, mode={self.mode}, hashes={len(self)})"
+
+
+def _mashDistance(jaccard: float, k: int) -> float:
+    return max(0., -log(2 * jaccard / (1 + jaccard)) / k) if jaccard > 0 else 1.
+
+
+class SketchSet:
+    """Sketches with the same parameters stored in one ``array("Q")``,
+    all pairs of two sets are compared in C without the GIL
+    """
+    __slots__ = ("k", "size", "mode", "names", "_hashes", "_offsets")
+    k: int
+    size: int
+    mode: int
+    names: List[str]
+
+    def __init__(self, sketches: Iterable[Sketch] = (), k: Optional[int] = None,
+                 size: Optional[int] = None, mode: Optional[int] = None):
+        """Create set from sketches, parameters are taken from the first sketch if not given
+
+        Args:
+            sketches(Iterable[Sketch]): Sketches with the same k, size and mode
+        """
+        self.k, self.size, self.mode = k, size, mode
+        self.names = []
+        self._hashes, self._offsets = array("Q"), array("q", [0])
+        for sketch in sketches:
+            self.append(sketch)
+
+    def append(self, sketch: Sketch):
+        """
+        Add a sketch to the end
+        """
+        if self.k is None:
+            self.k, self.size, self.mode = sketch.k, sketch.size, sketch.mode
+        elif (self.k, self.size, self.mode) != (sketch.k, sketch.size, sketch.mode):
+            raise ValueError("Only sketches with the same k, size and mode can be added")
+        self._hashes.extend(sketch.hashes)
+        self._offsets.append(len(self._hashes))
+        self.names.append(sketch.name)
+
+    def compare(self, other: Union["SketchSet", Sketch, None] = None, containment: bool = False) -> List[array]:
+        """Compare each sketch of this set to each sketch of other
+
+        Args:
+            other(SketchSet|Sketch): Sketches to be compared, default is this set
+            containment(bool): Estimate containment of this set's sketch in other's instead of Jaccard index
+        Returns:
+            List[array]: Similarity of each pair, ``result[i][j]`` is of ``self[i]`` and ``other[j]``
+        """
+        if other is None:
+            other = self
+        elif isinstance(other, Sketch):
+            other = SketchSet([other])
+        if len(self) and len(other) and (self.k, self.size, self.mode) != (other.k, other.size, other.mode):
+            raise ValueError("Only sketches with the same k, size and mode can be compared")
+
+        matrix = array("d")
+        matrix.frombytes(algorithm.SketchMatrix(self._hashes.tobytes(), self._offsets.tobytes(),
+                                                other._hashes.tobytes(), other._offsets.tobytes(),
+                                                self.size or 1, containment))
+        width = len(other)
+        return [matrix[i * width: (i + 1) * width] for i in range(len(self))]
+
+    def jaccard(self, other: Union["SketchSet", Sketch, None] = None) -> List[array]:
+        """
+        Estimated Jaccard index of each pair, see ``compare()``
+        """
+        return self.compare(other)
+
+    def containment(self, other: Union["SketchSet", Sketch, None] = None) -> List[array]:
+        """
+        Estimated containment of each sketch of this set in each sketch of other, see ``compare()``
+        """
+        return self.compare(other, containment=True)
+
+    def distance(self, other: Union["SketchSet", Sketch, None] = None) -> List[array]:
+        """
+        Mash distance of each pair, see ``compare()``
+        """
+        return [array("d", (_mashDistance(value, self.k) for value in row)) for row in self.compare(other)]
+
+    def search(self, query: Sketch, max_distance: float = 0.1) -> List[Tuple[int, float]]:
+        """Find sketches close to query
+
+        Args:
+            query(Sketch): Sketch of query
+            max_distance(float): Max Mash distance of candidates
+        Returns:
+            List[Tuple[int, float]]: Index and distance of candidates from the closest one
+        """
+        distances = SketchSet([query]).distance(self)[0]
+        return sorted(((i, value) for i, value in enumerate(distances) if value <= max_distance),
+                      key=lambda item: item[1])
+
+    def save(self, filename: str):
+        """
+        Save sketches to a binary file, which can be loaded by ``SketchSet.load()``
+        """
+        names = bytearray()
+        name_offsets = array("q", [0])
+        for name in self.names:
+            names += name.encode("utf8")
+            name_offsets.append(len(names))
+        with open(filename, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.k or 0, self.size or 0, self.mode or 0,
+                                 len(self), len(self._hashes), len(names)))
+            for section in (self._offsets, self._hashes, name_offsets, names):
+                f.write(bytes(section))
+
+    @classmethod
+    def load(cls, filename: str) -> "SketchSet":
+        """
+        Load sketches saved by ``SketchSet.save()``
+        """
+        with open(filename, "rb") as f:
+            magic, k, size, mode, number, hashes, names = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC:
+                raise ValueError(f"{filename} is not a sketch file")
+            result = cls(k=k, size=size, mode=mode) if number else cls()
+            result._offsets = array("q")
+            result._offsets.frombytes(f.read(8 * (number + 1)))
+            result._hashes.frombytes(f.read(8 * hashes))
+            name_offsets = array("q")
+            name_offsets.frombytes(f.read(8 * (number + 1)))
+            blob = f.read(names)
+        result.names = [blob[start: end].decode("utf8") for start, end in zip(name_offsets, name_offsets[1:])]
+        return result
+
+    def __getitem__(self, index: int) -> Sketch:
+        index = range(len(self))[index]
+        hashes = self._hashes[self._offsets[index]: self._offsets[index + 1]]
+        return Sketch(hashes, self.k, self.size, self.mode, self.names[index])
+
+    def __iter__(self) -> Iterator[Sketch]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"SketchSet({len(self)} sketches, k={self.k}, size={self.size}, mode={self.mode})"
@@ -1,11 +1,48 @@
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Iterator, Iterable, List, Literal, Tuple, Union, overload
-from urllib.parse import urlencode
-from urllib.request import urlopen
-from urllib.error import HTTPError
+import hashlib
+import heapq
+import html
+import logging
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from array import array
+from collections import deque
+from contextlib import nullcontext
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    BinaryIO, Deque, Dict, Iterator, Iterable, List, Literal, NamedTuple, Optional, TextIO, Tuple, Type, TypeVar,
+    Union, overload)
 
 from bioseq.config import SYMBOL
-from bioseq import DNA, RNA, Peptide, Sequence
+from bioseq import DNA, RNA, Alignment, Peptide, Sequence, metrics
+from bioseq._sequence import _complementTable, _gcWindows
+from bioseq.codon import CodonUsage
+from bioseq.mask import _maskChar, applyMask, dust, seg
+from bioseq.sketch import ANY, CANONICAL, NUCLEOTIDE, Sketch, SketchSet
+
+logger = logging.getLogger(__name__)
+
+
+def _fetchTimer(source: str):
+    """
+    Observe the time of a request to remote database if metrics is enabled
+    """
+    if not metrics.ENABLED:
+        return nullcontext()
+    metrics.inc("bioseq_fetch_requests_total", source=source)
+    return metrics.timer("bioseq_fetch_seconds", source=source)
+
+
+def _fetchFailed(kind: str, source: str):
+    """
+    Count the retried or failed request to remote database if metrics is enabled
+    """
+    if metrics.ENABLED:
+        metrics.inc(f"bioseq_fetch_{kind}_total", source=source)
 
 
 # TODO: Merge fetch function
@@ -27,24 +64,32 @@ def fetchENS(uid):
     Returns:
         DNA | List[DNA]: One or list of DNA sequence corresponding to UID
     """
+    # the network stack and pools are imported on demand to keep importing bioseq fast
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
     ens_db_url = "https://rest.ensembl.org/sequence/id/{}?content-type=text/plain"
 
     def fetch(uid):
         raw_info = ""
         for i in range(3):
             try:
-                print(
-                    f"[Try {i + 1}/3]Fetching {uid} from Ensemble REST API...")
-                raw_info = urlopen(ens_db_url.format(uid)).read().decode()
+                logger.info("[Try %d/3]Fetching %s from Ensemble REST API...", i + 1, uid)
+                with _fetchTimer("ensembl"):
+                    raw_info = urlopen(ens_db_url.format(uid)).read().decode()
                 break
             except HTTPError as e:
                 if e.code == 400:
-                    print(f"{uid} not found")
+                    logger.warning("%s not found", uid)
+                    _fetchFailed("errors", "ensembl")
                     break
                 else:
-                    print(f"{uid} retry: {e}.")
+                    logger.warning("%s retry: %s.", uid, e)
+                    _fetchFailed("retries", "ensembl")
             except Exception as e:
-                print(e)
+                logger.error("Fetching %s failed: %s", uid, e)
+                _fetchFailed("errors", "ensembl")
                 break
         return DNA(raw_info, uid)
 
@@ -94,6 +139,11 @@ def fetchNCBI(uid):
         If uid is a list, the return is a list of Sequence(excluded the uid not found data on NCBI)
         without ensure sequence's type, else the return is a Sequence corresponding to UID.
     """
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import urlencode
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
     eutils_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?"
     eutils_post = {
         "db": "",               # database
@@ -121,12 +171,14 @@ def fetchNCBI(uid):
 
     def fetch(data: Dict) -> List[Sequence]:
         try:
-            print(f"Fetching {data['id']} from NCBI E-utilities...")
-            raw_info = urlopen(
-                eutils_url + urlencode(data)
-            ).read().decode()
+            logger.info("Fetching %s from NCBI E-utilities...", data["id"])
+            with _fetchTimer("ncbi"):
+                raw_info = urlopen(
+                    eutils_url + urlencode(data)
+                ).read().decode()
         except HTTPError as e:
-            print(e)
+            logger.error("Fetching %s failed: %s", data["id"], e)
+            _fetchFailed("errors", "ncbi")
             return [Sequence("")]
         else:
             return parseFasta(raw_info)
@@ -209,76 +261,726 @@ def loadFasta(filename, iterator=False):
             if seq:
                 yield Sequence(seq, info)
 
+    def iter_count(filename: str) -> Iterator[Sequence]:
+        records = 0
+        for records, seq in enumerate(iter_parse(filename), 1):
+            yield seq
+        _countFasta(filename, records)
+
     if iterator:
-        return iter_parse(filename)
+        return iter_count(filename) if metrics.ENABLED else iter_parse(filename)
     else:
         with open(filename, encoding="utf8") as f:
-            return parseFasta(f.read())
+            sequences = parseFasta(f.read())
+        if metrics.ENABLED:
+            _countFasta(filename, len(sequences))
+        return sequences
+
+
+def _countFasta(filename: str, records: int):
+    """
+    Count the bytes and records of parsed fasta file
+    """
+    metrics.inc("bioseq_fasta_bytes_total", os.path.getsize(filename), func="loadFasta")
+    metrics.inc("bioseq_fasta_records_total", records, func="loadFasta")
+
+
+S = TypeVar("S", bound=Sequence)
+# reference sequence of each worker process in applyVariantSets()
+_reference: Optional[Sequence] = None
+
+
+def _setReference(reference: Sequence):
+    global _reference
+    _reference = reference
+
+
+def _applyVariants(variants: List[Tuple[int, str, str]]) -> Sequence:
+    return _reference.apply_variants(variants)
+
+
+def applyVariantSets(reference: S,
+                     variant_sets: Iterable[Iterable[Tuple[int, str, str]]],
+                     workers: Optional[int] = None) -> List[S]:
+    """Apply each set of variants to the same reference in parallel processes,
+    the reference is only sent once to each process
+
+    Args:
+        reference(Sequence): Reference sequence, such as a chromosome
+        variant_sets(Iterable[Iterable[Tuple[int, str, str]]]): Variants of each sample,
+            see ``Sequence.apply_variants()``
+        workers(int): Number of processes, default is the number of CPUs, 1 to run in current process
+    Returns:
+        List[Sequence]: Sequence of each sample
+    """
+    if workers == 1:
+        return [reference.apply_variants(variants) for variants in variant_sets]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, initializer=_setReference, initargs=(reference,)) as executor:
+        return list(executor.map(_applyVariants, map(list, variant_sets)))
+
+
+def _openFasta(source: Union[str, TextIO]):
+    """
+    Open the fasta file by name, or use the opened text stream such as ``sys.stdin`` directly
+    """
+    if isinstance(source, str):
+        return open(source, encoding="utf8")
+    return nullcontext(source)
+
+
+def _readFastaLines(source: Union[str, TextIO]) -> Iterator[Tuple[int, str, str]]:
+    """
+    Read fasta line by line, yield (record index, info, upper case sequence line),
+    the header itself is yielded with an empty line, so a record without sequence is not lost
+    """
+    record, info = -1, ""
+    with _openFasta(source) as f:
+        for line in f:
+            if line.startswith(">"):
+                record += 1
+                info = line[1:].strip()
+                yield record, info, ""
+            elif line := line.strip():
+                yield record, info, line.upper()
+
+
+def _iterFastaChunks(source: Union[str, TextIO]) -> Iterator[Tuple[str, Iterator[str]]]:
+    """
+    Yield the info and the iterator of sequence lines of each record, without loading the whole record.
+    The lines should be consumed before moving to next record, a record without sequence has no line
+    """
+    for (_, info), lines in groupby(_readFastaLines(source), key=itemgetter(0, 1)):
+        yield info, filter(None, map(itemgetter(2), lines))
+
+
+def gcProfileFasta(filename: str,
+                   window: int = 1000,
+                   step: int = 1000) -> Iterator[Tuple[str, array, array]]:
+    """Calculate the GC percentage and GC skew of each sliding window for every record in a fasta file.
+    Records are read line by line, so a whole chromosome is never loaded into memory.
+
+    Args:
+        filename(str): the fasta file's name
+        window(int): Length of each window, the last incomplete window is dropped
+        step(int): Distance between the start of two adjacent windows
+    Returns:
+        Iterator[Tuple[str, array, array]]: info, GC percentage and GC skew of each window of each record
+    """
+    for info, lines in _iterFastaChunks(filename):
+        gc, skew = array("d"), array("d")
+        for g, c in _gcWindows(lines, window, step):
+            gc.append((g + c) / window)
+            skew.append((g - c) / (g + c) if g + c else 0.)
+        yield info, gc, skew
+
+
+class FastaRecord(NamedTuple):
+    """
+    Location of a record in fasta file, same as the line of ``.fai`` file built by ``samtools faidx``
+    """
+    #: the first word of info
+    name: str
+    #: number of bases
+    length: int
+    #: byte offset of the first base
+    offset: int
+    #: bases of each line
+    line_bases: int
+    #: bytes of each line, include the newline
+    line_width: int
+
+    def locate(self, position: int) -> int:
+        """
+        Byte offset of the base at position in the file
+        """
+        if not self.line_bases:
+            return self.offset
+        return self.offset + position // self.line_bases * self.line_width + position % self.line_bases
+
+
+def indexFasta(filename: str, save: bool = True) -> List[FastaRecord]:
+    """Build the index of a fasta file in one pass, the index file is compatible with ``samtools faidx``.
+    All lines of a record must have same length except the last one.
+
+    Args:
+        filename(str): the fasta file's name
+        save(bool): Save the index to ``filename + ".fai"``
+    Returns:
+        List[FastaRecord]: Location of each record
+    """
+    records = []
+    name, length, offset, line_bases, line_width = "", 0, 0, 0, 0
+    ended = False   # a line shorter than others is read, it must be the last line
+    position = 0
+    with open(filename, "rb") as f:
+        for line in f:
+            if line.startswith(b">"):
+                if position:
+                    records.append(FastaRecord(name, length, offset, line_bases, line_width))
+                name = (line[1:].split(maxsplit=1) or [b""])[0].decode("utf8")
+                length, offset, line_bases, line_width = 0, position + len(line), 0, 0
+                ended = False
+            else:
+                bases = len(line.rstrip())
+                if bases and ended:
+                    raise ValueError(f"Lines of {name} have different length, can't be indexed")
+                if bases and not line_bases:
+                    line_bases, line_width = bases, len(line)
+                ended = bases != line_bases or len(line) != line_width
+                length += bases
+            position += len(line)
+    if position:
+        records.append(FastaRecord(name, length, offset, line_bases, line_width))
+
+    if save:
+        with open(filename + ".fai", "w", encoding="utf8") as f:
+            for record in records:
+                f.write("\t".join(map(str, record)) + "\n")
+    return records
+
+
+def loadFastaIndex(filename: str) -> List[FastaRecord]:
+    """Load the index of fasta file, the index is built by one pass of the file if ``filename + ".fai"`` not exists
+
+    Args:
+        filename(str): the fasta file's name
+    Returns:
+        List[FastaRecord]: Location of each record
+    """
+    try:
+        with open(filename + ".fai", encoding="utf8") as f:
+            return [FastaRecord(name, *map(int, fields[:4]))
+                    for name, *fields in (line.rstrip("\n").split("\t") for line in f)]
+    except FileNotFoundError:
+        return indexFasta(filename, save=False)
+
+
+def _fastaHeader(f: BinaryIO, offset: int) -> bytes:
+    """
+    Read the header line before the first base of a record at offset, without ">" and newline
+    """
+    start, buffer = offset, b""
+    while start > 0:
+        start = max(0, start - 4096)
+        f.seek(start)
+        buffer = f.read(offset - start)
+        line_start = buffer.rfind(b"\n>", 0, len(buffer) - 1)
+        if line_start >= 0:
+            return buffer[line_start + 2:].rstrip()
+    return buffer[1:].rstrip()
+
+
+def reverseComplementFasta(filename: str,
+                           output: str,
+                           seq_type: Type[RNA] = DNA,
+                           line_width: Optional[int] = None,
+                           block_size: int = 1 << 20) -> int:
+    """Write the reverse complement of each record in a fasta file, info of records are kept.
+    Each record is read by blocks from its end by the index of fasta file,
+    so the memory is bounded by ``block_size`` even for a whole chromosome.
+    Lower case bases and IUPAC ambiguity codes are complemented, other chars are kept.
+
+    Args:
+        filename(str): the fasta file's name, indexed by ``samtools faidx`` or ``indexFasta()`` is faster
+        output(str): the output fasta file's name
+        seq_type(Type[RNA]): ``DNA`` or ``RNA``, the complement table to be used
+        line_width(int): Bases of each output line, default is same as the input
+        block_size(int): Bases read at one time
+    Returns:
+        int: The number of records
+    """
+    table = _complementTable(seq_type)
+    records = loadFastaIndex(filename)
+    with open(filename, "rb") as f, open(output, "wb") as out:
+        for record in records:
+            width = line_width or record.line_bases or 60
+            out.write(b">" + _fastaHeader(f, record.offset) + b"\n")
+            pending = bytearray()
+            end = record.length
+            while end > 0:
+                start = max(0, end - block_size)
+                f.seek(record.locate(start))
+                pending += f.read(record.locate(end) - record.locate(start)).translate(table, b"\r\n")[::-1]
+                full = len(pending) - len(pending) % width
+                if full:
+                    out.write(b"\n".join([pending[i: i + width] for i in range(0, full, width)]) + b"\n")
+                    del pending[:full]
+                end = start
+            if pending:
+                out.write(pending + b"\n")
+    return len(records)
+
+
+class _ExternalSorter:
+    """Sort fixed-size byte strings within a memory budget, the buffer is sorted and spilled to a temporary run file
+    when it's full, runs are merged by ``heapq.merge`` when iterated
+    """
+
+    def __init__(self, size: int, memory: int, directory: Optional[str] = None):
+        self.size = size
+        self.directory = directory
+        self.runs: List[BinaryIO] = []
+        #: the high-water mark of buffer in bytes
+        self.peak = 0
+        self._entry_bytes = sys.getsizeof(bytes(size)) + 8
+        self._limit = max(1, memory // self._entry_bytes)
+        self._buffer: List[bytes] = []
+
+    def add(self, entry: bytes):
+        self._buffer.append(entry)
+        if len(self._buffer) >= self._limit:
+            self._spill()
+
+    def _spill(self):
+        self.peak = max(self.peak, len(self._buffer) * self._entry_bytes)
+        self._buffer.sort()
+        run = tempfile.TemporaryFile(dir=self.directory)
+        run.write(b"".join(self._buffer))
+        run.seek(0)
+        self.runs.append(run)
+        self._buffer = []
+
+    def _read(self, run: BinaryIO) -> Iterator[bytes]:
+        size = self.size
+        while block := run.read(size << 12):
+            yield from (block[i: i + size] for i in range(0, len(block), size))
+
+    def __iter__(self) -> Iterator[bytes]:
+        if not self.runs:
+            self.peak = max(self.peak, len(self._buffer) * self._entry_bytes)
+            self._buffer.sort()
+            return iter(self._buffer)
+        if self._buffer:
+            self._spill()
+        return heapq.merge(*map(self._read, self.runs))
+
+    def close(self):
+        for run in self.runs:
+            run.close()
+        self.runs, self._buffer = [], []
+
+
+# digest of sequence, record index, offset and length of header in the header file
+_DIGEST_ENTRY = struct.Struct(">16sQQQ")
+# record index, offset and length of header to be merged into the record, or _DROPPED if the record is a duplicate
+_MERGE_ENTRY = struct.Struct(">QQQ")
+_DROPPED = (1 << 64) - 1
+
+
+class DedupStats(NamedTuple):
+    """
+    Report of ``dedupFasta()``
+    """
+    records: int
+    #: records written
+    unique: int
+    #: records merged into a previous record
+    duplicates: int
+    #: size of input file in bytes
+    input_bytes: int
+    seconds: float
+    #: sorted runs spilled to disk, 0 if all digests fit in memory
+    runs: int
+    #: high-water mark of digests buffered in memory, in bytes
+    peak_buffer: int
+    #: high-water mark of the resident memory of this process in bytes, 0 if unknown
+    peak_rss: int
+
+    @property
+    def throughput(self) -> float:
+        """
+        MB of input processed per second
+        """
+        return self.input_bytes / self.seconds / 1e6 if self.seconds else 0.
+
+
+def _peakRSS() -> int:
+    """
+    Max resident memory of this process in bytes, 0 if not supported by the platform
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def dedupFasta(filename: str,
+               output: str,
+               reverse_complement: bool = False,
+               seq_type: Type[RNA] = DNA,
+               separator: str = ";",
+               line_width: Optional[int] = 60,
+               memory: int = 1 << 28,
+               temp_dir: Optional[str] = None) -> DedupStats:
+    """Remove duplicated records of a fasta file larger than memory, records with same sequence ignoring case are
+    merged into the first one, whose info is joined with the infos of its duplicates.
+
+    Records are streamed by ``loadFasta(iterator=True)`` twice, only 16 bytes BLAKE2b digest of each sequence
+    and the location of its info are kept. When they exceed ``memory``, they are sorted and spilled to temporary
+    runs, which are merged by ``heapq.merge`` to find the duplicates. So the memory is bounded by ``memory``
+    and the longest record.
+
+    Args:
+        filename(str): the fasta file's name
+        output(str): the output fasta file's name, records are kept in the input order
+        reverse_complement(bool): A record is also a duplicate of its reverse complement
+        seq_type(Type[RNA]): ``DNA`` or ``RNA``, the complement table used by reverse_complement
+        separator(str): Joins the infos of merged records, "\x01" (Ctrl-A) for the style of NCBI nr
+        line_width(int): Bases of each output line, None to write a sequence in one line
+        memory(int): Bytes of digests buffered in memory before spilled to disk
+        temp_dir(str): Directory of the spilled runs, default is the system temporary directory
+    Returns:
+        DedupStats: Number of records and duplicates, throughput and memory high-water marks
+    """
+    start_time = time.perf_counter()
+    table = _complementTable(seq_type) if reverse_complement else None
+    digests = _ExternalSorter(_DIGEST_ENTRY.size, memory, temp_dir)
+    merges = _ExternalSorter(_MERGE_ENTRY.size, memory, temp_dir)
+    with tempfile.TemporaryFile(dir=temp_dir) as headers:
+        try:
+            # pass 1: digest records and save their infos
+            records = offset = 0
+            for records, record in enumerate(loadFasta(filename, iterator=True), 1):
+                digest = record.digest
+                if table is not None:
+                    reverse = record.seq.encode("utf8").translate(table)[::-1]
+                    digest = min(digest, hashlib.blake2b(reverse, digest_size=16).digest())
+                info = record.info.encode("utf8")
+                headers.write(info)
+                digests.add(_DIGEST_ENTRY.pack(digest, records - 1, offset, len(info)))
+                offset += len(info)
+
+            # records of a digest are sorted by index, the first one is kept
+            duplicates = 0
+            for _, group in groupby(digests, key=lambda entry: entry[:16]):
+                _, first, _, _ = _DIGEST_ENTRY.unpack(next(group))
+                for entry in group:
+                    _, index, offset, length = _DIGEST_ENTRY.unpack(entry)
+                    merges.add(_MERGE_ENTRY.pack(first, offset, length))
+                    merges.add(_MERGE_ENTRY.pack(index, 0, _DROPPED))
+                    duplicates += 1
+            runs, peak_buffer = len(digests.runs), digests.peak
+            digests.close()
+
+            # pass 2: write records not dropped, merge entries are sorted by record index
+            pending = iter(merges)
+            entry = next(pending, None)
+            with open(output, "w", encoding="utf8") as out:
+                for index, record in enumerate(loadFasta(filename, iterator=True)):
+                    infos, dropped = [record.info], False
+                    while entry is not None and (fields := _MERGE_ENTRY.unpack(entry))[0] == index:
+                        if fields[2] == _DROPPED:
+                            dropped = True
+                        else:
+                            headers.seek(fields[1])
+                            infos.append(headers.read(fields[2]).decode("utf8"))
+                        entry = next(pending, None)
+                    if dropped:
+                        continue
+                    seq = record.seq
+                    width = line_width or len(seq)
+                    out.write(">" + separator.join(infos) + "\n")
+                    out.write("".join(seq[i: i + width] + "\n" for i in range(0, len(seq), width)))
+            runs += len(merges.runs)
+            peak_buffer = max(peak_buffer, merges.peak)
+        finally:
+            digests.close()
+            merges.close()
+
+    stats = DedupStats(records, records - duplicates, duplicates, os.path.getsize(filename),
+                       time.perf_counter() - start_time, runs, peak_buffer, _peakRSS())
+    logger.info("Dedup %s: %d of %d records are unique, %.1f MB/s, %d runs spilled, peak buffer %d bytes",
+                filename, stats.unique, stats.records, stats.throughput, stats.runs, stats.peak_buffer)
+    return stats
+
+
+def maskFasta(source: Union[str, TextIO],
+              output: Union[str, TextIO],
+              seq_type: Type[Sequence] = DNA,
+              soft: bool = True,
+              line_width: Optional[int] = 60,
+              **options) -> Tuple[int, int]:
+    """Mask low complexity regions of each record in a fasta file, by DUST for ``DNA``/``RNA`` and SEG for others,
+    see ``bioseq.mask``. Records are read and written one by one, so a file larger than memory can be masked.
+
+    Args:
+        source(str|TextIO): the fasta file's name or an opened text stream such as ``sys.stdin``
+        output(str|TextIO): the output fasta file's name or an opened text stream such as ``sys.stdout``
+        seq_type(Type[Sequence]): Type of records, decides the method and the hard masking character
+        soft(bool): Convert regions to lower case, or replace them by ``config.MASK_CHAR`` if False
+        line_width(int): Residues of each output line, None to write a sequence in one line
+        options: Options of ``bioseq.mask.dust()`` or ``bioseq.mask.seg()``, such as window
+    Returns:
+        Tuple[int, int]: The number of records and masked residues
+    """
+    find = dust if issubclass(seq_type, RNA) else seg
+    char = _maskChar(seq_type)
+    records = masked = 0
+    with _openFasta(output) if not isinstance(output, str) else open(output, "w", encoding="utf8") as out:
+        for records, (info, lines) in enumerate(_iterFastaChunks(source), 1):
+            seq = "".join(lines)
+            regions = find(seq, **options)
+            masked += sum(end - start for start, end in regions)
+            seq = applyMask(seq, regions, soft, char)
+            width = line_width or len(seq) or 1
+            out.write(">" + info + "\n")
+            out.write("".join(seq[i: i + width] + "\n" for i in range(0, len(seq), width)))
+    return records, masked
+
+
+#: CSS class of match, mismatch and gap columns in html of ``formatAlign()``
+_HTML_CLASSES = ("match", "mismatch", "gap")
+
+
+def _sketchLines(lines: Iterable[str], k: int, size: int, mode: int, name: str, block_size: int) -> Sketch:
+    """
+    Sketch a record by blocks of lines, adjacent blocks are overlapped by k - 1 characters
+    """
+    sketch, block, length = Sketch([], k, size, mode, name), [], 0
+    for line in lines:
+        block.append(line)
+        length += len(line)
+        if length >= block_size:
+            text = "".join(block)
+            sketch = sketch.merge(Sketch.fromString(text, k, size, mode))
+            block, length = [text[-(k - 1):]] if k > 1 else [], k - 1
+    if block:
+        sketch = sketch.merge(Sketch.fromString("".join(block), k, size, mode))
+    return sketch
+
+
+def sketchFasta(filename: str,
+                k: int = 21,
+                size: int = 1000,
+                seq_type: Type[Sequence] = DNA,
+                canonical: bool = True,
+                per_record: bool = False,
+                block_size: int = 1 << 20) -> Union[Sketch, SketchSet]:
+    """MinHash sketch of k-mers in a fasta file, see ``bioseq.sketch``.
+    Records are read line by line and sketched by blocks, so a whole chromosome is never loaded into memory.
+
+    Args:
+        filename(str): the fasta file's name
+        k(int): Length of k-mer, no more than 32 for DNA and RNA
+        size(int): Max number of hashes kept by each sketch
+        seq_type(Type[Sequence]): DNA or RNA only hash k-mers of nucleotides, other types hash any k-mers
+        canonical(bool): For DNA and RNA, k-mer and its reverse complement have the same hash
+        per_record(bool): Sketch each record instead of the whole file
+        block_size(int): Characters of sequence sketched at once
+    Returns:
+        Sketch|SketchSet: Sketch of the file named by the file name, or sketches of records named by their info
+    """
+    if issubclass(seq_type, RNA):
+        mode = CANONICAL if canonical else NUCLEOTIDE
+    else:
+        mode = ANY
+    sketches = SketchSet(k=k, size=size, mode=mode)
+    for info, lines in _iterFastaChunks(filename):
+        sketches.append(_sketchLines(lines, k, size, mode, info, block_size))
+    if per_record:
+        return sketches
+    result = Sketch([], k, size, mode, os.path.basename(filename))
+    for sketch in sketches:
+        result = result.merge(sketch)
+    return result
+
+
+def _codonCounts(seqs: List[str]) -> bytes:
+    """
+    Merged codon histogram of a chunk of records, counted in worker process
+    """
+    return _codonUsageOf(seqs).counts.tobytes()
+
+
+def _codonUsageOf(seqs: Iterable[str]) -> CodonUsage:
+    usage = CodonUsage()
+    for seq in seqs:
+        usage += CodonUsage.fromString(seq)
+    return usage
+
+
+def _codonChunks(filenames: List[str], chunk_size: int) -> Iterator[List[str]]:
+    """
+    Records of fasta files grouped by about chunk_size bases
+    """
+    chunk, size = [], 0
+    for filename in filenames:
+        for _, lines in _iterFastaChunks(filename):
+            chunk.append("".join(lines))
+            size += len(chunk[-1])
+            if size >= chunk_size:
+                yield chunk
+                chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def codonUsageFasta(filenames: Union[str, Iterable[str]],
+                    workers: Optional[int] = None,
+                    chunk_size: int = 1 << 22) -> CodonUsage:
+    """Count codons of all coding sequences in fasta files, such as a transcriptome, see ``bioseq.codon``.
+    Records are streamed by chunks to worker processes, each returns a 64-bin histogram merged by this process,
+    so at most two chunks of each worker are in memory.
+
+    Args:
+        filenames(str|Iterable[str]): the fasta file's name or names, each record is counted from its first base
+        workers(int): Number of processes, default is the number of CPUs, 1 to count in current process
+        chunk_size(int): Bases of records sent to a worker at once
+    Returns:
+        CodonUsage: Codon counts of all records, named by the file name if only one file
+    """
+    filenames = [filenames] if isinstance(filenames, str) else list(filenames)
+    chunks = _codonChunks(filenames, chunk_size)
+    if workers == 1:
+        usage = _codonUsageOf(seq for chunk in chunks for seq in chunk)
+    else:
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        usage, workers = CodonUsage(), workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as executor:
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_codonCounts, chunk))
+                if len(pending) >= 2 * workers:
+                    usage += CodonUsage(array("q", pending.popleft().result()))
+            for future in pending:
+                usage += CodonUsage(array("q", future.result()))
+    usage.name = os.path.basename(filenames[0]) if len(filenames) == 1 else ""
+    return usage
+
+
+def _alignBlocks(sequence1: str, sequence2: str, line_width: int) -> Iterator[Tuple[int, str, str, List[int]]]:
+    """
+    Split two aligned sequences to blocks of line_width columns in one pass,
+    yield (start column, block of sequence1, block of sequence2, kind of each column),
+    kind is the index of match(0), mismatch(1) and gap(2)
+    """
+    length = min(len(sequence1), len(sequence2))
+    for start in range(0, length, line_width):
+        end = min(start + line_width, length)
+        query, subject = sequence1[start: end], sequence2[start: end]
+        kinds = [0 if a == b else 2 if a == "-" or b == "-" else 1 for a, b in zip(query, subject)]
+        yield start, query, subject, kinds
+
+
+def _groupSpacing(line: str, spacing: int) -> str:
+    """
+    Insert a space after each spacing chars
+    """
+    return " ".join([line[i: i + spacing] for i in range(0, len(line), spacing)])
+
+
+def _plainAlign(sequence1: str, sequence2: str, spacing: int, line_width: int, show_seq: bool,
+                starts: Tuple[int, int]) -> Iterator[str]:
+    symbols = SYMBOL["printAlign"]
+    for start, query, subject, kinds in _alignBlocks(sequence1, sequence2, line_width):
+        symbol_line = _groupSpacing("".join([symbols[kind] for kind in kinds]), spacing)
+        if show_seq:
+            yield f"{start + 1:>5} {_groupSpacing(query, spacing)}\n" \
+                  f"{'':>5} {symbol_line}\n" \
+                  f"{start + 1:>5} {_groupSpacing(subject, spacing)}\n\n"
+        else:
+            yield f"{start + 1:>5} {symbol_line}\n\n"
+
+
+def _blastAlign(sequence1: str, sequence2: str, spacing: int, line_width: int, show_seq: bool,
+                starts: Tuple[int, int]) -> Iterator[str]:
+    query_pos, subject_pos = starts
+    width = len(str(max(query_pos, subject_pos) + max(len(sequence1), len(sequence2))))
+    for _, query, subject, kinds in _alignBlocks(sequence1, sequence2, line_width):
+        query_end = query_pos + len(query) - query.count("-")
+        subject_end = subject_pos + len(subject) - subject.count("-")
+        middle = "".join(["|" if kind == 0 else " " for kind in kinds])
+        yield f"Query  {query_pos + 1:<{width}}  {query}  {query_end}\n" \
+              f"       {'':<{width}}  {middle}\n" \
+              f"Sbjct  {subject_pos + 1:<{width}}  {subject}  {subject_end}\n\n"
+        query_pos, subject_pos = query_end, subject_end
+
+
+def _htmlLine(line: str, kinds: List[int]) -> str:
+    """
+    Wrap each run of columns with same kind by a span
+    """
+    spans, start = [], 0
+    for kind, run in groupby(kinds):
+        end = start + len(list(run))
+        spans.append(f'<span class="{_HTML_CLASSES[kind]}">{html.escape(line[start: end])}</span>')
+        start = end
+    return "".join(spans)
+
+
+def _htmlAlign(sequence1: str, sequence2: str, spacing: int, line_width: int, show_seq: bool,
+               starts: Tuple[int, int]) -> Iterator[str]:
+    yield '<pre class="bioseq-alignment">\n'
+    for start, query, subject, kinds in _alignBlocks(sequence1, sequence2, line_width):
+        if show_seq:
+            yield f"{start + 1:>5} {_htmlLine(query, kinds)}\n" \
+                  f"{start + 1:>5} {_htmlLine(subject, kinds)}\n\n"
+        else:
+            symbols = "".join([SYMBOL["printAlign"][kind] for kind in kinds])
+            yield f"{start + 1:>5} {_htmlLine(symbols, kinds)}\n\n"
+    yield "</pre>\n"
+
+
+_ALIGN_FORMATS = {"plain": _plainAlign, "blast": _blastAlign, "html": _htmlAlign}
+
+
+def formatAlign(
+        sequence1: Union[str, Alignment],
+        sequence2: Optional[str] = None,
+        spacing: int = 10,
+        line_width: int = 30,
+        show_seq: bool = True,
+        style: str = "plain") -> Iterator[str]:
+    """
+    Format two aligned sequences block by block, each block is a string of line_width columns
+
+    Args:
+        sequence1(str|Alignment): Aligned sequence, or the ``Alignment`` returned by ``align(compact=True)``
+        sequence2(str): Aligned sequence, omitted if sequence1 is ``Alignment``
+        spacing(int):    A space each $spacing char, only used by "plain" style
+        line_width(int): the width of each line
+        show_seq(bool):   if False, only format the alignment result
+        style(str): "plain" for ``printAlign()``, "blast" for the pairwise format of BLAST,
+            or "html" for a ``<pre>`` block with spans of class "match", "mismatch" and "gap"
+    Returns:
+        Iterator[str]: Formatted blocks
+    """
+    starts = (0, 0)
+    if isinstance(sequence1, Alignment):
+        starts = (sequence1.query_start, sequence1.subject_start)
+        sequence1, sequence2 = sequence1.aligned()
+    elif sequence2 is None:
+        raise TypeError("sequence2 is required if sequence1 is not an Alignment")
+    if style not in _ALIGN_FORMATS:
+        raise ValueError(f"style should be one of {', '.join(_ALIGN_FORMATS)}")
+    return _ALIGN_FORMATS[style](sequence1, sequence2, spacing, line_width, show_seq, starts)
 
 
 def printAlign(
-        sequence1: str,
-        sequence2: str,
+        sequence1: Union[str, Alignment],
+        sequence2: Optional[str] = None,
         spacing: int = 10,
         line_width: int = 30,
-        show_seq: bool = True):
+        show_seq: bool = True,
+        style: str = "plain",
+        file: Optional[TextIO] = None):
     """
     Print two sequence by a pretty format
 
     Args:
-        sequence1(Iterator)
-        sequence2(Iterator)
+        sequence1(str|Alignment): Aligned sequence, or the ``Alignment`` returned by ``align(compact=True)``
+        sequence2(str): Aligned sequence, omitted if sequence1 is ``Alignment``
         spacing(int):    A space each $spacing char
         line_width(int): the width of each line
         show_seq(bool):   if False, only print the alignment result
+        style(str): "plain", "blast" or "html", see ``formatAlign()``
+        file(TextIO): Stream to write, default is ``sys.stdout``
     """
-    symbol_line = ""
-    format_seq1 = ""
-    format_seq2 = ""
-    count = 0
-    length = len(sequence1) if len(sequence1) < len(
-        sequence2) else len(sequence2)
-    match_symbol, mismatch_symbol, gap_symbol = SYMBOL["printAlign"]
-
-    for i in range(length):
-        base1 = sequence1[i]
-        base2 = sequence2[i]
-        if base1 == base2:
-            symbol_line += match_symbol
-        elif base1 == "-" or base2 == "-":
-            symbol_line += gap_symbol
-        else:
-            symbol_line += mismatch_symbol
-
-        format_seq1 += base1
-        format_seq2 += base2
-        count += 1
-
-        if count % spacing == 0:
-            format_seq1 += " "
-            format_seq2 += " "
-            symbol_line += " "
-        if count % line_width == 0:
-            count = 0
-
-    space_num = 0
-    space_each_line = line_width // spacing
-
-    for i in range(0, length, line_width):
-        start = i + space_num
-        end = start + line_width + space_each_line
-        space_num += space_each_line
-        if show_seq:
-            print(f"{i + 1:>5}", end=" ")
-            print(format_seq1[start: end])
-
-            print(f" " * 5, end=" ")
-            print(symbol_line[start: end])
-
-            print(f"{i + 1:>5}", end=" ")
-            print(format_seq2[start: end])
-        else:
-            print(f"{i + 1:>5}", end=" ")
-            print(symbol_line[start: end])
-
-        print()
+    (sys.stdout if file is None else file).writelines(
+        formatAlign(sequence1, sequence2, spacing, line_width, show_seq, style))
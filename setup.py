@@ -43,6 +43,9 @@ setup(
     },
     # exclude_package_data={},
     include_package_data=False,
+    entry_points={
+        "console_scripts": ["bioseq=bioseq.cli:main"]
+    },
 )
 
 # reference https://setuptools.pypa.io/en/latest/userguide/datafiles.html
@@ -0,0 +1,33 @@
+import unittest
+
+from bioseq import DNA, Alignment
+
+
+class TestAlignment(unittest.TestCase):
+    def test_global(self):
+        result = DNA("ATCGATCG").align("ATCTTCG", compact=True)
+        self.assertIsInstance(result, Alignment)
+        self.assertEqual(result.cigar, "3=1I1X3=")
+        self.assertEqual(result.operations, [(3, "="), (1, "I"), (1, "X"), (3, "=")])
+        self.assertEqual((result.matches, result.mismatches, result.insertions, result.deletions),
+                         (6, 1, 1, 0))
+        self.assertEqual(result.gap_opens, 1)
+        self.assertEqual((result.query_start, result.query_end), (0, 8))
+        self.assertEqual(result.length, 8)
+        self.assertEqual(result.identity, 0.75)
+        self.assertEqual(tuple(result), DNA("ATCGATCG").align("ATCTTCG"))
+
+    def test_local(self):
+        query, subject = DNA("GGGATCGATCGTT"), "CCATCGTTCGAA"
+        result = query.align(subject, mode=2, compact=True)
+        self.assertEqual((result.query_start, result.query_end), (7, 13))
+        self.assertEqual((result.subject_start, result.subject_end), (2, 8))
+        self.assertEqual(result.aligned(), query.align(subject, mode=2)[:2])
+        self.assertAlmostEqual(result.query_coverage, 6 / 13)
+        self.assertEqual(result.subject_coverage, 0.5)
+
+    def test_empty(self):
+        result = DNA("").align("A", compact=True)
+        self.assertEqual(result.cigar, "1D")
+        self.assertEqual(result.aligned(), ("-", "A"))
+        self.assertEqual(DNA("").align("", mode=2, compact=True).identity, 0.)
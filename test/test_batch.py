@@ -0,0 +1,57 @@
+import unittest
+
+from bioseq import DNA, Peptide, SequenceBatch, peptide_hydropathy, peptide_pI
+from test.test_bioseq import TEST_DNA, TEST_PEPTIDE
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.peptides = [Peptide(TEST_PEPTIDE[i:i + 40]) for i in range(0, len(TEST_PEPTIDE), 40)]
+
+    def test_peptide_hydropathy(self):
+        profiles = peptide_hydropathy(self.peptides, window_size=7, scale="Eisenberg")
+        self.assertEqual(len(profiles), len(self.peptides))
+        for peptide, profile in zip(self.peptides, profiles):
+            self.assertEqual(profile, peptide.getHphob(window_size=7, scale="Eisenberg"))
+
+    def test_peptide_pI(self):
+        peptides = self.peptides + [Peptide("KKDE"), Peptide("kkde"), Peptide("")]
+        self.assertEqual(peptide_pI(peptides), [p.pI for p in peptides])
+        self.assertEqual(peptide_pI(["KKDE"]), [Peptide("KKDE").pI])
+
+
+class TestSequenceBatch(unittest.TestCase):
+    def setUp(self):
+        self.dna = [DNA("ATCGGC", "a"), DNA("ttaa", "b"), DNA("", "c"), DNA("GGGA", "d")]
+        self.batch = SequenceBatch(self.dna, DNA)
+
+    def test_views(self):
+        self.assertEqual(len(self.batch), 4)
+        self.assertIsInstance(self.batch[1], DNA)
+        self.assertEqual(self.batch[1], "TTAA")
+        self.assertEqual(self.batch[-1].info, "d")
+        self.assertEqual([seq.info for seq in self.batch[1:3]], ["b", "c"])
+
+    def test_properties(self):
+        self.assertEqual(list(self.batch.lengths), [6, 4, 0, 4])
+        self.assertEqual(list(self.batch.composition["G"]), [2, 0, 0, 3])
+        self.assertEqual(list(self.batch.GC), [0.6667, 0., 0., 0.75])
+        for weight, dna in zip(self.batch.weight, self.dna):
+            if dna.length:
+                self.assertAlmostEqual(weight, dna.weight)
+
+    def test_filter(self):
+        batch = self.batch.filter([length > 0 for length in self.batch.lengths])
+        self.assertEqual([seq.info for seq in batch], ["a", "b", "d"])
+        batch = self.batch.filter(lambda seq: seq.GC > 0.5)
+        self.assertEqual([seq.info for seq in batch], ["a", "d"])
+
+    def test_fromFasta(self):
+        with open("test.fasta", "w") as f:
+            f.write(TEST_DNA * 2)
+        batch = SequenceBatch.fromFasta("test.fasta", DNA)
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch[1], "".join(TEST_DNA.splitlines()[1:]).upper())
+
+        import os
+        os.remove("test.fasta")
@@ -1,6 +1,6 @@
 from bioseq import DNA, RNA, Peptide
 from bioseq._sequence import Sequence
-from bioseq.config import AlignmentConfig, MW
+from bioseq.config import AlignmentConfig, HYDROPATHY, MW
 import unittest
 
 
@@ -34,6 +34,10 @@ TEST_PEPTIDE = \
 "TFNSIMKCDVDIRKDLYANTVLSGGTTMYPGIADRMQKEITALAPSTMKIKIIAPPERKYSVWIGGSILA" \
 "SLSTFQQMWISKQEYDESGPSIVHRKCF"
 
+def cached_attrs(seq):
+    return [attr for cls in type(seq).__mro__ for attr in getattr(cls, "__slots__", ())]
+
+
 class TestBioseq(unittest.TestCase):
     def test_seq_add(self):
         self.assertEqual(DNA("ATCG"), DNA("ATCG"))
@@ -59,6 +63,59 @@ class TestBioseq(unittest.TestCase):
         self.assertEqual(seq.mutation([0, 1, 2], "A"), "AAAG")
         self.assertEqual(seq.mutation("A", "C"), "CCCG")
         self.assertEqual(seq.mutation(0, "ATC"), "ATCG")
+        position = [1, 3]
+        self.assertEqual(seq.mutation(position, "G"), "AGCG")
+        self.assertEqual(position, [1, 3])
+
+    def test_seq_mutation_cache(self):
+        pep = Peptide(TEST_PEPTIDE)
+        pep.composition, pep.weight, pep.pI, pep.getHphob(window_size=5)
+        pep.mutation([3, 20], "W")
+        pep.mutation(8, "KR")
+        pep.mutation("L", "A")
+        fresh = Peptide(pep.seq)
+        self.assertEqual(pep.composition, fresh.composition)
+        self.assertAlmostEqual(pep.weight, fresh.weight)
+        self.assertEqual(pep.pI, fresh.pI)
+        self.assertEqual(pep.getHphob(window_size=5), fresh.getHphob(window_size=5))
+        pep.mutation(0, "")
+        self.assertEqual(pep.composition, Peptide(pep.seq).composition)
+
+    def test_seq_edit(self):
+        seq = DNA("ACGTACGTAC")
+        seq.composition
+        with seq.edit() as editor:
+            editor.mutation([0, 4], "G").variant(9, "C", "CTT")
+        self.assertEqual(seq, "GCGTGCGTACTT")
+        self.assertEqual(seq.composition, DNA(seq.seq).composition)
+        with self.assertRaises(KeyError):
+            with seq.edit() as editor:
+                editor.mutation(0, "A")
+                raise KeyError
+        self.assertEqual(seq, "GCGTGCGTACTT")
+
+    def test_seq_apply_variants(self):
+        seq = DNA("ACGTACGTAC", "ref")
+        variants = [(9, "C", "A"), (2, "G", "GTT"), (5, "cg", "C"), (0, "", "NN")]
+        result = seq.apply_variants(variants)
+        self.assertIsInstance(result, DNA)
+        self.assertEqual(result, "NNACGTTTACTAA")
+        self.assertEqual(result.info, "ref")
+        self.assertEqual(seq, "ACGTACGTAC")
+        with self.assertRaises(ValueError):
+            seq.apply_variants([(1, "A", "T")])
+        with self.assertRaises(ValueError):
+            seq.apply_variants([(1, "CGT", "C"), (2, "G", "A")])
+
+    def test_seq_pickle(self):
+        import pickle
+        seq = DNA("ATCG", "test")
+        seq.composition
+        copied = pickle.loads(pickle.dumps(seq))
+        self.assertIsInstance(copied, DNA)
+        self.assertEqual(copied, seq)
+        self.assertEqual(copied.info, "test")
+        self.assertIsNone(copied._composition)
 
     def test_seq_trans(self):
         seq = Sequence("")
@@ -74,6 +131,12 @@ class TestDNA(unittest.TestCase):
     def test_GC(self):
         self.assertEqual(DNA("ATCG").GC, 0.5)
 
+    def test_gcProfile(self):
+        seq = DNA("GGGGCCAATT")
+        self.assertEqual(list(seq.gcProfile(4, 2)), [1., 1., 0.5, 0.])
+        self.assertEqual(list(seq.gcSkew(4, 3)), [1., -1 / 3, 0.])
+        self.assertEqual(round(self.dna.gcProfile(self.dna.length, 1)[0], 4), self.dna.GC)
+
     def test_weight(self):
         self.assertEqual(RNA("AUCG").weight, sum(MW["RNA"].values()) - 3 * 18)
         self.assertEqual(DNA("ATCG").weight, sum(MW["DNA"].values()) - 3 * 18)
@@ -93,6 +156,8 @@ class TestDNA(unittest.TestCase):
     def test_complemented(self):
         seq = DNA("ATCG")
         self.assertEqual(seq.complement, "CGAT")
+        self.assertEqual(DNA("ANRYKMBDGC").complement, "GCHVKMRYNT")
+        self.assertEqual(RNA("AUCG").complement, "CGAU")
 
     def test_translate(self):
         self.assertEqual(str(self.dna.translate()), str(self.dna).replace("T", "U"))
@@ -108,7 +173,7 @@ class TestDNA(unittest.TestCase):
         self.assertEqual(self.dna.peptide[0], TEST_PEPTIDE)
 
     def test_reset(self):
-        attrs = [attr for attr in self.dna.__dict__ 
+        attrs = [attr for attr in cached_attrs(self.dna)
                 if attr not in ["_seq", "info"]]
         for attr in attrs:
             setattr(self.dna, attr, "test")
@@ -116,6 +181,12 @@ class TestDNA(unittest.TestCase):
         for attr in attrs:
             self.assertTrue(not getattr(self.dna, attr))
 
+    def test_cache_zero(self):
+        dna = DNA("AATT")
+        self.assertEqual(dna.GC, 0)
+        self.assertIsNotNone(dna._GC)
+        self.assertFalse(hasattr(dna, "__dict__"))
+
 
 class TestPeptide(unittest.TestCase):
     def setUp(self) -> None:
@@ -127,14 +198,27 @@ class TestPeptide(unittest.TestCase):
         self.assertLessEqual(self.pep.pI, 7)
         self.assertTrue(self.pep._pI)
 
+    def test_chargeCurve(self):
+        curve = self.pep.chargeCurve([3, self.pep.pI, 11])
+        self.assertEqual(curve[0], self.pep.chargeInpH(3))
+        self.assertAlmostEqual(curve[1], 0, places=1)
+        self.assertLess(curve[2], 0)
+
     def test_Hphob(self):
         import sys
         win_size = 6
         self.assertEqual(len(self.pep.getHphob(window_size=win_size)), self.pep.length - win_size)
-        self.assertTrue(self.pep._Hphob_list)
+        self.assertTrue(self.pep._Hphob)
+
+    def test_Hphob_window(self):
+        result = self.pep.getHphob(window_size=9)
+        self.assertEqual(len(result), self.pep.length - 8)
+        self.assertEqual(len(self.pep.getHphob(window_size=5)), self.pep.length - 4)
+        self.assertEqual(result[0], round(sum(HYDROPATHY[aa] for aa in TEST_PEPTIDE[:9]) / 9, 3))
+        self.assertNotEqual(self.pep.getHphob(window_size=9, scale="HW"), result)
 
     def test_reset(self):
-        attrs = [attr for attr in self.pep.__dict__ 
+        attrs = [attr for attr in cached_attrs(self.pep)
                 if attr not in ["_seq", "info"]]
         for attr in attrs:
             setattr(self.pep, attr, "test")
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from bioseq import DNA, RNA, Alignment, AlignmentCache, metrics
+from bioseq.config import AlignmentConfig
+
+
+class TestAlignmentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = AlignmentConfig.CACHE = AlignmentCache(maxsize=2)
+        self.scores = (AlignmentConfig.MATCH, AlignmentConfig.MISMATCH)
+
+    def tearDown(self):
+        AlignmentConfig.CACHE = None
+        AlignmentConfig.MATCH, AlignmentConfig.MISMATCH = self.scores
+
+    def test_memory(self):
+        query = DNA("ATCGATCG")
+        result = query.align("ATCTTCG")
+        self.assertIs(query.align(DNA("ATCTTCG")), result)
+        self.assertEqual(self.cache.stats()[:3], (1, 1, 0))
+        # mode, compact and scores are parts of key
+        self.assertIsNot(query.align("ATCTTCG", mode=2), result)
+        self.assertIsInstance(query.align("ATCTTCG", compact=True), Alignment)
+        AlignmentConfig.MISMATCH = -1
+        self.assertIsNot(query.align("ATCTTCG"), result)
+        self.assertEqual(self.cache.stats().misses, 4)
+        self.assertEqual(len(self.cache), 2)
+
+        AlignmentConfig.CACHE = None
+        self.assertEqual(query.align("ATCTTCG"), DNA("ATCGATCG").align("ATCTTCG"))
+        self.assertEqual(self.cache.stats().hits, 1)
+
+    def test_sequence_replaced(self):
+        rna = RNA("CCCAUGAAAUAGCCC")
+        before = rna.align("AUGAAAUAG")
+        rna.getOrf(replace=True)
+        self.assertEqual(rna.seq, "AUGAAAUAG")
+        self.assertEqual(rna.orf, ["AUGAAAUAG"])
+        after = rna.align("AUGAAAUAG")
+        self.assertIsNot(after, before)
+        self.assertEqual(after[2], 9 * AlignmentConfig.MATCH)
+
+    def test_lru(self):
+        query = DNA("ACGT")
+        first = query.align("ACG")
+        query.align("AGT")
+        self.assertIs(query.align("ACG"), first)
+        query.align("CGT")     # evict "AGT"
+        self.assertIs(query.align("ACG"), first)
+        query.align("AGT")
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (2, 4, 2))
+        self.assertAlmostEqual(stats.hit_rate, 1 / 3)
+        self.cache.clear()
+        self.assertEqual(self.cache.stats(), (0, 0, 0, 0, 2))
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "alignments.sqlite")
+            AlignmentConfig.CACHE = AlignmentCache(path=path)
+            query = DNA("GGGATCGATCGTT")
+            result = query.align("CCATCGTTCGAA", mode=2)
+            alignment = query.align("CCATCGTTCGAA", compact=True)
+            AlignmentConfig.CACHE.close()
+
+            # another cache sharing the file, such as in another process
+            shared = AlignmentConfig.CACHE = AlignmentCache(path=path)
+            metrics.reset()
+            with metrics.profile("cache") as profile:
+                self.assertEqual(query.align("CCATCGTTCGAA", mode=2), result)
+                self.assertEqual(tuple(query.align("CCATCGTTCGAA", compact=True)), tuple(alignment))
+                query.align("CCATCGTTCGAA", compact=True)
+            self.assertEqual(shared.stats()[:3], (3, 0, 2))
+            self.assertEqual(profile.counters, {"bioseq_align_cache_hits_total": 3})
+
+            shared.clear(disk=True)
+            query.align("CCATCGTTCGAA", mode=2)
+            self.assertEqual(shared.stats()[:3], (0, 1, 0))
+            shared.close()
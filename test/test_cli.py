@@ -0,0 +1,100 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from bioseq.cli import main
+
+FASTA = ">s1 first\nATGAAATTTTAGCC\nATGCCC\n>s2\nCCATGGGGTAA\n"
+
+
+def run(argv, stdin=FASTA):
+    output = io.StringIO()
+    with mock.patch("sys.stdin", io.StringIO(stdin)), redirect_stdout(output):
+        status = main(argv)
+    return status, output.getvalue()
+
+
+class TestCli(unittest.TestCase):
+    def test_stats(self):
+        status, output = run(["stats"])
+        self.assertEqual(status, 0)
+        lines = [line.split("\t") for line in output.splitlines()]
+        self.assertEqual(lines[0], ["name", "length", "weight", "gc"])
+        self.assertEqual([line[:2] for line in lines[1:]], [["s1", "20"], ["s2", "11"]])
+        self.assertEqual(lines[1][3], "0.4000")
+        self.assertEqual(run(["stats", "--type", "protein"], ">x\nACDX\n")[1].splitlines()[1], "x\t4\tNA\t3.75")
+
+    def test_translate(self):
+        self.assertEqual(run(["translate", "--to-stop"])[1], ">s1 first\nMKF\n>s2\nPWG\n")
+        self.assertEqual(run(["translate", "--frame", "2", "-w", "3"])[1], ">s1 first\n*NF\nSHA\n>s2\nHGV\n")
+        self.assertEqual(run(["translate"], ">n\nATGNNNTAA\n")[1], ">n\nMX*\n")
+
+    def test_revcomp(self):
+        self.assertEqual(run(["revcomp", "-w", "0"])[1], ">s1 first\nGGGCATGGCTAAAATTTCAT\n>s2\nTTACCCCATGG\n")
+
+    def test_empty_record(self):
+        records = ">a\nACGT\n>empty\n>b\nTT\n"
+        self.assertEqual(run(["revcomp"], records)[1], ">a\nACGT\n>empty\n>b\nAA\n")
+        self.assertEqual(run(["translate"], records)[1], ">a\nT\n>empty\n>b\n")
+        self.assertEqual([line.split("\t")[:2] for line in run(["stats"], records)[1].splitlines()[1:]],
+                         [["a", "4"], ["empty", "0"], ["b", "2"]])
+
+    def test_orf(self):
+        self.assertEqual(run(["orf", "--peptide"])[1], ">s1_orf1 s1 first\nMKF\n>s2_orf1 s2\nMG\n")
+
+    def test_align(self):
+        with tempfile.TemporaryDirectory() as directory:
+            subject = os.path.join(directory, "subject.fasta")
+            with open(subject, "w") as f:
+                f.write(FASTA)
+            status, output = run(["align", subject, "--min-score", "20"])
+        self.assertEqual(status, 0)
+        self.assertEqual(output.splitlines()[1:], ["s1\ts1\t40\t1.0000\t0\t20\t0\t20\t20=",
+                                                   "s2\ts2\t22\t1.0000\t0\t11\t0\t11\t11="])
+
+    def test_threads(self):
+        records = "".join(f">r{i}\n{'ATGAAACCC' * (i % 7 + 1)}TAG\n" for i in range(50))
+        for command in (["translate"], ["stats"], ["orf"]):
+            expected = run(command, records)[1]
+            self.assertEqual(run(command + ["--threads", "2", "--batch-size", "3"], records)[1], expected)
+
+    def test_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.fasta")
+            with open(filename, "w") as f:
+                f.write(FASTA)
+            status, output = run(["index", filename])
+            self.assertTrue(os.path.exists(filename + ".fai"))
+        self.assertEqual(status, 0)
+        self.assertEqual(output, f"{filename}\ts1\t20\n{filename}\ts2\t11\n")
+
+    def test_error(self):
+        with mock.patch("sys.stderr", io.StringIO()) as stderr:
+            self.assertEqual(run(["stats", "not_exists.fasta"])[0], 1)
+        self.assertIn("bioseq stats", stderr.getvalue())
+
+    def test_module(self):
+        result = subprocess.run([sys.executable, "-m", "bioseq", "revcomp"], input=FASTA,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout, ">s1 first\nGGGCATGGCTAAAATTTCAT\n>s2\nTTACCCCATGG\n")
+
+    def test_lazy_import(self):
+        heavy = ["sqlite3", "multiprocessing", "concurrent.futures", "urllib.request", "bioseq.cache", "bioseq.shared"]
+        code = f"import sys, bioseq.cli, bioseq.utils; print([m for m in {heavy!r} if m in sys.modules])"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+        import bioseq
+        from bioseq.index import SequenceIndex
+        self.assertIs(bioseq.SequenceIndex, SequenceIndex)
+        self.assertIn("SeedIndex", dir(bioseq))
+        with self.assertRaises(AttributeError):
+            bioseq.NotExists
+
+
+if __name__ == "__main__":
+    unittest.main()
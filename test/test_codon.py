@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from bioseq import DNA, RNA, CodonUsage
+from bioseq.codon import CODONS
+from bioseq.utils import codonUsageFasta
+
+
+class TestCodonUsage(unittest.TestCase):
+    def test_count(self):
+        usage = DNA("ATGAAAAAGAAATTTNNNTAA").codonUsage()
+        self.assertEqual(usage.total, 6)
+        self.assertEqual((usage["AAA"], usage["AAG"], usage["UUU"], usage["ATG"], usage["UAA"]), (2, 1, 1, 1, 1))
+        self.assertEqual(usage, RNA("AUGAAAAAGAAAUUUNNNUAA").codonUsage())
+        self.assertEqual(CodonUsage.fromString("acgu"), CodonUsage.fromString("ACG"))
+        self.assertEqual(len(CODONS), 64)
+        self.assertEqual(CODONS[:2], ("AAA", "AAC"))
+        self.assertEqual((usage + usage)["AAA"], 4)
+        self.assertAlmostEqual(usage.frequency(per_thousand=True)["AAA"], 1000 / 3)
+        self.assertRaises(ValueError, CodonUsage, [1, 2])
+
+    def test_rscu(self):
+        rscu = DNA("AAAAAAAAGTTTTTC").RSCU()
+        self.assertAlmostEqual(rscu["AAA"], 4 / 3)
+        self.assertAlmostEqual(rscu["AAG"], 2 / 3)
+        self.assertEqual((rscu["UUU"], rscu["UUC"]), (1, 1))
+        self.assertEqual((rscu["GGG"], rscu["UAA"]), (0, 0))
+
+    def test_cai(self):
+        reference = DNA("AAAAAAAAAAAGCTGCTGCTGCTGCTTATG").codonUsage()
+        weights = reference.weights()
+        self.assertEqual(weights["AAA"], 1)
+        self.assertAlmostEqual(weights["AAG"], 1 / 3)
+        # absent codons are weighted by pseudo count
+        self.assertAlmostEqual(weights["CUA"], 0.5 / 4)
+        self.assertNotIn("AUG", weights)
+        self.assertAlmostEqual(DNA("AAAATGCTG").CAI(reference), 1)
+        self.assertAlmostEqual(DNA("AAGCTTATG").CAI(reference), (1 / 3 * 1 / 4) ** 0.5)
+        self.assertAlmostEqual(DNA("AAGAAA").CAI({"AAA": 1, "AAG": 0.25}), 0.5)
+        self.assertEqual(DNA("ATGTGG").CAI(reference), 0)
+
+    def test_codonUsageFasta(self):
+        records = ["ATGAAAAAGTAA", "AUGUUUUUC", "ATGNNNGGG"]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "cds.fasta")
+            with open(filename, "w") as f:
+                f.write("".join(f">cds{i}\n{seq[:5]}\n{seq[5:]}\n" for i, seq in enumerate(records)))
+            expected = CodonUsage()
+            for seq in records:
+                expected += CodonUsage.fromString(seq)
+            for workers, chunk_size in ((1, 1 << 22), (2, 1), (2, 100)):
+                usage = codonUsageFasta(filename, workers=workers, chunk_size=chunk_size)
+                self.assertEqual(usage, expected)
+                self.assertEqual(usage.name, "cds.fasta")
+            self.assertEqual(codonUsageFasta([filename, filename], workers=1).total, 2 * expected.total)
+
+
+if __name__ == "__main__":
+    unittest.main()
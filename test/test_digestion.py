@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from concurrent.futures import ProcessPoolExecutor
+
+from bioseq import Peptide, PeptideMassIndex
+from bioseq.digestion import cleavageSites
+
+
+def _count(filename: str, mass: float) -> int:
+    with PeptideMassIndex.load(filename) as index:
+        return index.count(mass, ppm=10)
+
+
+class TestCleave(unittest.TestCase):
+    def test_trypsin(self):
+        peptide = Peptide("MKPLARGGKAAR")
+        # no cleavage before P
+        self.assertEqual(cleavageSites(peptide.seq), [0, 6, 9, 12])
+        fragments = peptide.cleave(missed_cleavages=0)
+        self.assertEqual([p.seq for p in fragments], ["MKPLAR", "GGK", "AAR"])
+        self.assertEqual([p.info for p in fragments], ["0-6", "6-9", "9-12"])
+        fragments = peptide.cleave(missed_cleavages=1)
+        self.assertEqual([p.seq for p in fragments], ["MKPLAR", "MKPLARGGK", "GGK", "GGKAAR", "AAR"])
+        self.assertEqual(len(peptide.cleave(missed_cleavages=2)), 6)
+
+    def test_options(self):
+        peptide = Peptide("AADKAAD")
+        self.assertEqual([p.seq for p in peptide.cleave("asp-n", 0)], ["AA", "DKAA", "D"])
+        self.assertEqual([p.seq for p in peptide.cleave("lys-c", 1, min_length=4)], ["AADK", "AADKAAD"])
+        self.assertEqual([p.seq for p in peptide.cleave("lys-c", 1, max_length=4)], ["AADK", "AAD"])
+        self.assertEqual(Peptide("").cleave(), [])
+
+
+class TestPeptideMassIndex(unittest.TestCase):
+    def setUp(self):
+        self.proteins = [Peptide("MKWVTFISLLLLFSSAYSRGVFRR", "ALBU"), Peptide("GLSDGEWQQVLNVWGKVEADIAGHGQEVLIR", "MYG"),
+                         Peptide("AXXXXKLLLLLLK", "UNKNOWN")]
+        self.index = PeptideMassIndex(self.proteins, missed_cleavages=1, min_length=4)
+
+    def test_build(self):
+        masses = list(self.index.masses)
+        self.assertEqual(masses, sorted(masses))
+        self.assertEqual(self.index.names, ["ALBU", "MYG", "UNKNOWN"])
+        sequences = {hit.sequence for mass in masses for hit in self.index.lookup(mass, 1e-6)}
+        expected = {p.seq for protein in self.proteins for p in protein.cleave(missed_cleavages=1, min_length=4)}
+        # fragments with unknown residues are skipped
+        self.assertEqual(sequences, {seq for seq in expected if "X" not in seq})
+
+    def test_lookup(self):
+        # monoisotopic mass of GLSDGEWQQVLNVWGK
+        hits = self.index.lookup(1814.8952, tolerance=0.01)
+        self.assertEqual([(hit.name, hit.start, hit.end, hit.sequence) for hit in hits],
+                         [("MYG", 0, 16, "GLSDGEWQQVLNVWGK")])
+        self.assertEqual(self.index.lookup(1814.95, ppm=10), [])
+        self.assertEqual(len(self.index.lookup(1814.95, ppm=100)), 1)
+        self.assertEqual(self.index.lookupMany([1814.8952, 0.]), [hits, []])
+
+    def test_average(self):
+        index = PeptideMassIndex(self.proteins[:1], missed_cleavages=0, min_length=4, mass_type="average")
+        hit, = index.lookup(Peptide("GVFR").weight, tolerance=1e-6)
+        self.assertEqual(hit.sequence, "GVFR")
+        self.assertRaises(ValueError, PeptideMassIndex, self.proteins, mass_type="mono")
+
+    def test_workers(self):
+        index = PeptideMassIndex(self.proteins, missed_cleavages=1, min_length=4, workers=2)
+        self.assertEqual(list(index.masses), list(self.index.masses))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "proteome.pmi")
+            self.index.save(filename)
+            with PeptideMassIndex.load(filename) as index:
+                self.assertEqual(len(index), len(self.index))
+                self.assertEqual(index.names, self.index.names)
+                self.assertEqual(list(index.masses), list(self.index.masses))
+                self.assertEqual(index.lookup(1814.8952), self.index.lookup(1814.8952))
+            with ProcessPoolExecutor(2) as executor:
+                self.assertEqual(list(executor.map(_count, [filename] * 2, [1814.8952] * 2)), [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
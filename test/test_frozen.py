@@ -0,0 +1,55 @@
+import unittest
+
+from bioseq import DNA, RNA, FrozenDNA, FrozenPeptide, InternPool, Peptide
+from test.test_bioseq import TEST_PEPTIDE
+
+
+class TestFrozen(unittest.TestCase):
+    def test_freeze(self):
+        dna = DNA("ATCG", "info")
+        frozen = dna.freeze()
+        self.assertIsInstance(frozen, FrozenDNA)
+        self.assertIsInstance(frozen, DNA)
+        self.assertEqual(frozen, dna)
+        self.assertEqual(frozen.info, "info")
+        self.assertIs(frozen.freeze(), frozen)
+        with self.assertRaises(TypeError):
+            frozen.mutation(0, "A")
+        with self.assertRaises(TypeError):
+            frozen.edit()
+        self.assertEqual(frozen.weight, dna.weight)
+        self.assertEqual(frozen.complement, "CGAT")
+        self.assertIsInstance(frozen.complement, DNA)
+        self.assertEqual(FrozenPeptide(TEST_PEPTIDE).weight, Peptide(TEST_PEPTIDE).weight)
+
+    def test_hash(self):
+        seqs = {DNA("ATCG").freeze(), FrozenDNA("atcg"), FrozenDNA("AAAA")}
+        self.assertEqual(len(seqs), 2)
+        self.assertIn(FrozenDNA("ATCG"), seqs)
+        self.assertEqual(DNA("ATCG").digest, FrozenDNA("ATCG").digest)
+        self.assertNotEqual(DNA("ATCG").digest, DNA("ATCC").digest)
+        with self.assertRaises(TypeError):
+            hash(DNA("ATCG"))
+
+    def test_eq_other_type(self):
+        self.assertFalse(DNA("ATCG") == 1)
+        self.assertTrue(DNA("ATCG") != None)
+
+    def test_intern(self):
+        pool = InternPool()
+        first = pool.intern(Peptide(TEST_PEPTIDE, "first"))
+        second = pool.intern(Peptide(TEST_PEPTIDE, "second"))
+        self.assertIs(first, second)
+        self.assertIsInstance(first, FrozenPeptide)
+        self.assertIsNotNone(first.pI)
+        self.assertIsNotNone(second._pI)
+        self.assertEqual(pool.headers(first), ["first", "second"])
+        self.assertIsNot(pool.intern(RNA("AUCG")), pool.intern(DNA("AUCG")))
+
+    def test_dedup(self):
+        pool = InternPool()
+        seqs = [DNA("AT", "1"), DNA("GC", "2"), DNA("AT", "3"), DNA("at", "4")]
+        unique = list(pool.dedup(seqs))
+        self.assertEqual([seq.info for seq in unique], ["1", "2"])
+        self.assertEqual(pool.headers(unique[0]), ["1", "3", "4"])
+        self.assertEqual(len(pool), 2)
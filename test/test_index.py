@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from bioseq import DNA, SequenceIndex
+from test.test_bioseq import TEST_DNA
+
+
+class TestSequenceIndex(unittest.TestCase):
+    def setUp(self):
+        self.dna = DNA("".join(TEST_DNA.splitlines()[1:]), "ACTB")
+        self.index = self.dna.build_index(step=16)
+
+    def naive(self, pattern):
+        seq = self.dna.seq
+        return [i for i in range(len(seq) - len(pattern) + 1)
+                if seq.startswith(pattern, i)]
+
+    def test_count(self):
+        for pattern in ["A", "ATG", "GGC", "CATCG", "NNN"]:
+            self.assertEqual(self.index.count(pattern), len(self.naive(pattern)))
+
+    def test_find(self):
+        for pattern in ["ATG", "CC", "TTCTAG"]:
+            self.assertEqual(self.index.find(pattern), self.naive(pattern))
+
+    def test_multi_records(self):
+        index = SequenceIndex(["AAGT", "GTAA"], names=["r1", "r2"])
+        self.assertEqual(index.locate("AA"), [(0, 0), (1, 2)])
+        # match never spans two records
+        self.assertEqual(index.count("GTG"), 0)
+        # empty pattern never matches the separators
+        self.assertEqual(index.count(""), 0)
+        self.assertEqual(index.locate(""), [])
+        self.assertEqual(index.names, ["r1", "r2"])
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.idx")
+            self.index.save(filename)
+            with SequenceIndex.load(filename) as index:
+                self.assertEqual(index.names, ["ACTB"])
+                for pattern in ["ATG", "GCGC", "TAG"]:
+                    self.assertEqual(index.locate(pattern), self.index.locate(pattern))
+            self.assertIsNone(index._mmap)
+            with open(filename, "wb") as f:
+                f.write(b"BSQ")
+            self.assertRaises(ValueError, SequenceIndex.load, filename)
+        self.assertRaises(ValueError, SequenceIndex, ["ACGT"], names=["a", "b"])
+        self.assertRaises(TypeError, SequenceIndex, [1])
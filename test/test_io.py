@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from bioseq import DNA, RNA, Peptide, Sequence, io
+from test.test_bioseq import TEST_DNA, TEST_PEPTIDE
+
+
+class TestIO(unittest.TestCase):
+    def setUp(self):
+        self.seqs = [
+            DNA("".join(TEST_DNA.splitlines()[1:]), "NM_001101.5 ACTB"),
+            DNA("ATCGN", "with_n"),
+            RNA("AUCGAUC", "rna"),
+            Peptide(TEST_PEPTIDE, "NP_001092.1 actin"),
+            Sequence("", "empty"),
+        ]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "test.bsq")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_load(self):
+        self.assertEqual(io.save(self.seqs, self.filename), len(self.seqs))
+        with io.load(self.filename) as f:
+            self.assertEqual(len(f), len(self.seqs))
+            for expect, seq in zip(self.seqs, f):
+                self.assertIs(type(seq), type(expect))
+                self.assertEqual(seq, expect)
+                self.assertEqual(seq.info, expect.info)
+
+    def test_random_access(self):
+        io.save(self.seqs, self.filename)
+        with io.load(self.filename) as f:
+            self.assertEqual(f["NP_001092.1"], TEST_PEPTIDE)
+            self.assertEqual(f[2], "AUCGAUC")
+            self.assertEqual(f[-1].info, "empty")
+            # 4 bases are packed into one byte
+            self.assertEqual(len(f.raw(0)), (self.seqs[0].length + 3) // 4)
+            self.assertEqual(len(f.raw(1)), 5)
+
+    def test_invalid(self):
+        io.save(self.seqs, self.filename)
+        with open(self.filename, "rb") as f:
+            content = f.read()
+        for data in (b"short", b"x" * 64, content[:-16]):
+            with open(self.filename, "wb") as f:
+                f.write(data)
+            self.assertRaises(ValueError, io.load, self.filename)
+            self.assertRaises(ValueError, io.SequenceFile, data)
+        with open(self.filename, "wb") as f:
+            f.write(content)
+        f = io.load(self.filename)
+        f.close()
+        self.assertRaises(ValueError, f.seq, 0)
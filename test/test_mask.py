@@ -0,0 +1,99 @@
+import io
+import random
+import unittest
+
+from bioseq import DNA, RNA, Peptide, SeedIndex, msa, utils
+from bioseq.config import AlignmentConfig
+from bioseq.mask import applyMask, dust, seg
+from bioseq.multiple import distanceMatrix
+
+
+def _random(rng: random.Random, alphabet: str, length: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+class TestMask(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.left, self.right = _random(rng, "ACGT", 300), _random(rng, "ACGT", 300)
+        self.dna = DNA(self.left + "A" * 50 + self.right)
+        self.protein = _random(rng, "ACDEFGHIKLMNPQRSTVWY", 200)
+
+    def test_dust(self):
+        (start, end), = self.dna.dust()
+        self.assertLessEqual(abs(start - 300), 2)
+        self.assertLessEqual(abs(end - 350), 2)
+        self.assertEqual(dust(self.left), [])
+        self.assertEqual(dust("A" * 80), [(0, 80)])
+        self.assertEqual(dust("ACGTNNNN" * 20), [])
+        self.assertEqual(dust(""), [])
+        # dinucleotide repeat is masked by a lower threshold
+        self.assertEqual(dust("CA" * 60), [])
+        self.assertEqual(dust("CA" * 60, threshold=10), [(0, 120)])
+        self.assertEqual(RNA("ACGU" * 3 + "U" * 80).dust(), [(11, 92)])
+        self.assertRaises(ValueError, dust, "ACGT", window=3)
+
+    def test_seg(self):
+        self.assertEqual(Peptide(self.protein).seg(), [])
+        (start, end), = seg(self.protein + "QQQQQPQQQQQQQQAQQQ" + self.protein)
+        self.assertLessEqual(start, 200)
+        self.assertGreaterEqual(end, 218)
+        self.assertEqual(seg("Q" * 5), [])
+
+    def test_applyMask(self):
+        self.assertEqual(applyMask("ACGTACGT", [(1, 3), (5, 6)]), "ANNTANGT")
+        self.assertEqual(applyMask("ACGTACGT", [(1, 3), (5, 6)], soft=True), "AcgTAcGT")
+        self.assertEqual(DNA("ACGT").mask([(0, 2)]), "NNGT")
+        self.assertEqual(Peptide("MKVL").mask([(0, 2)]), "XXVL")
+
+    def test_align(self):
+        query = DNA(self.dna.mask(self.dna.dust()))
+        subject = "A" * 50
+        self.assertGreater(self.dna.align(subject, mode=2)[2], 50)
+        try:
+            AlignmentConfig.MASK = "N"
+            self.assertLess(query.align(subject, mode=2)[2], 50)
+            # masked residues are mismatches even to themselves
+            masked = sum(end - start for start, end in self.dna.dust())
+            self.assertEqual(query.align(query, compact=True).mismatches, masked)
+            self.assertEqual(DNA("ANNA").align("ANNA", compact=True).cigar, "1=2X1=")
+        finally:
+            AlignmentConfig.MASK = ""
+
+    def test_msa(self):
+        left, right = "ACGTACNNNNNNNN", "NNNNNNNNACGTAC"
+        self.assertEqual(list(msa([left, right])), [left + "-" * 6, "-" * 6 + right])
+        self.assertAlmostEqual(distanceMatrix(["ACGTNNNNNN", "ACCANNNNNN"])[0], 0.2)
+        try:
+            AlignmentConfig.MASK = "N"
+            # the columns are aligned by the unmasked residues, masked ones don't count as identity
+            self.assertEqual(list(msa([left, right])), ["-" * 8 + left, right + "-" * 8])
+            self.assertAlmostEqual(distanceMatrix(["ACGTNNNNNN", "ACCANNNNNN"])[0], 0.8)
+        finally:
+            AlignmentConfig.MASK = ""
+
+    def test_search(self):
+        masked = self.dna.mask(self.dna.dust())
+        index = SeedIndex([masked, self.right], k=11)
+        self.assertEqual(index.search("A" * 50, min_score=20), [])
+        hits = index.search(self.left[-40:] + "A" * 50, min_score=20)
+        self.assertEqual([hit.record for hit in hits], [0])
+        self.assertLessEqual(hits[0].subject_end, 302)
+
+    def test_maskFasta(self):
+        source = io.StringIO(f">r1 dna\n{self.dna.seq[:100]}\n{self.dna.seq[100:]}\n>r2\nACGT\n")
+        output = io.StringIO()
+        masked = sum(end - start for start, end in self.dna.dust())
+        self.assertEqual(utils.maskFasta(source, output, line_width=None), (2, masked))
+        self.assertEqual(output.getvalue(), f">r1 dna\n{self.dna.mask(self.dna.dust(), soft=True)}\n>r2\nACGT\n")
+
+        source = io.StringIO(f">p\n{self.protein}{'Q' * 30}\n")
+        output = io.StringIO()
+        records, masked = utils.maskFasta(source, output, Peptide, soft=False, line_width=60)
+        self.assertEqual(records, 1)
+        self.assertGreaterEqual(masked, 30)
+        self.assertTrue(output.getvalue().rstrip().endswith("X" * 30))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from bioseq import DNA, io, metrics
+from bioseq.utils import loadFasta
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled(self):
+        DNA("ATCG").align("ATG")
+        self.assertEqual(metrics.snapshot(), {"counters": {}, "histograms": {}})
+
+    def test_align(self):
+        metrics.enable()
+        DNA("ATCG").align("ATG")
+        DNA("ATCG").align("ATCG", mode=2)
+        counters = metrics.snapshot()["counters"]
+        self.assertEqual(counters["bioseq_align_cells_total"], {'mode="global"': 12, 'mode="local"': 16})
+        self.assertEqual(counters["bioseq_align_calls_total"]['mode="global"'], 1)
+        histogram = metrics.snapshot()["histograms"]["bioseq_align_seconds"]['mode="global"']
+        self.assertEqual(histogram["count"], 1)
+        self.assertEqual(histogram["buckets"][float("inf")], 1)
+
+    def test_fasta_io(self):
+        metrics.enable()
+        with tempfile.TemporaryDirectory() as tmp:
+            fasta = os.path.join(tmp, "test.fasta")
+            with open(fasta, "w") as f:
+                f.write(">a\nATCG\n>b\nGG\n")
+            loadFasta(fasta)
+            list(loadFasta(fasta, iterator=True))
+            io.save([DNA("ATCG")], os.path.join(tmp, "test.bsq"))
+            io.load(os.path.join(tmp, "test.bsq")).close()
+        counters = metrics.snapshot()["counters"]
+        self.assertEqual(counters["bioseq_fasta_bytes_total"]['func="loadFasta"'], 28)
+        self.assertEqual(counters["bioseq_fasta_records_total"]['func="loadFasta"'], 4)
+        self.assertEqual(counters["bioseq_io_bytes_total"]['op="save"'],
+                         counters["bioseq_io_bytes_total"]['op="load"'])
+
+    def test_prometheus(self):
+        metrics.enable()
+        metrics.inc("test_total", 2, kind="a")
+        metrics.observe("test_seconds", 0.5)
+        text = metrics.prometheus()
+        self.assertIn("# TYPE test_total counter\ntest_total{kind=\"a\"} 2", text)
+        self.assertIn('test_seconds_bucket{le="1.0"} 1.0', text)
+        self.assertIn('test_seconds_bucket{le="0.1"} 0.0', text)
+        self.assertIn("test_seconds_count 1.0", text)
+
+    def test_profile(self):
+        with metrics.profile("block") as p:
+            DNA("ATCG").align("ATG")
+            DNA("ATCG").align("ATG")
+        self.assertFalse(metrics.ENABLED)
+        self.assertEqual(p.counters["bioseq_align_cells_total"], 24)
+        self.assertGreater(p.elapsed, 0)
+        self.assertIn('block="block"', metrics.snapshot()["histograms"]["bioseq_profile_seconds"])
+
+    def test_profile_overlapped(self):
+        # profiles exit in other order than entered, as in threads
+        outer, inner = metrics.profile("outer"), metrics.profile("inner")
+        outer.__enter__()
+        inner.__enter__()
+        outer.__exit__(None, None, None)
+        self.assertTrue(metrics.ENABLED)
+        inner.__exit__(None, None, None)
+        self.assertFalse(metrics.ENABLED)
+
+        metrics.enable()
+        with metrics.profile("block"):
+            metrics.disable()
+            self.assertTrue(metrics.ENABLED)
+        self.assertFalse(metrics.ENABLED)
+
+    def test_logging(self):
+        with self.assertLogs("bioseq", logging.WARNING):
+            DNA("ATCG").mutation([0, 1], "AA")
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from bioseq import DNA, MultipleAlignment, msa
+from bioseq.multiple import distanceMatrix, guideTree
+
+SEQUENCES = ["ACGTACGTTT", "ACGTCGTTT", "ACGAACGTTTA", "TTACGTACG"]
+
+
+class TestMultipleAlignment(unittest.TestCase):
+    def test_msa(self):
+        for tree in ("upgma", "nj"):
+            for distance in ("align", "kmer"):
+                result = msa(SEQUENCES, names="abcd", tree=tree, distance=distance)
+                self.assertEqual(len(result), 4)
+                self.assertEqual([row.replace("-", "") for row in result], SEQUENCES)
+                self.assertEqual(len({len(row) for row in result}), 1)
+                self.assertTrue(result.tree.endswith(";"))
+                self.assertEqual(result["c"], result[2])
+
+    def test_sequence_names(self):
+        result = msa([DNA("ATCG", info="x"), DNA("ATG", info="y")])
+        self.assertEqual(result.names, ["x", "y"])
+        self.assertEqual(msa(["ATCG"]).width, 4)
+        self.assertRaises(ValueError, msa, [])
+        self.assertRaises(ValueError, msa, ["A", "C"], names=["a"])
+
+    def test_columns(self):
+        result = MultipleAlignment(["AC-T", "ACGT", "AG-A"], names=["a", "b", "c"])
+        self.assertEqual(result.width, 4)
+        self.assertEqual(result.column(1), "CCG")
+        self.assertEqual(result.row(-1), "AG-A")
+        self.assertEqual(result.consensus(), "ACGT")
+        self.assertEqual(result.consensus(0.5), "ACXT")
+        self.assertEqual(list(result.conservation), [1., 2 / 3, 1 / 3, 2 / 3])
+        self.assertEqual(result.format(line_width=3), ">a\nAC-\nT\n>b\nACG\nT\n>c\nAG-\nA\n")
+        self.assertRaises(ValueError, MultipleAlignment, ["AC", "A"])
+
+    def test_kmer_size(self):
+        rng = random.Random(0)
+        families = ["".join(rng.choice("ACGT") for _ in range(300)) for _ in range(2)]
+        seqs = [family[i:] + family[:i] for family in families for i in (0, 7)]
+        distances = distanceMatrix(seqs, method="kmer")
+        # (0, 1) and (2, 3) are in the same family
+        self.assertLess(distances[0], 0.1)
+        self.assertLess(distances[5], 0.1)
+        self.assertTrue(all(distance > 0.5 for distance in distances[1:5]))
+        self.assertEqual(distanceMatrix(["MKVLA", "MKVLG"], method="kmer")[0], 1 - 2 / 3)
+        self.assertGreater(distanceMatrix(seqs[:2], method="kmer", k=30)[0], distances[0])
+
+    def test_guide_tree(self):
+        distances = distanceMatrix(["AAAA", "AAAT", "CCCC"], method="kmer", k=2)
+        self.assertEqual(len(distances), 3)
+        merges, lengths = guideTree(distances, 3)
+        self.assertEqual(sorted(merges[0]), [0, 1])
+        self.assertEqual(sorted(merges[1]), [2, 3])
+        self.assertRaises(ValueError, guideTree, distances, 3, "wpgma")
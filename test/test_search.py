@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+
+from bioseq import DNA, Peptide, SeedIndex
+from bioseq.config import AlignmentConfig
+
+
+class TestSeedIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        cls.database = ["".join(rng.choices("ACGT", k=5000)) for _ in range(10)]
+        # query from record 3 with substitutions and an insertion
+        query = list(cls.database[3][1000:1300])
+        for i in range(0, len(query), 30):
+            query[i] = "A" if query[i] != "A" else "C"
+        cls.query = "".join(query[:150]) + "GG" + "".join(query[150:])
+        cls.index = SeedIndex(cls.database, names=[f"chr{i}" for i in range(10)])
+
+    def test_search(self):
+        hits = self.index.search(self.query)
+        best = hits[0]
+        self.assertEqual((best.record, best.name, best.strand), (3, "chr3", "+"))
+        self.assertLessEqual(abs(best.subject_start - 1000), 1)
+        self.assertLessEqual(abs(best.subject_end - 1300), 1)
+        self.assertEqual(best.alignment.subject, self.database[3])
+        self.assertEqual(best.score, best.alignment.score)
+        self.assertEqual(hits, sorted(hits, key=lambda hit: hit.score, reverse=True))
+
+        aligned_query, aligned_subject = best.alignment.aligned()
+        self.assertEqual(aligned_query.replace("-", ""), self.query[best.query_start: best.query_end])
+        self.assertEqual(aligned_subject.replace("-", ""), self.database[3][best.subject_start: best.subject_end])
+        self.assertGreater(best.identity, 0.9)
+
+    def test_reverse_strand(self):
+        query = DNA(self.query).complement
+        best = self.index.search(query)[0]
+        forward = self.index.search(self.query)[0]
+        self.assertEqual((best.record, best.strand), (3, "-"))
+        self.assertEqual((best.subject_start, best.subject_end), (forward.subject_start, forward.subject_end))
+        self.assertEqual((best.query_start, best.query_end),
+                         (len(query) - forward.query_end, len(query) - forward.query_start))
+        self.assertFalse([hit for hit in self.index.search(query, both_strands=False) if hit.record == 3])
+
+    def test_no_hit(self):
+        self.assertEqual(self.index.search("ACGT"), [])
+        self.assertEqual(self.index.search("N" * 100), [])
+        self.assertRaises(TypeError, self.index.search, 1)
+
+    def test_peptide(self):
+        rng = random.Random(1)
+        proteins = ["".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=200)) for _ in range(20)]
+        index = SeedIndex((Peptide(seq, info=f"p{i}") for i, seq in enumerate(proteins)), seq_type=Peptide)
+        self.assertEqual((index.k, len(index.alphabet)), (3, 20))
+        best = index.search(proteins[5][40:120])[0]
+        self.assertEqual((best.name, best.subject_start, best.subject_end), ("p5", 40, 120))
+        self.assertEqual(best.score, 80 * AlignmentConfig.MATCH)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "database.seed")
+            self.index.save(filename)
+            with SeedIndex.load(filename) as loaded:
+                self.assertEqual(loaded.names, self.index.names)
+                self.assertEqual(loaded.record(9), self.database[9])
+                self.assertEqual([(hit.record, hit.score) for hit in loaded.search(self.query)],
+                                 [(hit.record, hit.score) for hit in self.index.search(self.query)])
@@ -0,0 +1,50 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from concurrent.futures import ProcessPoolExecutor
+
+from bioseq import DNA, FrozenDNA, FrozenPeptide, Peptide, SharedSequenceSet, io
+
+
+def _describe(shared: SharedSequenceSet, index: int):
+    seq = shared[index]
+    return seq.info, seq.seq, seq.align("ACGT")[2]
+
+
+class TestSharedSequenceSet(unittest.TestCase):
+    def setUp(self):
+        self.sequences = [DNA("ACGTACGTTT", info="chr1 first"), DNA("ACGNNT", info="chr2"),
+                          Peptide("MKVLA", info="p1")]
+
+    def test_create(self):
+        with SharedSequenceSet.create(self.sequences) as shared:
+            self.assertEqual(len(shared), 3)
+            self.assertIsInstance(shared[0], FrozenDNA)
+            self.assertIsInstance(shared["p1"], FrozenPeptide)
+            self.assertEqual(shared["chr1"].info, "chr1 first")
+            self.assertEqual([seq.seq for seq in shared], [seq.seq for seq in self.sequences])
+            self.assertEqual(shared[2].pI, self.sequences[2].pI)
+            self.assertRaises(TypeError, shared[0].mutation, 0, "T")
+
+            attached = SharedSequenceSet.attach(shared.name)
+            self.assertEqual(attached[1], self.sequences[1])
+            attached.close()
+            self.assertIs(pickle.loads(pickle.dumps(shared)), pickle.loads(pickle.dumps(shared)))
+            self.assertLess(len(pickle.dumps(shared)), 200)
+        self.assertRaises(FileNotFoundError, SharedSequenceSet.attach, shared.name)
+
+    def test_workers(self):
+        with SharedSequenceSet.create(self.sequences) as shared:
+            with ProcessPoolExecutor(2) as executor:
+                results = list(executor.map(_describe, [shared] * 3, range(3)))
+        self.assertEqual(results, [(seq.info, seq.seq, seq.align("ACGT")[2]) for seq in self.sequences])
+
+    def test_fromFile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "sequences.bsq")
+            io.save(self.sequences, filename)
+            with SharedSequenceSet.fromFile(filename, block_size=16) as shared:
+                self.assertEqual(shared.nbytes, os.path.getsize(filename))
+                self.assertEqual(list(shared), self.sequences)
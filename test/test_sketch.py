@@ -0,0 +1,81 @@
+import os
+import random
+import tempfile
+import unittest
+
+from bioseq import DNA, Peptide, Sketch, SketchSet
+from bioseq.sketch import ANY, CANONICAL
+from bioseq.utils import sketchFasta
+
+
+def _mutate(seq: str, every: int) -> str:
+    bases = list(seq)
+    for i in range(0, len(bases), every):
+        bases[i] = "ACGT"["ACGT".index(bases[i]) - 1]
+    return "".join(bases)
+
+
+class TestSketch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        cls.genome = "".join(rng.choices("ACGT", k=20000))
+        cls.mutant = _mutate(cls.genome, 50)
+
+    def test_sketch(self):
+        sketch = DNA(self.genome, info="genome").sketch(k=15, size=500)
+        self.assertEqual(len(sketch), 500)
+        self.assertEqual(list(sketch.hashes), sorted(set(sketch.hashes)))
+        self.assertEqual((sketch.name, sketch.mode), ("genome", CANONICAL))
+        self.assertEqual(sketch, DNA(self.genome).complement.sketch(k=15, size=500))
+        self.assertNotEqual(sketch, DNA(self.genome).complement.sketch(k=15, size=500, canonical=False))
+        self.assertEqual(len(DNA("ACGTNACGT").sketch(k=5)), 0)
+        self.assertEqual(Peptide("MKVLA").sketch(k=3).mode, ANY)
+        self.assertEqual(len(Peptide("MKVLA").sketch(k=3)), 3)
+        self.assertRaises(ValueError, DNA("ACGT").sketch, k=33)
+
+    def test_similarity(self):
+        genome, mutant = DNA(self.genome).sketch(), DNA(self.mutant).sketch()
+        self.assertEqual(genome.jaccard(genome), 1.)
+        self.assertEqual(genome.distance(genome), 0.)
+        # one substitution per 50 bases
+        self.assertAlmostEqual(genome.distance(mutant), 0.02, delta=0.01)
+        part = DNA(self.genome[:5000]).sketch()
+        self.assertEqual(part.containment(genome), 1.)
+        self.assertLess(genome.containment(part), 0.5)
+        self.assertRaises(ValueError, genome.jaccard, DNA(self.genome).sketch(k=15))
+        merged = DNA(self.genome[:10020]).sketch().merge(DNA(self.genome[10000:]).sketch())
+        self.assertEqual(merged, genome)
+
+    def test_sketch_set(self):
+        sketches = SketchSet(DNA(seq, info=name).sketch() for name, seq in
+                             (("genome", self.genome), ("mutant", self.mutant), ("other", self.genome[::-1])))
+        self.assertEqual(len(sketches), 3)
+        matrix = sketches.jaccard()
+        self.assertEqual([row[i] for i, row in enumerate(matrix)], [1., 1., 1.])
+        self.assertEqual(matrix[0][1], matrix[1][0])
+        self.assertEqual(sketches[1].jaccard(sketches[0]), matrix[1][0])
+        self.assertEqual([index for index, _ in sketches.search(sketches[0])], [0, 1])
+        self.assertRaises(ValueError, sketches.append, DNA("ACGT").sketch(k=3))
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "genomes.skt")
+            sketches.save(filename)
+            loaded = SketchSet.load(filename)
+        self.assertEqual(loaded.names, ["genome", "mutant", "other"])
+        self.assertEqual(list(loaded), list(sketches))
+
+    def test_sketchFasta(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "genomes.fasta")
+            with open(filename, "w") as f:
+                for name, seq in (("genome", self.genome), ("mutant", self.mutant)):
+                    f.write(f">{name}\n")
+                    f.writelines(seq[i: i + 60] + "\n" for i in range(0, len(seq), 60))
+            records = sketchFasta(filename, per_record=True, block_size=1000)
+            whole = sketchFasta(filename, block_size=777)
+        self.assertEqual(records.names, ["genome", "mutant"])
+        self.assertEqual(records[0], DNA(self.genome).sketch())
+        self.assertEqual(records[1], DNA(self.mutant).sketch())
+        self.assertEqual(whole, records[0].merge(records[1]))
+        self.assertEqual(whole.name, "genomes.fasta")
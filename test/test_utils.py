@@ -1,12 +1,29 @@
 import unittest
 
-from bioseq import utils, DNA, Peptide, Sequence
+from bioseq import utils, Alignment, DNA, Peptide, Sequence
 from test.test_bioseq import TEST_DNA
 
 
 class TestUtils(unittest.TestCase):
     def test_printAlign(self):
-        pass
+        import io
+        stream = io.StringIO()
+        utils.printAlign("GCA-TGCT", "G-ATTACA", file=stream)
+        self.assertEqual(stream.getvalue(), "    1 GCA-TGCT\n      ┃━┃━┃•┃•\n    1 G-ATTACA\n\n")
+
+        blocks = list(utils.formatAlign("A" * 25, "A" * 24 + "C", spacing=5, line_width=10))
+        self.assertEqual(len(blocks), 3)
+        self.assertTrue(blocks[2].startswith("   21 AAAAA\n      ┃┃┃┃•\n"))
+        with self.assertRaises(ValueError):
+            utils.printAlign("A", "A", style="pdf")
+
+    def test_formatAlign_styles(self):
+        alignment = Alignment("GGGATCGATCGTTCCC", "CCATCGTTCGAA", 14., 7, 14, 2, 9, "7=", 7, 0, 0, 0, 0)
+        blast = "".join(utils.formatAlign(alignment, style="blast", line_width=4))
+        self.assertTrue(blast.startswith("Query  8   ATCG  11\n           ||||\nSbjct  3   ATCG  6\n"))
+        html = "".join(utils.formatAlign("AT-G", "ACTG", style="html"))
+        self.assertIn('<span class="match">A</span><span class="mismatch">T</span><span class="gap">-</span>', html)
+        self.assertTrue(html.startswith("<pre") and html.endswith("</pre>\n"))
 
     def test_parseFasta(self):
         copies = 2
@@ -87,3 +104,68 @@ class TestUtils(unittest.TestCase):
 
         self.assertEqual(seq[0].length, 1812)
         self.assertEqual(seq[1].length, 375)
+
+    def test_gcProfileFasta(self):
+        with open("test.fasta", "w") as f:
+            f.write(TEST_DNA)
+            f.write(">short\nGGCC\nAT\n")
+
+        dna = DNA("".join(TEST_DNA.splitlines()[1:]))
+        (info, gc, skew), (_, short_gc, short_skew) = \
+            utils.gcProfileFasta("test.fasta", window=50, step=20)
+        self.assertEqual(info, TEST_DNA.splitlines()[0][1:])
+        self.assertEqual(gc, dna.gcProfile(50, 20))
+        self.assertEqual(skew, dna.gcSkew(50, 20))
+        self.assertEqual(len(short_gc), 0)
+
+        import os
+        os.remove("test.fasta")
+
+    def test_reverseComplementFasta(self):
+        with open("test.fasta", "w") as f:
+            f.write(">first record\nACGTN\nacgtR\nAC\n>empty\n>short\nGGA\n")
+
+        index = utils.indexFasta("test.fasta")
+        self.assertEqual([record.length for record in index], [12, 0, 3])
+        self.assertEqual(utils.loadFastaIndex("test.fasta"), index)
+        for block_size in (1, 4, 100):
+            self.assertEqual(
+                utils.reverseComplementFasta("test.fasta", "test.rc.fasta", block_size=block_size), 3)
+            with open("test.rc.fasta") as f:
+                self.assertEqual(f.read(), ">first record\nGTYac\ngtNAC\nGT\n>empty\n>short\nTCC\n")
+
+        import os
+        for filename in ("test.fasta", "test.fasta.fai", "test.rc.fasta"):
+            os.remove(filename)
+
+    def test_dedupFasta(self):
+        import os
+
+        with open("test.fasta", "w") as f:
+            f.write(">a one\nACGT\nAA\n>b\nacgtaa\n>c\nTTACGT\n>d\nGGG\n>e\nACGTAA\n")
+
+        # memory=1 spills every digest to a run
+        for memory in (1, 1 << 20):
+            stats = utils.dedupFasta("test.fasta", "test.dedup.fasta", memory=memory)
+            self.assertEqual(stats[:3], (5, 3, 2))
+            self.assertEqual(stats.runs > 0, memory == 1)
+            self.assertGreater(stats.peak_buffer, 0)
+            self.assertEqual(stats.input_bytes, os.path.getsize("test.fasta"))
+            with open("test.dedup.fasta") as f:
+                self.assertEqual(f.read(), ">a one;b;e\nACGTAA\n>c\nTTACGT\n>d\nGGG\n")
+
+            stats = utils.dedupFasta("test.fasta", "test.dedup.fasta", reverse_complement=True, separator="\x01",
+                                     line_width=4, memory=memory)
+            self.assertEqual(stats.unique, 2)
+            with open("test.dedup.fasta") as f:
+                self.assertEqual(f.read(), ">a one\x01b\x01c\x01e\nACGT\nAA\n>d\nGGG\n")
+
+        for filename in ("test.fasta", "test.dedup.fasta"):
+            os.remove(filename)
+
+    def test_applyVariantSets(self):
+        reference = DNA("ACGTACGTAC")
+        variant_sets = [[(0, "A", "T")], [(1, "C", ""), (4, "A", "AAA")], []]
+        expect = ["TCGTACGTAC", "AGTAAACGTAC", "ACGTACGTAC"]
+        self.assertEqual(utils.applyVariantSets(reference, variant_sets, workers=2), expect)
+        self.assertEqual(utils.applyVariantSets(reference, variant_sets, workers=1), expect)